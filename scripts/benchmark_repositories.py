@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+import secrets
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List
+from uuid import UUID
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.solar_api.adapters.repositories import (
+    AsyncpgPanelRepository,
+    AsyncpgUserRepository,
+    PostgresPanelRepository,
+    PostgresUserRepository,
+)
+from src.solar_api.adapters.repositories.asyncpg_panel_repository import (
+    PANEL_STATEMENTS,
+)
+from src.solar_api.adapters.repositories.asyncpg_pool import create_asyncpg_pool
+from src.solar_api.adapters.repositories.asyncpg_user_repository import (
+    USER_STATEMENTS,
+)
+from src.solar_api.database import async_session_factory, engine, init_db
+from src.solar_api.database.config import DATABASE_URL
+from src.solar_api.domain.panel_model import PanelModelCreate, PanelModelQuery
+
+Operation = Callable[[], Awaitable[object]]
+
+
+async def seed(panels: int) -> tuple[str, int, UUID]:
+    """A throwaway user owning ``panels`` panel models."""
+    api_key = f"bench_{secrets.token_hex(16)}"
+    async with async_session_factory() as session:
+        user = await PostgresUserRepository(session).create(
+            {
+                "email": f"{api_key}@benchmark.invalid",
+                "password": "not-a-hash",
+                "api_key": api_key,
+            }
+        )
+        repository = PostgresPanelRepository(session)
+        await repository.bulk_create(
+            [
+                PanelModelCreate(
+                    name=f"Panel {i:05d}",
+                    capacity=0.3 + (i % 50) / 100,
+                    efficiency=15 + i % 10,
+                    manufacturer=f"Manufacturer {i % 20}",
+                    type="Monocristalino",
+                )
+                for i in range(panels)
+            ],
+            user.id,
+        )
+        await repository.commit()
+        first = await repository.list_page(user.id, PanelModelQuery(limit=1))
+    return api_key, user.id, first.items[0].id
+
+
+def orm_operations(api_key: str, user_id: int, panel_id: UUID) -> Dict[str, Operation]:
+    # One session per operation, as get_db gives one per request
+    async def get_by_api_key():
+        async with async_session_factory() as session:
+            return await PostgresUserRepository(session).get_by_api_key(api_key)
+
+    async def list_page():
+        async with async_session_factory() as session:
+            return await PostgresPanelRepository(session).list_page(
+                user_id, PanelModelQuery()
+            )
+
+    async def get_by_id():
+        async with async_session_factory() as session:
+            return await PostgresPanelRepository(session).get_by_id(panel_id, user_id)
+
+    return {
+        "get_by_api_key": get_by_api_key,
+        "list_page": list_page,
+        "get_by_id": get_by_id,
+    }
+
+
+def asyncpg_operations(
+    pool, api_key: str, user_id: int, panel_id: UUID
+) -> Dict[str, Operation]:
+    users = AsyncpgUserRepository(pool)
+
+    async def list_page():
+        return await AsyncpgPanelRepository(pool).list_page(user_id, PanelModelQuery())
+
+    async def get_by_id():
+        return await AsyncpgPanelRepository(pool).get_by_id(panel_id, user_id)
+
+    return {
+        "get_by_api_key": lambda: users.get_by_api_key(api_key),
+        "list_page": list_page,
+        "get_by_id": get_by_id,
+    }
+
+
+async def measure(
+    operation: Operation, concurrency: int, requests: int
+) -> tuple[float, List[float]]:
+    """Wall time and latencies of ``requests`` calls, ``concurrency`` at a time."""
+    latencies: List[float] = []
+    remaining = iter(range(requests))
+
+    async def worker():
+        for _ in remaining:
+            start = time.perf_counter()
+            await operation()
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - start, latencies
+
+
+async def benchmark(
+    panels: int, concurrency: int, requests: int, pool_size: int
+) -> None:
+    await init_db()
+    api_key, user_id, panel_id = await seed(panels)
+    pool = await create_asyncpg_pool(
+        DATABASE_URL,
+        {**PANEL_STATEMENTS, **USER_STATEMENTS},
+        min_size=pool_size,
+        max_size=pool_size,
+    )
+    backends = {
+        "sqlalchemy": orm_operations(api_key, user_id, panel_id),
+        "asyncpg": asyncpg_operations(pool, api_key, user_id, panel_id),
+    }
+
+    try:
+        print(f"{panels} panels, concurrency {concurrency}, {requests} requests each")
+        print(
+            f"{'operation':<18}{'backend':<12}"
+            f"{'ops/s':>10}{'p50 ms':>10}{'p99 ms':>10}"
+        )
+        for name in ("get_by_api_key", "list_page", "get_by_id"):
+            for backend, operations in backends.items():
+                # Warm up connections and statement caches before timing
+                await measure(operations[name], concurrency, concurrency)
+                elapsed, latencies = await measure(
+                    operations[name], concurrency, requests
+                )
+                cuts = statistics.quantiles(latencies, n=100)
+                print(
+                    f"{name:<18}{backend:<12}{requests / elapsed:>10.0f}"
+                    f"{cuts[49] * 1000:>10.2f}{cuts[98] * 1000:>10.2f}"
+                )
+    finally:
+        await pool.close()
+        async with async_session_factory() as session:
+            await PostgresUserRepository(session).delete(user_id)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare the SQLAlchemy and asyncpg repositories on PostgreSQL"
+    )
+    parser.add_argument("--panels", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=15,
+        help="asyncpg pool size; the default matches the engine's 5 + 10 overflow",
+    )
+    args = parser.parse_args()
+
+    asyncio.run(
+        benchmark(args.panels, args.concurrency, args.requests, args.pool_size)
+    )
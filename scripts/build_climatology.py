@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+import calendar
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import httpx
+import numpy as np
+from src.solar_api.adapters.pvgis.local_yield_adapter import Climatology
+
+MRCALC_URL = "https://re.jrc.ec.europa.eu/api/MRcalc"
+
+# Brazil bounding box
+DEFAULT_BOUNDS = (-34.0, 6.0, -74.0, -34.0)
+
+
+async def fetch_cell(client: httpx.AsyncClient, lat: float, lon: float) -> dict:
+    response = await client.get(
+        MRCALC_URL,
+        params={
+            "lat": lat,
+            "lon": lon,
+            "horirrad": 1,
+            "avtemp": 1,
+            "outputformat": "json",
+        },
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+async def build(bounds, step: float, output: Path, requests_per_second: float):
+    lat_min, lat_max, lon_min, lon_max = bounds
+    lats = np.arange(lat_min, lat_max + step / 2, step)
+    lons = np.arange(lon_min, lon_max + step / 2, step)
+
+    ghi = np.full((len(lats), len(lons), 12), np.nan)
+    ghi_sd = np.full_like(ghi, np.nan)
+    t2m = np.full_like(ghi, np.nan)
+    elevation = np.full((len(lats), len(lons)), np.nan)
+    years = set()
+
+    async with httpx.AsyncClient(timeout=60) as client:
+        for i, lat in enumerate(lats):
+            for j, lon in enumerate(lons):
+                try:
+                    data = await fetch_cell(client, float(lat), float(lon))
+                except httpx.HTTPStatusError as e:
+                    # PVGIS rejects points over the sea
+                    print(f"Skipped ({lat:.2f}, {lon:.2f}): {e.response.status_code}")
+                    continue
+                finally:
+                    await asyncio.sleep(1 / requests_per_second)
+
+                elevation[i, j] = data["inputs"]["location"]["elevation"]
+                rows = data["outputs"]["monthly"]
+                for month in range(1, 13):
+                    daily = [
+                        row["H(h)_m"] / calendar.monthrange(row["year"], month)[1]
+                        for row in rows
+                        if row["month"] == month
+                    ]
+                    ghi[i, j, month - 1] = np.mean(daily)
+                    ghi_sd[i, j, month - 1] = np.std(daily)
+                    t2m[i, j, month - 1] = np.mean(
+                        [row["T2m"] for row in rows if row["month"] == month]
+                    )
+                years.update(row["year"] for row in rows)
+            print(f"Row {i + 1}/{len(lats)} done")
+
+    # Cells PVGIS could not answer stay NaN and are flagged invalid, so the
+    # engine refuses them instead of estimating from missing data
+    climatology = Climatology(
+        lat=lats,
+        lon=lons,
+        ghi=ghi,
+        ghi_sd=ghi_sd,
+        t2m=t2m,
+        elevation=elevation,
+        year_min=min(years) if years else None,
+        year_max=max(years) if years else None,
+    )
+    climatology.save(output)
+    print(
+        f"Wrote {output} "
+        f"({int(climatology.valid.sum())}/{climatology.valid.size} cells)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Build the local yield engine climatology from PVGIS MRcalc"
+    )
+    parser.add_argument("output", type=Path)
+    parser.add_argument(
+        "--bounds",
+        type=float,
+        nargs=4,
+        default=DEFAULT_BOUNDS,
+        metavar=("LAT_MIN", "LAT_MAX", "LON_MIN", "LON_MAX"),
+    )
+    parser.add_argument("--step", type=float, default=1.0)
+    parser.add_argument("--rate", type=float, default=5.0)
+    args = parser.parse_args()
+
+    asyncio.run(build(args.bounds, args.step, args.output, args.rate))
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import httpx
+import numpy as np
+from src.solar_api.adapters.pvgis.pvgis_adapter import PVGISAdapter
+from src.solar_api.adapters.pvgis.yield_grid import YieldGrid
+from src.solar_api.application.ports.pvgis_service import PVGISUnavailableError
+from src.solar_api.application.services.solar_service import (
+    REFERENCE_LOSS,
+    REFERENCE_PEAKPOWER,
+)
+from src.solar_api.domain.models import PVGISRequest
+
+# Brazil bounding box
+DEFAULT_BOUNDS = (-34.0, 6.0, -74.0, -34.0)
+
+# Transport, rate-limit and malformed-payload failures of a single node
+NODE_ERRORS = (
+    httpx.HTTPError,
+    PVGISUnavailableError,
+    KeyError,
+    TypeError,
+    ValueError,
+)
+
+
+async def build(bounds, step: float, output: Path, requests_per_second: float):
+    if (output / "meta.json").exists():
+        grid = YieldGrid(output, mode="r+")
+        print(f"Resuming {output}: {int(grid.valid.sum())} nodes already filled")
+    else:
+        lat_min, lat_max, lon_min, lon_max = bounds
+        grid = YieldGrid.create(
+            output,
+            lat=np.arange(lat_min, lat_max + step / 2, step),
+            lon=np.arange(lon_min, lon_max + step / 2, step),
+        )
+
+    async with httpx.AsyncClient(timeout=60) as client:
+        adapter = PVGISAdapter(client=client)
+        for i, lat in enumerate(grid.lat):
+            for j, lon in enumerate(grid.lon):
+                if grid.valid[i, j]:
+                    continue
+                try:
+                    pv_data = await adapter.get_pv_data(
+                        PVGISRequest(
+                            lat=float(lat),
+                            lon=float(lon),
+                            peakpower=REFERENCE_PEAKPOWER,
+                            loss=REFERENCE_LOSS,
+                        )
+                    )
+                    meta = {
+                        "year_min": pv_data["meteo_data"]["year_min"],
+                        "year_max": pv_data["meteo_data"]["year_max"],
+                        "technology": pv_data["pv_module"]["technology"],
+                    }
+                    grid.set_node(i, j, pv_data)
+                except httpx.HTTPStatusError as e:
+                    # PVGIS rejects points over the sea; they stay invalid
+                    print(f"Skipped ({lat:.2f}, {lon:.2f}): {e.response.status_code}")
+                    continue
+                except NODE_ERRORS as e:
+                    # One bad node must not abort the build; it stays invalid
+                    # and is retried when the build is resumed
+                    print(f"Failed ({lat:.2f}, {lon:.2f}): {type(e).__name__}: {e}")
+                    continue
+                finally:
+                    await asyncio.sleep(1 / requests_per_second)
+
+                grid.meta.update(meta)
+
+            grid.flush()
+            print(f"Row {i + 1}/{len(grid.lat)} done")
+
+    grid.save_meta()
+    print(f"Wrote {output} ({int(grid.valid.sum())}/{grid.valid.size} nodes)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Pre-warm the PVGIS yield grid used to answer /calculate"
+    )
+    parser.add_argument("output", type=Path)
+    parser.add_argument(
+        "--bounds",
+        type=float,
+        nargs=4,
+        default=DEFAULT_BOUNDS,
+        metavar=("LAT_MIN", "LAT_MAX", "LON_MIN", "LON_MAX"),
+    )
+    parser.add_argument("--step", type=float, default=0.5)
+    parser.add_argument("--rate", type=float, default=5.0)
+    args = parser.parse_args()
+
+    asyncio.run(build(args.bounds, args.step, args.output, args.rate))
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.solar_api.adapters.pvgis.local_yield_adapter import (
+    Climatology,
+    LocalYieldAdapter,
+    compare_with_pvgis,
+)
+from src.solar_api.adapters.pvgis.pvgis_adapter import format_pvcalc_response
+from src.solar_api.application.ports.pvgis_service import PVGISUnavailableError
+from src.solar_api.domain.models import PVGISRequest
+
+# Written by scripts/record_pvgis_fixtures.py; the manifest lists each
+# recorded response with its request URL and date
+RECORDED_DIR = project_root / "tests" / "fixtures" / "pvgis" / "recorded"
+MANIFEST = RECORDED_DIR / "recordings.json"
+
+
+def compare(climatology_path: Path, max_error: float) -> bool:
+    if not MANIFEST.exists():
+        print(f"No recorded PVGIS responses in {RECORDED_DIR}")
+        print("Record them with scripts/record_pvgis_fixtures.py first")
+        return False
+
+    engine = LocalYieldAdapter(Climatology.load(climatology_path))
+    recordings = json.loads(MANIFEST.read_text())
+
+    print(f"{'fixture':<32}{'E_y %':>9}{'H(i)_y %':>10}{'E_m MAPE %':>12}{'slope':>7}")
+    worst, compared = 0.0, 0
+    for name, recording in sorted(recordings.items()):
+        path = RECORDED_DIR / name
+        reference = format_pvcalc_response(json.loads(path.read_text()))
+        params = PVGISRequest(
+            lat=reference["latitude"],
+            lon=reference["longitude"],
+            peakpower=reference["pv_module"]["peak_power"],
+            loss=reference["pv_module"]["system_loss"],
+        )
+        try:
+            estimate = engine.estimate(params)
+        except PVGISUnavailableError as e:
+            print(f"{path.stem:<32}{e}")
+            continue
+        errors = compare_with_pvgis(estimate, reference)
+        worst = max(worst, abs(errors["E_y"]))
+        compared += 1
+        print(
+            f"{path.stem:<32}{errors['E_y']:>9.2f}{errors['H(i)_y']:>10.2f}"
+            f"{errors['E_m_mape']:>12.2f}{errors['slope']:>7.0f}"
+            f"  (recorded {recording['recorded_at'][:10]})"
+        )
+
+    if not compared:
+        print("No recorded location is covered by the climatology")
+        return False
+    print(f"Worst annual yield error: {worst:.2f}% (limit {max_error:.2f}%)")
+    return worst <= max_error
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare the local yield engine against recorded PVGIS fixtures"
+    )
+    parser.add_argument("climatology", type=Path)
+    parser.add_argument("--max-error", type=float, default=10.0)
+    args = parser.parse_args()
+
+    sys.exit(0 if compare(args.climatology, args.max_error) else 1)
@@ -23,7 +23,7 @@ async def clear_tables():
         try:
             print("Starting database cleanup...")
             
-            tables = ["panel_models", "users"]
+            tables = ["usage_counters", "token_revocations", "pvgis_results", "panel_models", "users"]
             
             for table in tables:
                 print(f"Clearing table: {table}")
@@ -57,6 +57,9 @@ if __name__ == "__main__":
         exit(1)
 
     print("\nWARNING: This will clear all data from the following tables:")
+    print("- usage_counters")
+    print("- token_revocations")
+    print("- pvgis_results")
     print("- panel_models")
     print("- users")
     print("\nThis operation cannot be undone!")
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+import asyncio
+import json
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import httpx
+from src.solar_api.adapters.pvgis.pvgis_adapter import PVGISAdapter
+
+RECORDED_DIR = project_root / "tests" / "fixtures" / "pvgis" / "recorded"
+# Request URL and date of every recorded response, by file name
+MANIFEST = RECORDED_DIR / "recordings.json"
+
+SITES = {
+    "sao_paulo": (-23.5505, -46.6333),
+    "fortaleza": (-3.7319, -38.5267),
+}
+
+CONFIGURATIONS = [(1, 0), (5, 14), (12.5, 20)]
+
+
+def fixture_name(site: str, peakpower: float, loss: float) -> str:
+    name = f"{site}_{peakpower:g}kwp_{loss:g}loss".replace(".", "_")
+    return f"{name}.json"
+
+
+async def record():
+    RECORDED_DIR.mkdir(parents=True, exist_ok=True)
+    manifest = json.loads(MANIFEST.read_text()) if MANIFEST.exists() else {}
+
+    async with httpx.AsyncClient(timeout=60) as client:
+        for site, (lat, lon) in SITES.items():
+            for peakpower, loss in CONFIGURATIONS:
+                response = await client.get(
+                    PVGISAdapter.PVGIS_URL,
+                    params={
+                        "lat": lat,
+                        "lon": lon,
+                        "peakpower": peakpower,
+                        "loss": loss,
+                        "outputformat": "json",
+                        "optimalinclination": 1,
+                        "optimalazimuth": 1,
+                    },
+                )
+                response.raise_for_status()
+
+                name = fixture_name(site, peakpower, loss)
+                (RECORDED_DIR / name).write_text(json.dumps(response.json(), indent=2))
+                manifest[name] = {
+                    "url": str(response.url),
+                    "recorded_at": datetime.now(timezone.utc).isoformat(),
+                }
+                MANIFEST.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+                print(f"Recorded {name}")
+
+
+if __name__ == "__main__":
+    asyncio.run(record())
@@ -1,9 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from src.solar_api.domain.user_models import UserInDB
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from typing import Optional
+from src.solar_api.domain.user_models import Token, UserInDB
+from src.solar_api.application.access_tokens import AccessTokenService
 from src.solar_api.application.services.user_service import UserService
-from src.solar_api.adapters.repositories import PostgresUserRepository
+from src.solar_api.adapters.repositories import select_user_repository
 from src.solar_api.database import get_db
 from src.solar_api.application.services.auth_service import (
+    get_access_token_service,
+    get_fresh_api_key_user,
     get_current_user,
     get_admin_user,
 )
@@ -22,12 +26,12 @@ router = APIRouter(
     description="Authenticate user with email and password and return user details with API key",
     response_description="User details including API key",
 )
-async def login(email: str, password: str, db=Depends(get_db)):
-    user_repository = PostgresUserRepository(db)
+async def login(email: str, password: str, request: Request, db=Depends(get_db)):
+    user_repository = select_user_repository(request.app.state, db)
     user_service = UserService(user_repository)
 
-    user = await user_service.get_user_by_email(email)
-    if not user or not user.is_active:
+    user = await user_service.authenticate_user(email, password)
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -36,6 +40,28 @@ async def login(email: str, password: str, db=Depends(get_db)):
     return user
 
 
+@router.post(
+    "/token",
+    response_model=Token,
+    summary="Exchange API key for an access token",
+    description="Exchange the API key in `X-API-Key` for a short-lived signed token, "
+    "sent afterwards as `Authorization: Bearer <token>`",
+    response_description="Signed access token",
+)
+async def issue_access_token(
+    current_user: UserInDB = Depends(get_fresh_api_key_user),
+    access_tokens: Optional[AccessTokenService] = Depends(get_access_token_service),
+):
+    if access_tokens is None:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Access tokens are not enabled",
+        )
+
+    token, expires_in = access_tokens.issue(current_user)
+    return Token(access_token=token, token_type="bearer", expires_in=expires_in)
+
+
 @router.get(
     "/me",
     response_model=UserInDB,
@@ -55,10 +81,14 @@ async def read_users_me(current_user: UserInDB = Depends(get_current_user)):
     response_description="New API key",
 )
 async def rotate_api_key(
-    current_user: UserInDB = Depends(get_current_user), db=Depends(get_db)
+    request: Request,
+    current_user: UserInDB = Depends(get_current_user),
+    db=Depends(get_db),
 ):
-    user_repository = PostgresUserRepository(db)
-    user_service = UserService(user_repository)
+    user_repository = select_user_repository(request.app.state, db)
+    user_service = UserService(
+        user_repository, getattr(request.app.state, "auth_cache", None)
+    )
 
     new_key = await user_service.rotate_api_key(current_user.id, current_user)
     return {"api_key": new_key}
@@ -72,10 +102,15 @@ async def rotate_api_key(
     response_description="New API key",
 )
 async def rotate_user_api_key(
-    user_id: int, admin_user: UserInDB = Depends(get_admin_user), db=Depends(get_db)
+    user_id: int,
+    request: Request,
+    admin_user: UserInDB = Depends(get_admin_user),
+    db=Depends(get_db),
 ):
-    user_repository = PostgresUserRepository(db)
-    user_service = UserService(user_repository)
+    user_repository = select_user_repository(request.app.state, db)
+    user_service = UserService(
+        user_repository, getattr(request.app.state, "auth_cache", None)
+    )
 
     new_key = await user_service.rotate_api_key(user_id, admin_user)
     return {"api_key": new_key}
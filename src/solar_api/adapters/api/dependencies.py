@@ -1,23 +1,24 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 import secrets
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBasic, HTTPBasicCredentials, OAuth2PasswordBearer
-from jose import JWTError, jwt
+from jose import jwt
 from pydantic import BaseModel
+from src.solar_api import config
 from src.solar_api.domain.user_models import UserInDB
-from src.solar_api.database import get_db
-from src.solar_api.adapters.repositories import PostgresUserRepository
-from src.solar_api.application.services.user_service import UserService
-import os
+from src.solar_api.application.access_tokens import AccessTokenService
+from src.solar_api.application.services.auth_service import (
+    get_access_token_service,
+    get_token_user,
+)
 
-SECRET_KEY = os.getenv("SECRET_KEY")
-ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 30
+SECRET_KEY = config.SECRET_KEY
+ALGORITHM = config.ACCESS_TOKEN_ALGORITHM
+ACCESS_TOKEN_EXPIRE_MINUTES = config.ACCESS_TOKEN_EXPIRE_MINUTES
 
 security = HTTPBasic()
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
-
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
 
 
 class Token(BaseModel):
@@ -44,38 +45,19 @@ def verify_credentials(credentials: HTTPBasicCredentials = Depends(security)):
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = datetime.now(timezone.utc) + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(minutes=15)
+        expire = datetime.now(timezone.utc) + timedelta(minutes=15)
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme)) -> UserInDB:
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-        token_data = TokenData(email=email)
-    except JWTError:
-        raise credentials_exception
-
-    db = next(get_db())
-    user_repository = PostgresUserRepository(db)
-    user_service = UserService(user_repository)
-    user = await user_service.get_user_by_email(email=token_data.email)
-
-    if user is None:
-        raise credentials_exception
-    return user
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    access_tokens: Optional[AccessTokenService] = Depends(get_access_token_service),
+) -> UserInDB:
+    return get_token_user(token, access_tokens)
 
 
 def get_current_active_user(
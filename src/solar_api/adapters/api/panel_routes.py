@@ -1,56 +1,198 @@
 from uuid import UUID
-from typing import List, Optional
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.ext.asyncio import AsyncSession
-from src.solar_api.database import get_db
-from src.solar_api.adapters.repositories.postgres_panel_repository import (
+from typing import List, Literal, Optional
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from src.solar_api import config
+from src.solar_api.database import get_db, get_session_factory
+from src.solar_api.adapters.repositories import (
+    AsyncpgPanelRepository,
     PostgresPanelRepository,
+    select_panel_repository,
 )
 from src.solar_api.application.services.panel_service import PanelService
+from src.solar_api.application.collection_versions import etag_matches
+from src.solar_api.application.panel_import import (
+    CSV_MEDIA_TYPES,
+    NDJSON_MEDIA_TYPES,
+    iter_csv_records,
+    iter_ndjson_records,
+)
 from src.solar_api.domain.panel_model import (
+    PANEL_MODEL_LIST_ADAPTER,
     PanelModel,
+    PanelImportReport,
     PanelModelCreate,
+    PanelModelQuery,
     PanelModelUpdate,
+    PanelSortField,
 )
 from src.solar_api.application.services.auth_service import (
     get_current_user,
     get_admin_user,
 )
+from src.solar_api.application.services.quota_service import (
+    SCOPE_PANELS,
+    require_quota,
+)
 from src.solar_api.domain.user_models import UserInDB
 
-router = APIRouter(prefix="/api/panel-models", tags=["Panel Models"])
+router = APIRouter(
+    prefix="/api/panel-models",
+    tags=["Panel Models"],
+    dependencies=[Depends(require_quota(SCOPE_PANELS))],
+)
+
+
+def get_panel_service(
+    request: Request, db: AsyncSession = Depends(get_db)
+) -> PanelService:
+    return PanelService(select_panel_repository(request.app.state, db))
+
+
+def _json(
+    body: bytes, response: Response, status_code: int = status.HTTP_200_OK
+) -> Response:
+    # The body is already serialized from validated models; returning a
+    # Response makes FastAPI skip validating it again against response_model
+    return Response(
+        body,
+        status_code=status_code,
+        media_type="application/json",
+        headers=dict(response.headers),
+    )
 
 
-def get_panel_service(db: AsyncSession = Depends(get_db)) -> PanelService:
-    panel_repository = PostgresPanelRepository(db)
-    return PanelService(panel_repository)
+def _not_modified(request: Request, etag: str) -> Optional[Response]:
+    if etag_matches(request.headers.get("If-None-Match"), etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": "private, no-cache"},
+        )
+    return None
 
 
 @router.get(
     "/",
     response_model=List[PanelModel],
     summary="List all panel models for the current user",
+    description="Returns one page of panel models. `q` fuzzy-matches name and "
+    "manufacturer and orders results by relevance. When more results exist, the "
+    "`X-Next-Cursor` response header carries the `cursor` for the next page. "
+    "Send the `ETag` back in `If-None-Match` to get a 304 while nothing changed.",
 )
 async def list_panel_models(
+    request: Request,
+    response: Response,
     current_user: UserInDB = Depends(get_current_user),
     panel_service: PanelService = Depends(get_panel_service),
+    q: Optional[str] = Query(None, min_length=2, max_length=100),
     manufacturer: Optional[str] = None,
     min_capacity: Optional[float] = None,
     min_efficiency: Optional[float] = None,
     panel_type: Optional[str] = None,
+    sort_by: Optional[PanelSortField] = None,
+    descending: bool = False,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
 ):
-    panels = await panel_service.get_all_models(user_id=current_user.id)
+    if sort_by == "relevance" and not q:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="sort_by=relevance requires q",
+        )
+
+    # Answered from the collection state alone (cached per worker), before
+    # the list query runs
+    versions = getattr(request.app.state, "panel_versions", None)
+    etag = None
+    if versions is not None:
+        etag = await versions.current(
+            current_user.id,
+            lambda: panel_service.collection_state(current_user.id),
+            variant=str(request.query_params),
+        )
+        not_modified = _not_modified(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+    page = await panel_service.list_models(
+        user_id=current_user.id,
+        query=PanelModelQuery(
+            q=q,
+            manufacturer=manufacturer,
+            panel_type=panel_type,
+            min_capacity=min_capacity,
+            min_efficiency=min_efficiency,
+            sort_by=sort_by,
+            descending=descending,
+            limit=limit,
+            cursor=cursor,
+        ),
+    )
+    if page.next_cursor is not None:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    if etag is not None:
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "private, no-cache"
+
+    return _json(PANEL_MODEL_LIST_ADAPTER.dump_json(page.items), response)
 
-    if manufacturer is not None:
-        panels = [p for p in panels if p.manufacturer == manufacturer]
-    if min_capacity is not None:
-        panels = [p for p in panels if p.capacity >= min_capacity]
-    if min_efficiency is not None:
-        panels = [p for p in panels if p.efficiency >= min_efficiency]
-    if panel_type is not None:
-        panels = [p for p in panels if p.type == panel_type]
 
-    return panels
+EXPORT_MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+@router.get(
+    "/export",
+    summary="Export all panel models of the current user",
+    description="Streams every panel model as CSV or NDJSON, read from the "
+    "database in batches through a server-side cursor.",
+    response_class=StreamingResponse,
+)
+async def export_panel_models(
+    request: Request,
+    export_format: Literal["csv", "ndjson"] = Query("csv", alias="format"),
+    current_user: UserInDB = Depends(get_current_user),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+):
+    pool = getattr(request.app.state, "asyncpg_pool", None)
+
+    async def export(panel_service: PanelService):
+        async for chunk in panel_service.export_models(
+            user_id=current_user.id,
+            export_format=export_format,
+            batch_size=config.PANEL_EXPORT_BATCH_SIZE,
+        ):
+            yield chunk
+
+    async def body():
+        if pool is not None:
+            async for chunk in export(PanelService(AsyncpgPanelRepository(pool))):
+                yield chunk
+            return
+        # The request session is closed before the body is sent, so the
+        # stream keeps its own session open for as long as the cursor is
+        async with session_factory() as session:
+            async for chunk in export(PanelService(PostgresPanelRepository(session))):
+                yield chunk
+
+    return StreamingResponse(
+        body(),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="panel-models.{export_format}"'
+            )
+        },
+    )
 
 
 @router.get(
@@ -58,12 +200,22 @@ async def list_panel_models(
 )
 async def get_panel_model(
     model_id: UUID,
+    request: Request,
+    response: Response,
     current_user: UserInDB = Depends(get_current_user),
     panel_service: PanelService = Depends(get_panel_service),
 ):
-    return await panel_service.get_model_by_id(
+    panel = await panel_service.get_model_by_id(
         model_id=model_id, user_id=current_user.id
     )
+    etag = f'"{panel.id}.{panel.updated_at.isoformat()}"'
+    not_modified = _not_modified(request, etag)
+    if not_modified is not None:
+        return not_modified
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+    return _json(panel.model_dump_json().encode(), response)
 
 
 @router.post(
@@ -74,10 +226,50 @@ async def get_panel_model(
 )
 async def create_panel_model(
     panel: PanelModelCreate,
+    response: Response,
     current_user: UserInDB = Depends(get_current_user),
     panel_service: PanelService = Depends(get_panel_service),
 ):
-    return await panel_service.create_model(panel=panel, user_id=current_user.id)
+    created = await panel_service.create_model(panel=panel, user_id=current_user.id)
+    return _json(
+        created.model_dump_json().encode(),
+        response,
+        status_code=status.HTTP_201_CREATED,
+    )
+
+
+@router.post(
+    "/import",
+    response_model=PanelImportReport,
+    summary="Bulk import panel models",
+    description="Streams a CSV (with header) or NDJSON body, validating each row. "
+    "Valid rows are inserted in chunks; with `atomic=true` nothing is kept unless "
+    "every row is valid.",
+)
+async def import_panel_models(
+    request: Request,
+    atomic: bool = False,
+    current_user: UserInDB = Depends(get_current_user),
+    panel_service: PanelService = Depends(get_panel_service),
+):
+    media_type = request.headers.get("Content-Type", "").split(";")[0].strip()
+    if media_type in CSV_MEDIA_TYPES:
+        records = iter_csv_records(request.stream())
+    elif media_type in NDJSON_MEDIA_TYPES:
+        records = iter_ndjson_records(request.stream())
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send text/csv or application/x-ndjson",
+        )
+
+    return await panel_service.import_models(
+        records,
+        user_id=current_user.id,
+        atomic=atomic,
+        chunk_size=config.PANEL_IMPORT_CHUNK_SIZE,
+        max_rows=config.PANEL_IMPORT_MAX_ROWS,
+    )
 
 
 @router.put(
@@ -86,12 +278,14 @@ async def create_panel_model(
 async def update_panel_model(
     model_id: UUID,
     panel_update: PanelModelUpdate,
+    response: Response,
     current_user: UserInDB = Depends(get_current_user),
     panel_service: PanelService = Depends(get_panel_service),
 ):
-    return await panel_service.update_model(
+    updated = await panel_service.update_model(
         model_id=model_id, panel_update=panel_update, user_id=current_user.id
     )
+    return _json(updated.model_dump_json().encode(), response)
 
 
 @router.delete(
@@ -1,28 +1,187 @@
+import json
+import math
 import sys
-from fastapi import APIRouter, HTTPException, Depends
-from src.solar_api.domain.models import PVGISRequest
+from typing import Any, AsyncIterator, Dict, Literal, Optional
+from fastapi import APIRouter, HTTPException, Depends, Request, status
+from fastapi.responses import StreamingResponse
+from src.solar_api import config
+from src.solar_api.domain.models import PVGISRequest, PVGISBatchRequest
+from src.solar_api.application import metrics
 from src.solar_api.application.services.solar_service import SolarService
+from src.solar_api.application.ports.pvgis_service import (
+    PVGISServicePort,
+    PVGISUnavailableError,
+)
+from src.solar_api.application.services.pvgis_cache_service import CachedPVGISService
+from src.solar_api.application.services.circuit_breaker_pvgis_service import (
+    CircuitBreakerPVGISService,
+)
+from src.solar_api.application.services.fallback_pvgis_service import (
+    FallbackPVGISService,
+)
+from src.solar_api.application.services.rate_limited_pvgis_service import (
+    RateLimitedPVGISService,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_BATCH,
+)
 from src.solar_api.adapters.pvgis.pvgis_adapter import PVGISAdapter
-from src.solar_api.application.services.auth_service import get_current_user
+from src.solar_api.adapters.pvgis.yield_grid import YieldGridPVGISService
+from src.solar_api.application.services.auth_service import (
+    get_current_user,
+    get_admin_user,
+)
+from src.solar_api.application.services.quota_service import (
+    QuotaService,
+    SCOPE_CALCULATE,
+    charge_quota,
+    get_quota_service,
+    require_quota,
+)
 from src.solar_api.domain.user_models import UserInDB
 
 router = APIRouter()
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+Engine = Literal["pvgis", "local"]
+
+
+def build_pvgis_service(
+    request: Request, priority: int, timeout: float, engine: Engine = "pvgis"
+) -> PVGISServicePort:
+    state = request.app.state
+    local_engine = getattr(state, "pvgis_local_engine", None)
+    if engine == "local":
+        if local_engine is None:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Local yield engine is not configured",
+            )
+        return local_engine
+
+    pvgis_service = PVGISAdapter(client=getattr(state, "pvgis_client", None))
+
+    rate_limiter = getattr(state, "pvgis_rate_limiter", None)
+    if rate_limiter is not None:
+        pvgis_service = RateLimitedPVGISService(
+            pvgis_service, rate_limiter, priority=priority, timeout=timeout
+        )
+
+    breaker = getattr(state, "pvgis_circuit_breaker", None)
+    if breaker is not None:
+        pvgis_service = CircuitBreakerPVGISService(pvgis_service, breaker)
+
+    bypass = "no-cache" in request.headers.get("Cache-Control", "").lower()
+    pvgis_cache = getattr(state, "pvgis_cache", None)
+    if pvgis_cache is not None:
+        pvgis_service = CachedPVGISService(
+            pvgis_service,
+            pvgis_cache,
+            bypass=bypass,
+            single_flight=getattr(state, "pvgis_single_flight", None),
+        )
+
+    if local_engine is not None and config.PVGIS_LOCAL_FALLBACK:
+        pvgis_service = FallbackPVGISService(pvgis_service, local_engine)
+
+    yield_grid = getattr(state, "pvgis_yield_grid", None)
+    if yield_grid is not None and not bypass:
+        pvgis_service = YieldGridPVGISService(pvgis_service, yield_grid)
+
+    return pvgis_service
+
+
+def get_solar_service(request: Request, engine: Engine = "pvgis") -> SolarService:
+    return SolarService(
+        pvgis_service=build_pvgis_service(
+            request,
+            priority=PRIORITY_INTERACTIVE,
+            timeout=config.PVGIS_RATE_LIMIT_INTERACTIVE_TIMEOUT,
+            engine=engine,
+        )
+    )
+
+
+def get_batch_solar_service(request: Request, engine: Engine = "pvgis") -> SolarService:
+    return SolarService(
+        pvgis_service=build_pvgis_service(
+            request,
+            priority=PRIORITY_BATCH,
+            timeout=config.PVGIS_RATE_LIMIT_BATCH_TIMEOUT,
+            engine=engine,
+        )
+    )
+
+
+def _unavailable(error: PVGISUnavailableError) -> HTTPException:
+    retry_after = max(1, math.ceil(error.retry_after or 0))
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=str(error),
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
+async def _ndjson_lines(results: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    async for result in results:
+        yield json.dumps(result, separators=(",", ":")) + "\n"
+
 
 @router.get("/health", tags=["Health"])
 async def health_check():
     return {"status": "ok", "python_version": sys.version, "message": "API is running!"}
 
 
-@router.post("/calculate", tags=["Solar"])
+@router.get("/metrics", tags=["Health"])
+async def get_metrics(admin_user: UserInDB = Depends(get_admin_user)):
+    return metrics.snapshot()
+
+
+@router.post(
+    "/calculate",
+    tags=["Solar"],
+    dependencies=[Depends(require_quota(SCOPE_CALCULATE))],
+)
 async def calculate_solar_production(
     request: PVGISRequest,
     current_user: UserInDB = Depends(get_current_user),
+    solar_service: SolarService = Depends(get_solar_service),
 ):
     try:
-        pvgis_adapter = PVGISAdapter()
-        solar_service = SolarService(pvgis_service=pvgis_adapter)
         result = await solar_service.calculate_energy_production(request)
         return result
+    except PVGISUnavailableError as e:
+        raise _unavailable(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/calculate/batch", tags=["Solar"])
+async def calculate_solar_production_batch(
+    batch: PVGISBatchRequest,
+    http_request: Request,
+    current_user: UserInDB = Depends(get_current_user),
+    solar_service: SolarService = Depends(get_batch_solar_service),
+    quota: Optional[QuotaService] = Depends(get_quota_service),
+):
+    if len(batch.items) > config.PVGIS_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Batch is limited to {config.PVGIS_BATCH_MAX_ITEMS} items",
+        )
+    charge_quota(quota, current_user, SCOPE_CALCULATE, cost=len(batch.items))
+
+    if NDJSON_MEDIA_TYPE in http_request.headers.get("Accept", ""):
+        return StreamingResponse(
+            _ndjson_lines(
+                solar_service.iter_batch(
+                    batch.items, concurrency=config.PVGIS_BATCH_CONCURRENCY
+                )
+            ),
+            media_type=NDJSON_MEDIA_TYPE,
+        )
+
+    results = await solar_service.calculate_batch(
+        batch.items, concurrency=config.PVGIS_BATCH_CONCURRENCY
+    )
+    return {"results": results}
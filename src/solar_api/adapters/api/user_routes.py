@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime, timedelta, timezone
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from typing import List
 
 from src.solar_api.domain.user_models import (
@@ -6,9 +7,11 @@ from src.solar_api.domain.user_models import (
     UserUpdate,
     UserInDB,
     UserResponse,
+    UserUsage,
+    UsageEntry,
 )
 from src.solar_api.application.services.user_service import UserService
-from src.solar_api.adapters.repositories import PostgresUserRepository
+from src.solar_api.adapters.repositories import select_user_repository
 from src.solar_api.database import get_db
 from src.solar_api.application.services.auth_service import (
     get_current_user,
@@ -18,9 +21,9 @@ from src.solar_api.application.services.auth_service import (
 router = APIRouter(prefix="/users", tags=["Users"])
 
 
-def get_user_service(db=Depends(get_db)) -> UserService:
-    user_repository = PostgresUserRepository(db)
-    return UserService(user_repository)
+def get_user_service(request: Request, db=Depends(get_db)) -> UserService:
+    user_repository = select_user_repository(request.app.state, db)
+    return UserService(user_repository, getattr(request.app.state, "auth_cache", None))
 
 
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
@@ -59,6 +62,37 @@ async def read_user(
     return user
 
 
+@router.get("/{user_id}/usage", response_model=UserUsage)
+async def read_user_usage(
+    user_id: int,
+    request: Request,
+    days: int = Query(30, ge=1, le=366),
+    current_user: UserInDB = Depends(get_current_user),
+):
+    if not current_user.is_admin and current_user.id != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions"
+        )
+
+    recorder = getattr(request.app.state, "usage_recorder", None)
+    if recorder is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Usage accounting is not enabled",
+        )
+
+    since = datetime.now(timezone.utc).date() - timedelta(days=days - 1)
+    usage = await recorder.usage(user_id, since)
+    return UserUsage(
+        user_id=user_id,
+        since=since,
+        usage=[
+            UsageEntry(day=day, scope=scope, requests=count)
+            for day, scope, count in usage
+        ],
+    )
+
+
 @router.get("/", response_model=List[UserResponse])
 async def list_users(
     skip: int = 0,
@@ -0,0 +1,111 @@
+import asyncio
+import json
+import logging
+from typing import Any, Optional
+
+import asyncpg
+from sqlalchemy import ColumnElement, Text, cast, func, literal, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.solar_api.application.invalidation import InvalidationBus
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "solarview_invalidation"
+RECONNECT_MIN_DELAY = 1.0
+RECONNECT_MAX_DELAY = 30.0
+
+
+async def publish_invalidation(session: AsyncSession, entity: str, **fields: Any):
+    """Queue a NOTIFY in the session's transaction; it is sent only on commit."""
+    if session.get_bind().dialect.name != "postgresql":
+        return
+
+    payload = json.dumps({"entity": entity, **fields}, default=str)
+    await session.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": INVALIDATION_CHANNEL, "payload": payload},
+    )
+
+
+def invalidation_notify(
+    session: AsyncSession, entity: str, **fields: Any
+) -> Optional[ColumnElement]:
+    """pg_notify() for the RETURNING clause of a write, or None off PostgreSQL.
+
+    The NOTIFY then costs no round-trip of its own and is only queued for rows
+    the write actually touched. Field values may be columns of the written row.
+    """
+    if session.get_bind().dialect.name != "postgresql":
+        return None
+
+    pairs = []
+    for key, value in {"entity": entity, **fields}.items():
+        pairs.append(literal(key))
+        is_sql = isinstance(value, ColumnElement) or hasattr(
+            value, "__clause_element__"
+        )
+        pairs.append(value if is_sql else literal(value))
+    return func.pg_notify(
+        INVALIDATION_CHANNEL, cast(func.json_build_object(*pairs), Text)
+    ).label("notified")
+
+
+class PostgresInvalidationListener:
+    """LISTENs on a dedicated asyncpg connection and feeds the invalidation bus."""
+
+    def __init__(self, dsn: str, bus: InvalidationBus):
+        self.dsn = dsn.replace("postgresql+asyncpg://", "postgresql://")
+        self.bus = bus
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    def _on_notification(self, connection, pid, channel, payload) -> None:
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logger.warning(f"Ignoring malformed invalidation payload: {payload!r}")
+            return
+        self.bus.dispatch(event)
+
+    async def _run(self) -> None:
+        delay = RECONNECT_MIN_DELAY
+        first = True
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                closed = asyncio.Event()
+                connection.add_termination_listener(lambda _: closed.set())
+                await connection.add_listener(
+                    INVALIDATION_CHANNEL, self._on_notification
+                )
+                # Anything published while we were not listening is lost
+                if not first:
+                    self.bus.reset()
+                first = False
+                delay = RECONNECT_MIN_DELAY
+                logger.info(f"Listening for invalidations on {INVALIDATION_CHANNEL}")
+                await closed.wait()
+                logger.warning("Invalidation listener connection lost")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Invalidation listener failed: {e}")
+            finally:
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_DELAY)
+            first = False
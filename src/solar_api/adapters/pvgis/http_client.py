@@ -0,0 +1,36 @@
+import logging
+import httpx
+
+from src.solar_api import config
+
+logger = logging.getLogger(__name__)
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def create_pvgis_client() -> httpx.AsyncClient:
+    http2 = config.PVGIS_HTTP2
+    if http2 and not _http2_available():
+        logger.warning("PVGIS_HTTP2 is enabled but 'h2' is not installed, using HTTP/1.1")
+        http2 = False
+
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=config.PVGIS_MAX_CONNECTIONS,
+            max_keepalive_connections=config.PVGIS_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=config.PVGIS_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(
+            connect=config.PVGIS_CONNECT_TIMEOUT,
+            read=config.PVGIS_READ_TIMEOUT,
+            write=config.PVGIS_WRITE_TIMEOUT,
+            pool=config.PVGIS_POOL_TIMEOUT,
+        ),
+    )
@@ -0,0 +1,382 @@
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from src.solar_api.adapters.pvgis.pvgis_adapter import format_pvcalc_response
+from src.solar_api.application.ports.pvgis_service import (
+    PVGISServicePort,
+    PVGISUnavailableError,
+)
+from src.solar_api.domain.models import PVGISRequest
+
+MOUNTING_TYPE = "fixed"
+TECHNOLOGY = "c-Si"
+
+SOLAR_CONSTANT = 1.367  # kW/m²
+GROUND_ALBEDO = 0.2
+NOCT = 45.0  # °C
+TEMPERATURE_COEFFICIENT = -0.004  # 1/°C, crystalline silicon
+IAM_B0 = 0.05  # ASHRAE incidence angle modifier
+
+MONTH_DAYS = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], dtype=float)
+# Days whose extraterrestrial irradiation is closest to the monthly mean (Klein, 1977)
+REPRESENTATIVE_DAYS = np.array(
+    [17, 47, 75, 105, 135, 162, 198, 228, 258, 288, 318, 344], dtype=float
+)
+HOUR_ANGLES = np.linspace(-np.pi, np.pi, 96, endpoint=False) + np.pi / 96
+SLOPES = np.radians(np.arange(0, 91))
+AZIMUTHS = np.radians(np.array([0.0, 180.0]))  # PVGIS convention: 0 = south
+
+
+class Climatology:
+    """Monthly irradiance and temperature means on a regular lat/lon grid.
+
+    ``ghi`` holds the mean daily global horizontal irradiation (kWh/m²/day)
+    and ``t2m`` the mean air temperature (°C), both shaped (lat, lon, 12).
+    ``valid`` flags the cells that hold data; by default, every cell whose
+    ``ghi`` and ``t2m`` are finite.
+    """
+
+    def __init__(
+        self,
+        lat: np.ndarray,
+        lon: np.ndarray,
+        ghi: np.ndarray,
+        t2m: np.ndarray,
+        ghi_sd: Optional[np.ndarray] = None,
+        elevation: Optional[np.ndarray] = None,
+        year_min: Optional[int] = None,
+        year_max: Optional[int] = None,
+        valid: Optional[np.ndarray] = None,
+    ):
+        self.lat = np.asarray(lat, dtype=float)
+        self.lon = np.asarray(lon, dtype=float)
+        self.ghi = np.asarray(ghi, dtype=float)
+        self.t2m = np.asarray(t2m, dtype=float)
+        self.ghi_sd = None if ghi_sd is None else np.asarray(ghi_sd, dtype=float)
+        self.elevation = None if elevation is None else np.asarray(elevation)
+        self.year_min = year_min
+        self.year_max = year_max
+
+        expected = (len(self.lat), len(self.lon), 12)
+        if self.ghi.shape != expected or self.t2m.shape != expected:
+            raise ValueError(f"ghi and t2m must be shaped {expected}")
+        if valid is None:
+            valid = (np.isfinite(self.ghi) & np.isfinite(self.t2m)).all(axis=-1)
+        self.valid = np.asarray(valid, dtype=bool)
+        if self.valid.shape != expected[:2]:
+            raise ValueError(f"valid must be shaped {expected[:2]}")
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "Climatology":
+        with np.load(path) as data:
+            return cls(
+                lat=data["lat"],
+                lon=data["lon"],
+                ghi=data["ghi"],
+                t2m=data["t2m"],
+                ghi_sd=data["ghi_sd"] if "ghi_sd" in data.files else None,
+                elevation=data["elevation"] if "elevation" in data.files else None,
+                year_min=int(data["year_min"]) if "year_min" in data.files else None,
+                year_max=int(data["year_max"]) if "year_max" in data.files else None,
+                valid=data["valid"] if "valid" in data.files else None,
+            )
+
+    def save(self, path: Union[str, Path]) -> None:
+        arrays = {
+            "lat": self.lat,
+            "lon": self.lon,
+            "ghi": self.ghi,
+            "t2m": self.t2m,
+            "valid": self.valid,
+        }
+        if self.ghi_sd is not None:
+            arrays["ghi_sd"] = self.ghi_sd
+        if self.elevation is not None:
+            arrays["elevation"] = self.elevation
+        if self.year_min is not None:
+            arrays["year_min"] = np.array(self.year_min)
+        if self.year_max is not None:
+            arrays["year_max"] = np.array(self.year_max)
+        np.savez_compressed(path, **arrays)
+
+    def _resolution(self, axis: np.ndarray) -> float:
+        return float(np.max(np.diff(axis))) if len(axis) > 1 else 1.0
+
+    def nearest_cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        i = int(np.abs(self.lat - lat).argmin())
+        j = int(np.abs(self.lon - lon).argmin())
+        if abs(self.lat[i] - lat) > self._resolution(self.lat) or abs(
+            self.lon[j] - lon
+        ) > self._resolution(self.lon):
+            raise PVGISUnavailableError(
+                f"Location ({lat}, {lon}) is outside the local climatology coverage"
+            )
+        if not self.valid[i, j]:
+            raise PVGISUnavailableError(
+                f"The local climatology has no data near ({lat}, {lon})"
+            )
+        return i, j
+
+
+class _Plane:
+    """Optimal fixed plane for one climatology cell, per kWp and before losses."""
+
+    def __init__(
+        self,
+        slope: float,
+        azimuth: float,
+        irradiation: np.ndarray,
+        effective: np.ndarray,
+        thermal: np.ndarray,
+    ):
+        self.slope = slope
+        self.azimuth = azimuth
+        self.irradiation = irradiation
+        self.effective = effective
+        self.thermal = thermal
+
+
+def _optimal_plane(lat: float, ghi: np.ndarray, t2m: np.ndarray) -> _Plane:
+    phi = np.radians(lat)
+    delta = np.radians(23.45) * np.sin(2 * np.pi * (284 + REPRESENTATIVE_DAYS) / 365)
+    sunset = np.arccos(np.clip(-np.tan(phi) * np.tan(delta), -1, 1))
+
+    eccentricity = 1 + 0.033 * np.cos(2 * np.pi * REPRESENTATIVE_DAYS / 365)
+    h0 = (
+        24
+        / np.pi
+        * SOLAR_CONSTANT
+        * eccentricity
+        * (
+            np.cos(phi) * np.cos(delta) * np.sin(sunset)
+            + sunset * np.sin(phi) * np.sin(delta)
+        )
+    )
+    kt = np.clip(np.divide(ghi, h0, out=np.zeros_like(ghi), where=h0 > 0), 0, 1)
+
+    # Erbs et al. (1982) monthly diffuse fraction
+    diffuse_fraction = np.where(
+        sunset <= np.radians(81.4),
+        1.391 - 3.560 * kt + 4.189 * kt**2 - 2.137 * kt**3,
+        1.311 - 3.022 * kt + 3.427 * kt**2 - 1.821 * kt**3,
+    )
+    diffuse = ghi * np.clip(diffuse_fraction, 0, 1)
+    beam = ghi - diffuse
+
+    sin_d, cos_d = np.sin(delta)[:, None], np.cos(delta)[:, None]
+    cos_w, sin_w = np.cos(HOUR_ANGLES), np.sin(HOUR_ANGLES)
+    cos_zenith = np.sin(phi) * sin_d + np.cos(phi) * cos_d * cos_w
+    sun_up = cos_zenith > 0
+    horizontal = np.where(sun_up, cos_zenith, 0).sum(axis=-1)
+
+    beta = SLOPES[None, :, None, None]
+    gamma = AZIMUTHS[:, None, None, None]
+    cos_incidence = (
+        sin_d * np.sin(phi) * np.cos(beta)
+        - sin_d * np.cos(phi) * np.sin(beta) * np.cos(gamma)
+        + cos_d * np.cos(phi) * np.cos(beta) * cos_w
+        + cos_d * np.sin(phi) * np.sin(beta) * np.cos(gamma) * cos_w
+        + cos_d * np.sin(beta) * np.sin(gamma) * sin_w
+    )
+    cos_incidence = np.where(sun_up & (cos_incidence > 0), cos_incidence, 0)
+    iam = np.clip(1 - IAM_B0 * (1 / np.maximum(cos_incidence, 1e-6) - 1), 0, 1) * (
+        cos_incidence > 0
+    )
+
+    rb = np.divide(
+        cos_incidence.sum(axis=-1),
+        horizontal,
+        out=np.zeros(cos_incidence.shape[:-1]),
+        where=horizontal > 0,
+    )
+    rb_iam = np.divide(
+        (cos_incidence * iam).sum(axis=-1),
+        horizontal,
+        out=np.zeros(cos_incidence.shape[:-1]),
+        where=horizontal > 0,
+    )
+
+    tilt = SLOPES[None, :, None]
+    sky_and_ground = (
+        diffuse * (1 + np.cos(tilt)) / 2 + ghi * GROUND_ALBEDO * (1 - np.cos(tilt)) / 2
+    )
+    irradiation = beam * rb + sky_and_ground
+    effective = beam * rb_iam + sky_and_ground
+
+    a, b = np.unravel_index(
+        (irradiation * MONTH_DAYS).sum(axis=-1).argmax(), irradiation.shape[:2]
+    )
+    daylight_hours = 24 * sunset / np.pi
+    mean_irradiance = np.divide(
+        irradiation[a, b] * 1000,
+        daylight_hours,
+        out=np.zeros(12),
+        where=daylight_hours > 0,
+    )
+    cell_temperature = t2m + mean_irradiance * (NOCT - 20) / 800
+
+    return _Plane(
+        slope=float(np.degrees(SLOPES[b])),
+        azimuth=float(np.degrees(AZIMUTHS[a])),
+        irradiation=irradiation[a, b],
+        effective=effective[a, b],
+        thermal=1 + TEMPERATURE_COEFFICIENT * (cell_temperature - 25),
+    )
+
+
+def _totals_loss(numerator: np.ndarray, denominator: np.ndarray) -> float:
+    total = float((denominator * MONTH_DAYS).sum())
+    if total <= 0:
+        return 0.0
+    return (float((numerator * MONTH_DAYS).sum()) / total - 1) * 100
+
+
+class LocalYieldAdapter(PVGISServicePort):
+    """Estimates PVGIS-shaped yields offline from a local climatology."""
+
+    def __init__(self, climatology: Climatology):
+        self.climatology = climatology
+        self._planes: Dict[Tuple[int, int], _Plane] = {}
+
+    def _plane(self, cell: Tuple[int, int]) -> _Plane:
+        plane = self._planes.get(cell)
+        if plane is None:
+            i, j = cell
+            plane = _optimal_plane(
+                float(self.climatology.lat[i]),
+                self.climatology.ghi[i, j],
+                self.climatology.t2m[i, j],
+            )
+            self._planes[cell] = plane
+        return plane
+
+    def estimate(self, params: PVGISRequest) -> Dict[str, Any]:
+        cell = self.climatology.nearest_cell(params.lat, params.lon)
+        plane = self._plane(cell)
+
+        system_factor = params.peakpower * (1 - params.loss / 100)
+        e_d = plane.effective * plane.thermal * system_factor
+        e_m = e_d * MONTH_DAYS
+        h_d = plane.irradiation
+        h_m = h_d * MONTH_DAYS
+
+        ghi = self.climatology.ghi[cell]
+        if self.climatology.ghi_sd is not None:
+            variability = np.divide(
+                self.climatology.ghi_sd[cell],
+                ghi,
+                out=np.zeros(12),
+                where=ghi > 0,
+            )
+        else:
+            variability = np.zeros(12)
+        sd_m = e_m * variability
+
+        l_aoi = _totals_loss(plane.effective, plane.irradiation)
+        l_tg = _totals_loss(plane.effective * plane.thermal, plane.effective)
+        l_total = (
+            (1 + l_aoi / 100) * (1 + l_tg / 100) * (1 - params.loss / 100) - 1
+        ) * 100
+
+        e_y = float(e_m.sum())
+        h_y = float(h_m.sum())
+        elevation = self.climatology.elevation
+        raw_response = {
+            "inputs": {
+                "location": {
+                    "latitude": params.lat,
+                    "longitude": params.lon,
+                    "elevation": (
+                        float(elevation[cell]) if elevation is not None else None
+                    ),
+                },
+                "meteo_data": {
+                    "year_min": self.climatology.year_min,
+                    "year_max": self.climatology.year_max,
+                },
+                "mounting_system": {
+                    MOUNTING_TYPE: {
+                        "slope": {"value": plane.slope, "optimal": True},
+                        "azimuth": {"value": plane.azimuth, "optimal": True},
+                        "type": "free-standing",
+                    }
+                },
+                "pv_module": {
+                    "technology": TECHNOLOGY,
+                    "peak_power": params.peakpower,
+                    "system_loss": params.loss,
+                },
+                "economic_data": {
+                    "system_cost": None,
+                    "interest": None,
+                    "lifetime": None,
+                },
+            },
+            "outputs": {
+                "monthly": {
+                    MOUNTING_TYPE: [
+                        {
+                            "month": month + 1,
+                            "E_d": round(float(e_d[month]), 2),
+                            "E_m": round(float(e_m[month]), 2),
+                            "H(i)_d": round(float(h_d[month]), 2),
+                            "H(i)_m": round(float(h_m[month]), 2),
+                            "SD_m": round(float(sd_m[month]), 2),
+                        }
+                        for month in range(12)
+                    ]
+                },
+                "totals": {
+                    MOUNTING_TYPE: {
+                        "E_d": round(e_y / float(MONTH_DAYS.sum()), 2),
+                        "E_m": round(e_y / 12, 2),
+                        "E_y": round(e_y, 2),
+                        "H(i)_d": round(h_y / float(MONTH_DAYS.sum()), 2),
+                        "H(i)_m": round(h_y / 12, 2),
+                        "H(i)_y": round(h_y, 2),
+                        "SD_m": round(float(sd_m.mean()), 2),
+                        "SD_y": round(float(np.sqrt((sd_m**2).sum())), 2),
+                        "l_aoi": round(l_aoi, 2),
+                        "l_spec": "0.0",
+                        "l_tg": round(l_tg, 2),
+                        "l_total": round(l_total, 2),
+                    }
+                },
+            },
+        }
+        return {**format_pvcalc_response(raw_response), "source": "local"}
+
+    def get_cached_pv_data(self, params: PVGISRequest) -> Optional[Dict[str, Any]]:
+        try:
+            return self.estimate(params)
+        except PVGISUnavailableError:
+            return None
+
+    async def get_pv_data(self, params: PVGISRequest) -> Dict[str, Any]:
+        return self.estimate(params)
+
+
+def compare_with_pvgis(
+    estimate: Dict[str, Any], reference: Dict[str, Any]
+) -> Dict[str, float]:
+    """Relative errors (%) of a local estimate against a formatted PVGIS result."""
+    est_totals = estimate["outputs"]["totals"][MOUNTING_TYPE]
+    ref_totals = reference["outputs"]["totals"][MOUNTING_TYPE]
+    est_monthly = np.array(
+        [row["E_m"] for row in estimate["outputs"]["monthly"][MOUNTING_TYPE]]
+    )
+    ref_monthly = np.array(
+        [row["E_m"] for row in reference["outputs"]["monthly"][MOUNTING_TYPE]]
+    )
+
+    return {
+        "E_y": (est_totals["E_y"] / ref_totals["E_y"] - 1) * 100,
+        "H(i)_y": (est_totals["H(i)_y"] / ref_totals["H(i)_y"] - 1) * 100,
+        "E_m_mape": float(np.mean(np.abs(est_monthly / ref_monthly - 1)) * 100),
+        "slope": (
+            estimate["mounting_system"][MOUNTING_TYPE]["slope"]["value"]
+            - reference["mounting_system"][MOUNTING_TYPE]["slope"]["value"]
+        ),
+    }
@@ -1,12 +1,42 @@
 import httpx
-from typing import Dict, Any
-from src.solar_api.application.ports.pvgis_service import PVGISServicePort
+from typing import Dict, Any, Optional
+from src.solar_api.application.ports.pvgis_service import (
+    PVGISServicePort,
+    PVGISUnavailableError,
+    PVGISRateLimitedError,
+)
 from src.solar_api.domain.models import PVGISRequest
 
 
+def format_pvcalc_response(raw_response: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "latitude": raw_response["inputs"]["location"]["latitude"],
+        "longitude": raw_response["inputs"]["location"]["longitude"],
+        "elevation": raw_response["inputs"]["location"]["elevation"],
+        "meteo_data": {
+            "year_min": raw_response["inputs"]["meteo_data"]["year_min"],
+            "year_max": raw_response["inputs"]["meteo_data"]["year_max"],
+        },
+        "mounting_system": raw_response["inputs"]["mounting_system"],
+        "pv_module": {
+            "technology": raw_response["inputs"]["pv_module"]["technology"],
+            "peak_power": raw_response["inputs"]["pv_module"]["peak_power"],
+            "system_loss": raw_response["inputs"]["pv_module"]["system_loss"],
+        },
+        "economic_data": raw_response["inputs"]["economic_data"],
+        "outputs": {
+            "monthly": raw_response["outputs"]["monthly"],
+            "totals": raw_response["outputs"]["totals"],
+        },
+    }
+
+
 class PVGISAdapter(PVGISServicePort):
     PVGIS_URL = "https://re.jrc.ec.europa.eu/api/pvcalc"
 
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        self.client = client
+
     async def get_pv_data(self, params: PVGISRequest) -> Dict[str, Any]:
         api_params = {
             "lat": params.lat,
@@ -17,29 +47,33 @@ class PVGISAdapter(PVGISServicePort):
             "optimalinclination": 1,
             "optimalazimuth": 1,
         }
-        async with httpx.AsyncClient() as client:
-            response = await client.get(self.PVGIS_URL, params=api_params)
-            response.raise_for_status()
-            return self._format_response(response.json())
+        try:
+            if self.client is not None:
+                response = await self.client.get(self.PVGIS_URL, params=api_params)
+            else:
+                async with httpx.AsyncClient() as client:
+                    response = await client.get(self.PVGIS_URL, params=api_params)
+        except httpx.TransportError as e:
+            raise PVGISUnavailableError(f"PVGIS request failed: {type(e).__name__}")
+
+        if response.status_code == 429:
+            raise PVGISRateLimitedError(
+                "PVGIS rate limit exceeded",
+                retry_after=self._parse_retry_after(response),
+            )
+        if response.status_code >= 500:
+            raise PVGISUnavailableError(
+                f"PVGIS returned HTTP {response.status_code}",
+                retry_after=self._parse_retry_after(response),
+            )
+        response.raise_for_status()
+        return self._format_response(response.json())
+
+    def _parse_retry_after(self, response: httpx.Response) -> Optional[float]:
+        try:
+            return float(response.headers["Retry-After"])
+        except (KeyError, ValueError):
+            return None
 
     def _format_response(self, raw_response: Dict[str, Any]) -> Dict[str, Any]:
-        return {
-            "latitude": raw_response["inputs"]["location"]["latitude"],
-            "longitude": raw_response["inputs"]["location"]["longitude"],
-            "elevation": raw_response["inputs"]["location"]["elevation"],
-            "meteo_data": {
-                "year_min": raw_response["inputs"]["meteo_data"]["year_min"],
-                "year_max": raw_response["inputs"]["meteo_data"]["year_max"],
-            },
-            "mounting_system": raw_response["inputs"]["mounting_system"],
-            "pv_module": {
-                "technology": raw_response["inputs"]["pv_module"]["technology"],
-                "peak_power": raw_response["inputs"]["pv_module"]["peak_power"],
-                "system_loss": raw_response["inputs"]["pv_module"]["system_loss"],
-            },
-            "economic_data": raw_response["inputs"]["economic_data"],
-            "outputs": {
-                "monthly": raw_response["outputs"]["monthly"],
-                "totals": raw_response["outputs"]["totals"],
-            },
-        }
+        return format_pvcalc_response(raw_response)
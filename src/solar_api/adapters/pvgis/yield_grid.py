@@ -0,0 +1,269 @@
+import json
+import math
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Union
+
+import numpy as np
+
+from src.solar_api.application import metrics
+from src.solar_api.application.ports.pvgis_service import PVGISServicePort
+from src.solar_api.application.services.solar_service import (
+    REFERENCE_LOSS,
+    REFERENCE_PEAKPOWER,
+    rescale_pv_data,
+)
+from src.solar_api.domain.models import PVGISRequest
+
+MOUNTING_TYPE = "fixed"
+MONTH_DAYS = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], dtype=float)
+KM_PER_DEGREE = 111.32
+
+# Per-node arrays stored as <name>.npy, with their trailing shape
+NODE_ARRAYS = {
+    "e_m": (12,),
+    "h_m": (12,),
+    "sd_m": (12,),
+    "sd_y": (),
+    "losses": (3,),  # l_aoi, l_spec, l_tg
+    "slope": (),
+    "azimuth": (),
+    "elevation": (),
+}
+
+
+class YieldGrid:
+    """Normalized (1 kWp, 0% loss) PVGIS yields on a regular lat/lon grid.
+
+    Arrays live in a directory of ``.npy`` files and are memory-mapped, so
+    workers share the pages and nothing is parsed at startup.
+    """
+
+    def __init__(self, path: Union[str, Path], mode: str = "r"):
+        self.path = Path(path)
+        self.meta = json.loads((self.path / "meta.json").read_text())
+        self.lat = np.load(self.path / "lat.npy")
+        self.lon = np.load(self.path / "lon.npy")
+        self.valid = np.load(self.path / "valid.npy", mmap_mode=mode)
+        self.arrays = {
+            name: np.load(self.path / f"{name}.npy", mmap_mode=mode)
+            for name in NODE_ARRAYS
+        }
+        self.lat_step = float(self.lat[1] - self.lat[0])
+        self.lon_step = float(self.lon[1] - self.lon[0])
+
+    @classmethod
+    def create(
+        cls,
+        path: Union[str, Path],
+        lat: Sequence[float],
+        lon: Sequence[float],
+        **meta: Any,
+    ) -> "YieldGrid":
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        lat, lon = np.asarray(lat, dtype=float), np.asarray(lon, dtype=float)
+        if len(lat) < 2 or len(lon) < 2:
+            raise ValueError("A grid needs at least two nodes per axis")
+
+        np.save(path / "lat.npy", lat)
+        np.save(path / "lon.npy", lon)
+        shape = (len(lat), len(lon))
+        np.lib.format.open_memmap(
+            path / "valid.npy", mode="w+", dtype=bool, shape=shape
+        ).flush()
+        for name, tail in NODE_ARRAYS.items():
+            np.lib.format.open_memmap(
+                path / f"{name}.npy", mode="w+", dtype=np.float32, shape=shape + tail
+            ).flush()
+        (path / "meta.json").write_text(json.dumps(meta))
+        return cls(path, mode="r+")
+
+    def save_meta(self) -> None:
+        (self.path / "meta.json").write_text(json.dumps(self.meta))
+
+    def set_node(self, i: int, j: int, pv_data: Dict[str, Any]) -> None:
+        """Store a formatted, normalized PVGIS result at node (i, j).
+
+        Every value is parsed before any is written, so a malformed result
+        raises KeyError, TypeError or ValueError and leaves the node untouched.
+        """
+        monthly = pv_data["outputs"]["monthly"][MOUNTING_TYPE]
+        totals = pv_data["outputs"]["totals"][MOUNTING_TYPE]
+        mounting = pv_data["mounting_system"][MOUNTING_TYPE]
+
+        values = {
+            "e_m": [float(row["E_m"]) for row in monthly],
+            "h_m": [float(row["H(i)_m"]) for row in monthly],
+            "sd_m": [float(row["SD_m"]) for row in monthly],
+            "sd_y": float(totals["SD_y"]),
+            "losses": [
+                float(totals["l_aoi"]),
+                float(totals["l_spec"]),
+                float(totals["l_tg"]),
+            ],
+            "slope": float(mounting["slope"]["value"]),
+            "azimuth": float(mounting["azimuth"]["value"]),
+            "elevation": float(pv_data["elevation"] or 0),
+        }
+        for name, value in values.items():
+            if np.shape(value) != NODE_ARRAYS[name]:
+                raise ValueError(f"PVGIS result has a malformed {name!r}")
+
+        for name, value in values.items():
+            self.arrays[name][i, j] = value
+        self.valid[i, j] = True
+
+    def flush(self) -> None:
+        self.valid.flush()
+        for array in self.arrays.values():
+            array.flush()
+
+    def interpolate(self, lat: float, lon: float) -> Optional[Dict[str, Any]]:
+        """Bilinear estimate of the normalized response, or None off-grid."""
+        y = (lat - self.lat[0]) / self.lat_step
+        x = (lon - self.lon[0]) / self.lon_step
+        if not (0 <= y <= len(self.lat) - 1 and 0 <= x <= len(self.lon) - 1):
+            return None
+
+        i = min(int(y), len(self.lat) - 2)
+        j = min(int(x), len(self.lon) - 2)
+        if not self.valid[i : i + 2, j : j + 2].all():
+            return None
+
+        dy, dx = y - i, x - j
+        weights = np.array(
+            [[(1 - dy) * (1 - dx), (1 - dy) * dx], [dy * (1 - dx), dy * dx]]
+        )
+
+        def blend(name: str) -> np.ndarray:
+            cell = np.asarray(self.arrays[name][i : i + 2, j : j + 2], dtype=float)
+            return np.tensordot(weights, cell, axes=([0, 1], [0, 1]))
+
+        nearest = (i + round(dy), j + round(dx))
+        distance_km = KM_PER_DEGREE * math.hypot(
+            lat - self.lat[nearest[0]],
+            (lon - self.lon[nearest[1]]) * math.cos(math.radians(lat)),
+        )
+        return self._response(
+            lat,
+            lon,
+            nearest,
+            e_m=blend("e_m"),
+            h_m=blend("h_m"),
+            sd_m=blend("sd_m"),
+            sd_y=float(blend("sd_y")),
+            losses=blend("losses"),
+            elevation=float(blend("elevation")),
+            distance_km=distance_km,
+        )
+
+    def _response(
+        self,
+        lat: float,
+        lon: float,
+        nearest: tuple,
+        e_m: np.ndarray,
+        h_m: np.ndarray,
+        sd_m: np.ndarray,
+        sd_y: float,
+        losses: np.ndarray,
+        elevation: float,
+        distance_km: float,
+    ) -> Dict[str, Any]:
+        e_y, h_y = float(e_m.sum()), float(h_m.sum())
+        days = float(MONTH_DAYS.sum())
+        l_aoi, l_spec, l_tg = (float(value) for value in losses)
+        l_total = ((1 + l_aoi / 100) * (1 + l_spec / 100) * (1 + l_tg / 100) - 1) * 100
+
+        return {
+            "latitude": lat,
+            "longitude": lon,
+            "elevation": round(elevation),
+            "meteo_data": {
+                "year_min": self.meta.get("year_min"),
+                "year_max": self.meta.get("year_max"),
+            },
+            "mounting_system": {
+                MOUNTING_TYPE: {
+                    "slope": {
+                        "value": float(self.arrays["slope"][nearest]),
+                        "optimal": True,
+                    },
+                    "azimuth": {
+                        "value": float(self.arrays["azimuth"][nearest]),
+                        "optimal": True,
+                    },
+                    "type": "free-standing",
+                }
+            },
+            "pv_module": {
+                "technology": self.meta.get("technology", "c-Si"),
+                "peak_power": REFERENCE_PEAKPOWER,
+                "system_loss": REFERENCE_LOSS,
+            },
+            "economic_data": {"system_cost": None, "interest": None, "lifetime": None},
+            "outputs": {
+                "monthly": {
+                    MOUNTING_TYPE: [
+                        {
+                            "month": month + 1,
+                            "E_d": round(float(e_m[month] / MONTH_DAYS[month]), 2),
+                            "E_m": round(float(e_m[month]), 2),
+                            "H(i)_d": round(float(h_m[month] / MONTH_DAYS[month]), 2),
+                            "H(i)_m": round(float(h_m[month]), 2),
+                            "SD_m": round(float(sd_m[month]), 2),
+                        }
+                        for month in range(12)
+                    ]
+                },
+                "totals": {
+                    MOUNTING_TYPE: {
+                        "E_d": round(e_y / days, 2),
+                        "E_m": round(e_y / 12, 2),
+                        "E_y": round(e_y, 2),
+                        "H(i)_d": round(h_y / days, 2),
+                        "H(i)_m": round(h_y / 12, 2),
+                        "H(i)_y": round(h_y, 2),
+                        "SD_m": round(float(sd_m.mean()), 2),
+                        "SD_y": round(sd_y, 2),
+                        "l_aoi": round(l_aoi, 2),
+                        "l_spec": f"{l_spec:.2f}",
+                        "l_tg": round(l_tg, 2),
+                        "l_total": round(l_total, 2),
+                    }
+                },
+            },
+            "source": "grid",
+            "accuracy": {
+                "method": "bilinear",
+                "resolution": max(abs(self.lat_step), abs(self.lon_step)),
+                "distance_km": round(distance_km, 1),
+            },
+        }
+
+
+class YieldGridPVGISService(PVGISServicePort):
+    """Answers points inside the precomputed grid, delegating the rest."""
+
+    def __init__(self, pvgis_service: PVGISServicePort, grid: YieldGrid):
+        self.pvgis_service = pvgis_service
+        self.grid = grid
+
+    def _lookup(self, params: PVGISRequest) -> Optional[Dict[str, Any]]:
+        base = self.grid.interpolate(params.lat, params.lon)
+        if base is None:
+            metrics.increment("pvgis_grid.misses")
+            return None
+        metrics.increment("pvgis_grid.hits")
+        if params.peakpower == REFERENCE_PEAKPOWER and params.loss == REFERENCE_LOSS:
+            return base
+        return rescale_pv_data(base, params.peakpower, params.loss)
+
+    def get_cached_pv_data(self, params: PVGISRequest) -> Optional[Dict[str, Any]]:
+        return self._lookup(params) or self.pvgis_service.get_cached_pv_data(params)
+
+    async def get_pv_data(self, params: PVGISRequest) -> Dict[str, Any]:
+        result = self._lookup(params)
+        if result is not None:
+            return result
+        return await self.pvgis_service.get_pv_data(params)
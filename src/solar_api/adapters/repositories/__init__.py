@@ -1,3 +1,36 @@
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.solar_api.application.ports.panel_repository import PanelRepositoryPort
+from src.solar_api.application.ports.user_repository import UserRepositoryPort
+
+from .asyncpg_panel_repository import AsyncpgPanelRepository
+from .asyncpg_user_repository import AsyncpgUserRepository
+from .postgres_panel_repository import PostgresPanelRepository
 from .postgres_user_repository import PostgresUserRepository
 
-__all__ = ["PostgresUserRepository"]
+
+def select_user_repository(state: Any, db: AsyncSession) -> UserRepositoryPort:
+    """The configured user repository: asyncpg when its pool is up, else the ORM."""
+    users = getattr(state, "user_repository", None)
+    return users if users is not None else PostgresUserRepository(db)
+
+
+def select_panel_repository(state: Any, db: AsyncSession) -> PanelRepositoryPort:
+    versions = getattr(state, "panel_versions", None)
+    trigram_search = getattr(state, "pg_trgm", False)
+    pool = getattr(state, "asyncpg_pool", None)
+    if pool is not None:
+        return AsyncpgPanelRepository(pool, versions, trigram_search)
+    return PostgresPanelRepository(db, versions, trigram_search)
+
+
+__all__ = [
+    "AsyncpgPanelRepository",
+    "AsyncpgUserRepository",
+    "PostgresPanelRepository",
+    "PostgresUserRepository",
+    "select_panel_repository",
+    "select_user_repository",
+]
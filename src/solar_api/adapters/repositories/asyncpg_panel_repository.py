@@ -0,0 +1,361 @@
+import json
+import uuid
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+import asyncpg
+
+from src.solar_api.adapters.notifications.postgres_invalidation import (
+    INVALIDATION_CHANNEL,
+)
+from src.solar_api.adapters.repositories.asyncpg_pool import (
+    fetch_prepared,
+    fetchrow_prepared,
+)
+from src.solar_api.adapters.repositories.postgres_panel_repository import (
+    BULK_COLUMNS,
+    decode_position,
+)
+from src.solar_api.application.collection_versions import (
+    CollectionVersions,
+    collection_state,
+)
+from src.solar_api.application.invalidation import ENTITY_PANEL
+from src.solar_api.application.pagination import encode_cursor
+from src.solar_api.application.panel_export import EXPORT_COLUMNS, ExportBatch
+from src.solar_api.application.ports.panel_repository import PanelRepositoryPort
+from src.solar_api.domain.panel_model import (
+    PANEL_MODEL_LIST_ADAPTER,
+    PanelModel,
+    PanelModelCreate,
+    PanelModelPage,
+    PanelModelQuery,
+    PanelModelUpdate,
+)
+
+COLUMNS = "id, name, capacity, efficiency, manufacturer, type, created_at, updated_at"
+
+# Queued in the writing statement itself; sent on commit, only for written rows
+NOTIFY = (
+    f"pg_notify('{INVALIDATION_CHANNEL}', json_build_object("
+    f"'entity', '{ENTITY_PANEL}', 'id', id, 'user_id', user_id)::text) AS notified"
+)
+
+# Adds one to a user's panel collection version (see collection_state)
+BUMP_VERSION = (
+    "INSERT INTO panel_collection_versions (user_id, version) {source} "
+    "ON CONFLICT (user_id) DO UPDATE "
+    "SET version = panel_collection_versions.version + 1"
+)
+
+
+def with_version_bump(write: str, user_param: str) -> str:
+    """``write`` (with RETURNING), bumping the user's collection version in the
+    same statement when it matched a row."""
+    bump = BUMP_VERSION.format(
+        source=f"SELECT {user_param}::integer, 1 WHERE EXISTS (SELECT 1 FROM written)"
+    )
+    return f"WITH written AS ({write}), bumped AS ({bump}) SELECT * FROM written"
+
+
+# Prepared by name on every pooled connection (see create_asyncpg_pool)
+PANEL_STATEMENTS = {
+    "panel_by_id": (
+        f"SELECT {COLUMNS} FROM panel_models WHERE id = $1 AND user_id = $2"
+    ),
+    "panel_list_all": (
+        f"SELECT {COLUMNS} FROM panel_models WHERE user_id = $1 ORDER BY name"
+    ),
+    "panel_collection_state": (
+        "SELECT version FROM panel_collection_versions WHERE user_id = $1"
+    ),
+    "panel_list_by_name": (
+        f"SELECT {COLUMNS}, name AS sort_key FROM panel_models "
+        "WHERE user_id = $1 ORDER BY name, id LIMIT $2"
+    ),
+    "panel_create": with_version_bump(
+        "INSERT INTO panel_models "
+        "(id, user_id, name, capacity, efficiency, manufacturer, type) "
+        f"VALUES ($1, $2, $3, $4, $5, $6, $7) RETURNING {COLUMNS}, {NOTIFY}",
+        "$2",
+    ),
+    "panel_delete": with_version_bump(
+        "DELETE FROM panel_models WHERE id = $1 AND user_id = $2 "
+        f"RETURNING id, {NOTIFY}",
+        "$2",
+    ),
+}
+
+EXPORT_QUERY = (
+    f"SELECT {', '.join(EXPORT_COLUMNS)} FROM panel_models "
+    "WHERE user_id = $1 ORDER BY id"
+)
+
+# Parameter types of keyset positions, per sort key
+SORT_TYPES = {
+    "name": "text",
+    "capacity": "float8",
+    "efficiency": "float8",
+    "created_at": "timestamptz",
+    "relevance": "float8",
+}
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def build_list_query(
+    user_id: int, query: PanelModelQuery, trigram_search: bool = False
+) -> Tuple[str, List[Any], Dict[str, Any]]:
+    """SQL, arguments and cursor position for one page of list_page().
+
+    Mirrors PostgresPanelRepository.list_page, so cursors work on either backend.
+    Without ``trigram_search`` (pg_trgm missing), q= matches with ILIKE only.
+    """
+    sort_by = query.sort_by or ("relevance" if query.q else "name")
+    descending = query.descending or sort_by == "relevance"
+    args: List[Any] = [user_id]
+    where = ["user_id = $1"]
+
+    def arg(value: Any) -> str:
+        args.append(value)
+        return f"${len(args)}"
+
+    sort_key = sort_by
+    if query.q and trigram_search:
+        q = arg(query.q)
+        pattern = arg(f"%{_escape_like(query.q)}%")
+        where.append(
+            f"({q} <% name OR {q} <% manufacturer "
+            f"OR name ILIKE {pattern} OR manufacturer ILIKE {pattern})"
+        )
+        if sort_by == "relevance":
+            sort_key = (
+                f"greatest(word_similarity({q}, name), "
+                f"word_similarity({q}, manufacturer))::float8"
+            )
+    elif query.q:
+        pattern = arg(f"%{_escape_like(query.q)}%")
+        where.append(f"(name ILIKE {pattern} OR manufacturer ILIKE {pattern})")
+        if sort_by == "relevance":
+            # Same exact > prefix > substring ranking as the ORM fallback
+            needle = arg(query.q.lower())
+            prefix = arg(f"{_escape_like(query.q)}%")
+            sort_key = (
+                f"(CASE WHEN lower(name) = {needle} THEN 1.0 "
+                f"WHEN lower(manufacturer) = {needle} THEN 0.9 "
+                f"WHEN name ILIKE {prefix} THEN 0.7 "
+                f"WHEN manufacturer ILIKE {prefix} THEN 0.6 "
+                f"WHEN name ILIKE {pattern} THEN 0.4 ELSE 0.3 END)::float8"
+            )
+    if query.manufacturer is not None:
+        where.append(f"manufacturer = {arg(query.manufacturer)}")
+    if query.panel_type is not None:
+        where.append(f"type = {arg(query.panel_type)}")
+    if query.min_capacity is not None:
+        where.append(f"capacity >= {arg(query.min_capacity)}")
+    if query.min_efficiency is not None:
+        where.append(f"efficiency >= {arg(query.min_efficiency)}")
+
+    position = {"s": sort_by, "d": descending, "q": query.q}
+    if query.cursor is not None:
+        value, last_id = decode_position(query.cursor, position)
+        after = f"({arg(value)}::{SORT_TYPES[sort_by]}, {arg(last_id)}::uuid)"
+        where.append(f"({sort_key}, id) {'<' if descending else '>'} {after}")
+
+    direction = " DESC" if descending else ""
+    sql = (
+        f"SELECT {COLUMNS}, {sort_key} AS sort_key FROM panel_models "
+        f"WHERE {' AND '.join(where)} "
+        f"ORDER BY {sort_key}{direction}, id{direction} LIMIT {arg(query.limit + 1)}"
+    )
+    return sql, args, position
+
+
+def _is_first_page_by_name(query: PanelModelQuery) -> bool:
+    return (
+        query.sort_by in (None, "name")
+        and not query.descending
+        and query.q is None
+        and query.manufacturer is None
+        and query.panel_type is None
+        and query.min_capacity is None
+        and query.min_efficiency is None
+        and query.cursor is None
+    )
+
+
+class AsyncpgPanelRepository(PanelRepositoryPort):
+    """PanelRepositoryPort on a raw asyncpg pool, without the ORM.
+
+    Single-statement writes run in autocommit. Bulk imports hold one pooled
+    connection in a transaction until commit() or rollback(); the caller must
+    reach one of them on every path, cancellation included.
+    """
+
+    def __init__(
+        self,
+        pool: asyncpg.Pool,
+        versions: Optional[CollectionVersions] = None,
+        trigram_search: bool = False,
+    ):
+        self.pool = pool
+        self.versions = versions
+        self.trigram_search = trigram_search
+        self._changed_users: Set[int] = set()
+        self._connection: Optional[asyncpg.Connection] = None
+        self._transaction = None
+
+    async def get_all(self, user_id: int) -> List[PanelModel]:
+        rows = await fetch_prepared(self.pool, "panel_list_all", user_id)
+        return PANEL_MODEL_LIST_ADAPTER.validate_python(map(dict, rows))
+
+    async def collection_state(self, user_id: int) -> str:
+        row = await fetchrow_prepared(self.pool, "panel_collection_state", user_id)
+        return collection_state(user_id, row["version"] if row else None)
+
+    async def list_page(self, user_id: int, query: PanelModelQuery) -> PanelModelPage:
+        if _is_first_page_by_name(query):
+            rows = await fetch_prepared(
+                self.pool, "panel_list_by_name", user_id, query.limit + 1
+            )
+            position = {"s": "name", "d": False, "q": None}
+        else:
+            sql, args, position = build_list_query(
+                user_id, query, self.trigram_search
+            )
+            async with self.pool.acquire() as connection:
+                rows = await connection.fetch(sql, *args)
+
+        next_cursor = None
+        if len(rows) > query.limit:
+            rows = rows[: query.limit]
+            last = rows[-1]
+            next_cursor = encode_cursor(
+                {**position, "v": last["sort_key"], "id": last["id"]}
+            )
+
+        return PanelModelPage(
+            items=PANEL_MODEL_LIST_ADAPTER.validate_python(map(dict, rows)),
+            next_cursor=next_cursor,
+        )
+
+    async def iter_export(
+        self, user_id: int, batch_size: int
+    ) -> AsyncIterator[ExportBatch]:
+        async with self.pool.acquire() as connection:
+            # asyncpg cursors are server-side portals and need a transaction
+            async with connection.transaction():
+                cursor = await connection.cursor(EXPORT_QUERY, user_id)
+                while batch := await cursor.fetch(batch_size):
+                    yield [tuple(record) for record in batch]
+
+    async def get_by_id(self, model_id: UUID, user_id: int) -> Optional[PanelModel]:
+        row = await fetchrow_prepared(self.pool, "panel_by_id", model_id, user_id)
+        return PanelModel.model_validate(dict(row)) if row else None
+
+    async def create(self, panel: PanelModelCreate, user_id: int) -> PanelModel:
+        row = await fetchrow_prepared(
+            self.pool,
+            "panel_create",
+            uuid.uuid4(),
+            user_id,
+            panel.name,
+            panel.capacity,
+            panel.efficiency,
+            panel.manufacturer,
+            panel.type,
+        )
+        self._changed_users.add(user_id)
+        await self.commit()
+        return PanelModel.model_validate(dict(row))
+
+    async def bulk_create(self, panels: List[PanelModelCreate], user_id: int) -> int:
+        if not panels:
+            return 0
+
+        if self._transaction is None:
+            connection = await self.pool.acquire()
+            try:
+                transaction = connection.transaction()
+                await transaction.start()
+            except BaseException:
+                await self.pool.release(connection)
+                raise
+            self._connection, self._transaction = connection, transaction
+
+        records = [
+            (uuid.uuid4(), user_id, *(getattr(panel, c) for c in BULK_COLUMNS[2:]))
+            for panel in panels
+        ]
+        await self._connection.copy_records_to_table(
+            "panel_models", records=records, columns=BULK_COLUMNS
+        )
+        await self._connection.execute(
+            f"WITH bumped AS ({BUMP_VERSION.format(source='VALUES ($3, 1)')}) "
+            "SELECT pg_notify($1, $2)",
+            INVALIDATION_CHANNEL,
+            json.dumps({"entity": ENTITY_PANEL, "user_id": user_id}),
+            user_id,
+        )
+        self._changed_users.add(user_id)
+        return len(records)
+
+    async def _finish(self, commit: bool) -> None:
+        if self._transaction is None:
+            return
+        try:
+            if commit:
+                await self._transaction.commit()
+            else:
+                await self._transaction.rollback()
+        finally:
+            await self.pool.release(self._connection)
+            self._connection = None
+            self._transaction = None
+
+    async def commit(self) -> None:
+        await self._finish(commit=True)
+        if self.versions is not None:
+            for user_id in self._changed_users:
+                self.versions.bump(user_id)
+        self._changed_users.clear()
+
+    async def rollback(self) -> None:
+        await self._finish(commit=False)
+        self._changed_users.clear()
+
+    async def update(
+        self, model_id: UUID, panel_update: PanelModelUpdate, user_id: int
+    ) -> Optional[PanelModel]:
+        args: List[Any] = [model_id, user_id]
+        assignments = []
+        # Keys are PanelModelUpdate field names, which are also the column names
+        for column, value in panel_update.model_dump(exclude_unset=True).items():
+            args.append(value)
+            assignments.append(f"{column} = ${len(args)}")
+        assignments.append("updated_at = now()")
+
+        sql = with_version_bump(
+            f"UPDATE panel_models SET {', '.join(assignments)} "
+            f"WHERE id = $1 AND user_id = $2 RETURNING {COLUMNS}, {NOTIFY}",
+            "$2",
+        )
+        async with self.pool.acquire() as connection:
+            row = await connection.fetchrow(sql, *args)
+        if row is None:
+            return None
+
+        self._changed_users.add(user_id)
+        await self.commit()
+        return PanelModel.model_validate(dict(row))
+
+    async def delete(self, model_id: UUID, user_id: int) -> bool:
+        row = await fetchrow_prepared(self.pool, "panel_delete", model_id, user_id)
+        if row is None:
+            return False
+
+        self._changed_users.add(user_id)
+        await self.commit()
+        return True
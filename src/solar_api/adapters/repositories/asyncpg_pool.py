@@ -0,0 +1,49 @@
+from typing import Any, Dict, List, Optional
+
+import asyncpg
+
+
+class PreparedConnection(asyncpg.Connection):
+    """Pool connection that keeps its named prepared statements by name."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.statements: Dict[str, asyncpg.prepared_stmt.PreparedStatement] = {}
+
+
+async def create_asyncpg_pool(
+    dsn: str,
+    statements: Dict[str, str],
+    min_size: int,
+    max_size: int,
+) -> asyncpg.Pool:
+    """Pool whose connections prepare ``statements`` once, when they are opened.
+
+    Statements are parsed and planned once per connection instead of once per
+    query. Queries that are not in ``statements`` still go through asyncpg's
+    own per-connection statement cache. Named statements need session-level
+    pooling: they do not survive a PgBouncer in transaction mode.
+    """
+
+    async def prepare(connection: PreparedConnection) -> None:
+        for name, query in statements.items():
+            connection.statements[name] = await connection.prepare(query, name=name)
+
+    return await asyncpg.create_pool(
+        dsn.replace("postgresql+asyncpg://", "postgresql://"),
+        min_size=min_size,
+        max_size=max_size,
+        connection_class=PreparedConnection,
+        init=prepare,
+        server_settings={"application_name": "solarview_app", "timezone": "UTC"},
+    )
+
+
+async def fetch_prepared(pool: asyncpg.Pool, name: str, *args: Any) -> List[Any]:
+    async with pool.acquire() as connection:
+        return await connection.statements[name].fetch(*args)
+
+
+async def fetchrow_prepared(pool: asyncpg.Pool, name: str, *args: Any) -> Optional[Any]:
+    async with pool.acquire() as connection:
+        return await connection.statements[name].fetchrow(*args)
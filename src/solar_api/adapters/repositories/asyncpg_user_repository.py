@@ -0,0 +1,149 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import asyncpg
+
+from src.solar_api.adapters.notifications.postgres_invalidation import (
+    INVALIDATION_CHANNEL,
+)
+from src.solar_api.adapters.repositories.asyncpg_pool import (
+    fetch_prepared,
+    fetchrow_prepared,
+)
+from src.solar_api.application.invalidation import ENTITY_USER
+from src.solar_api.application.ports.user_repository import UserRepositoryPort
+from src.solar_api.application.security import password_hasher
+from src.solar_api.domain.user_models import UserInDB
+
+COLUMNS = "id, email, api_key, is_active, is_admin, created_at, updated_at"
+
+# Columns update() may set; everything else in an update dict is rejected
+UPDATABLE_COLUMNS = frozenset({"email", "password", "api_key", "is_active", "is_admin"})
+
+# Revokes the user's tokens in the same statement as the write; see
+# PostgresUserRepository._revoking_write. $1 is the user id, $2 revoked_at.
+REVOCATION = (
+    "WITH revocation AS ("
+    "INSERT INTO token_revocations (user_id, revoked_at) VALUES ($1, $2) "
+    "ON CONFLICT (user_id) DO UPDATE SET revoked_at = excluded.revoked_at) "
+)
+
+
+def _notify(*fields: str) -> str:
+    pairs = ", ".join(f"'{name}', {value}" for name, value in fields)
+    return (
+        f"pg_notify('{INVALIDATION_CHANNEL}', json_build_object("
+        f"'entity', '{ENTITY_USER}', {pairs})::text) AS notified"
+    )
+
+
+# Prepared by name on every pooled connection (see create_asyncpg_pool)
+USER_STATEMENTS = {
+    "user_by_id": f"SELECT {COLUMNS} FROM users WHERE id = $1",
+    "user_by_email": f"SELECT {COLUMNS} FROM users WHERE email = $1",
+    "user_by_api_key": f"SELECT {COLUMNS} FROM users WHERE api_key = $1",
+    "user_login": f"SELECT {COLUMNS}, password FROM users WHERE email = $1",
+    "user_list": f"SELECT {COLUMNS} FROM users ORDER BY id OFFSET $1 LIMIT $2",
+    "user_create": (
+        "INSERT INTO users (email, password, api_key, is_active, is_admin) "
+        "VALUES ($1, $2, $3, $4, $5) "
+        f"RETURNING {COLUMNS}, {_notify(('api_key', 'api_key'))}"
+    ),
+    "user_rehash": "UPDATE users SET password = $2 WHERE id = $1",
+    "user_delete": (
+        f"{REVOCATION}DELETE FROM users WHERE id = $1 "
+        f"RETURNING id, {_notify(('id', 'id'), ('revoked_at', '$3::float8'))}"
+    ),
+}
+
+
+def _to_user(row: Optional[asyncpg.Record]) -> Optional[UserInDB]:
+    return UserInDB.model_validate(dict(row)) if row else None
+
+
+class AsyncpgUserRepository(UserRepositoryPort):
+    """UserRepositoryPort on a raw asyncpg pool; every write is one statement."""
+
+    def __init__(self, pool: asyncpg.Pool):
+        self.pool = pool
+
+    async def get_by_id(self, user_id: int) -> Optional[UserInDB]:
+        return _to_user(await fetchrow_prepared(self.pool, "user_by_id", user_id))
+
+    async def get_by_email(self, email: str) -> Optional[UserInDB]:
+        return _to_user(await fetchrow_prepared(self.pool, "user_by_email", email))
+
+    async def get_by_api_key(self, api_key: str) -> Optional[UserInDB]:
+        if not api_key:
+            return None
+
+        return _to_user(
+            await fetchrow_prepared(self.pool, "user_by_api_key", api_key)
+        )
+
+    async def create(self, user_data: Dict[str, Any]) -> UserInDB:
+        row = await fetchrow_prepared(
+            self.pool,
+            "user_create",
+            user_data["email"],
+            user_data["password"],
+            user_data["api_key"],
+            user_data.get("is_active", True),
+            user_data.get("is_admin", False),
+        )
+        return _to_user(row)
+
+    async def update(
+        self, user_id: int, user_update: Dict[str, Any]
+    ) -> Optional[UserInDB]:
+        unknown = user_update.keys() - UPDATABLE_COLUMNS
+        if unknown:
+            raise ValueError(f"Cannot update user columns: {sorted(unknown)}")
+
+        revoked_at = datetime.now(timezone.utc)
+        args: List[Any] = [user_id, revoked_at, revoked_at.timestamp()]
+        assignments = []
+        for column, value in user_update.items():
+            args.append(value)
+            assignments.append(f"{column} = ${len(args)}")
+        assignments.append("updated_at = now()")
+
+        notify = _notify(
+            ("id", "id"), ("api_key", "api_key"), ("revoked_at", "$3::float8")
+        )
+        sql = (
+            f"{REVOCATION}UPDATE users SET {', '.join(assignments)} "
+            f"WHERE id = $1 RETURNING {COLUMNS}, {notify}"
+        )
+        async with self.pool.acquire() as connection:
+            return _to_user(await connection.fetchrow(sql, *args))
+
+    async def delete(self, user_id: int) -> bool:
+        revoked_at = datetime.now(timezone.utc)
+        row = await fetchrow_prepared(
+            self.pool, "user_delete", user_id, revoked_at, revoked_at.timestamp()
+        )
+        return row is not None
+
+    async def list_users(self, skip: int = 0, limit: int = 100) -> List[UserInDB]:
+        rows = await fetch_prepared(self.pool, "user_list", skip, limit)
+        return [UserInDB.model_validate(dict(row)) for row in rows]
+
+    async def authenticate(self, email: str, password: str) -> Optional[UserInDB]:
+        row = await fetchrow_prepared(self.pool, "user_login", email)
+        if not row or not row["password"]:
+            return None
+
+        verified, new_hash = await password_hasher.verify_and_update(
+            password, row["password"]
+        )
+        if not verified:
+            return None
+
+        if not row["is_active"]:
+            return None
+
+        if new_hash is not None:
+            await fetch_prepared(self.pool, "user_rehash", row["id"], new_hash)
+
+        return _to_user(row)
@@ -1,82 +1,358 @@
-from typing import List, Optional
+import uuid
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
 from uuid import UUID
-from sqlalchemy import select, update, delete, and_, func
+from sqlalchemy import (
+    Float,
+    and_,
+    case,
+    delete,
+    exists,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.solar_api.domain.panel_model import (
+    PANEL_MODEL_LIST_ADAPTER,
     PanelModel,
     PanelModelCreate,
+    PanelModelPage,
+    PanelModelQuery,
     PanelModelUpdate,
 )
+from src.solar_api.application.panel_export import EXPORT_COLUMNS, ExportBatch
+from src.solar_api.application.pagination import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+)
+from src.solar_api.database.models import PanelCollectionVersion
 from src.solar_api.database.models import PanelModel as PanelModelDB
+from src.solar_api.adapters.notifications.postgres_invalidation import (
+    invalidation_notify,
+    publish_invalidation,
+)
+from src.solar_api.application.collection_versions import (
+    CollectionVersions,
+    collection_state,
+)
+from src.solar_api.application.invalidation import ENTITY_PANEL
 from src.solar_api.application.ports.panel_repository import PanelRepositoryPort
 
 
+BULK_COLUMNS = (
+    "id",
+    "user_id",
+    "name",
+    "capacity",
+    "efficiency",
+    "manufacturer",
+    "type",
+)
+
+# The columns of a PanelModel response; selecting (or RETURNING) these instead
+# of the mapped class skips building ORM objects, and the rows validate as is
+PANEL_COLUMNS = (
+    PanelModelDB.id,
+    PanelModelDB.name,
+    PanelModelDB.capacity,
+    PanelModelDB.efficiency,
+    PanelModelDB.manufacturer,
+    PanelModelDB.type,
+    PanelModelDB.created_at,
+    PanelModelDB.updated_at,
+)
+
+# Each sort key is backed by an (user_id, <column>, id) index
+SORT_COLUMNS = {
+    "name": PanelModelDB.name,
+    "capacity": PanelModelDB.capacity,
+    "efficiency": PanelModelDB.efficiency,
+    "created_at": PanelModelDB.created_at,
+}
+
+
+def decode_position(cursor: str, expected: Dict[str, Any]) -> Tuple[Any, UUID]:
+    """(sort key, id) after which a page continues, for the query ``expected``."""
+    position = decode_cursor(cursor)
+    if any(position.get(key) != value for key, value in expected.items()):
+        raise InvalidCursorError("Cursor does not match the requested query")
+    try:
+        value = position["v"]
+        if expected["s"] == "created_at":
+            value = datetime.fromisoformat(value)
+        return value, UUID(position["id"])
+    except (KeyError, TypeError, ValueError) as e:
+        raise InvalidCursorError("Malformed cursor") from e
+
+
+def bump_version(user_id: int, written=None):
+    """PostgreSQL upsert adding one to the user's panel collection version.
+
+    With ``written`` (a CTE of a write), only if that write matched a row.
+    On SQLite, triggers on panel_models do this instead.
+    """
+    stmt = pg_insert(PanelCollectionVersion)
+    if written is None:
+        stmt = stmt.values(user_id=user_id, version=1)
+    else:
+        stmt = stmt.from_select(
+            ["user_id", "version"],
+            select(literal(user_id), literal(1)).where(exists(select(written.c.id))),
+        )
+    return stmt.on_conflict_do_update(
+        index_elements=[PanelCollectionVersion.user_id],
+        set_={"version": PanelCollectionVersion.version + 1},
+    )
+
+
 class PostgresPanelRepository(PanelRepositoryPort):
-    def __init__(self, db_session: AsyncSession):
+    def __init__(
+        self,
+        db_session: AsyncSession,
+        versions: Optional[CollectionVersions] = None,
+        trigram_search: bool = False,
+    ):
         self.db = db_session
+        self.versions = versions
+        # Only when pg_trgm is installed; see pg_trgm_available()
+        self.trigram_search = trigram_search
+        self._changed_users: Set[int] = set()
+
+    async def _write(self, stmt, user_id: int, model_id: Any) -> Optional[Any]:
+        """Run one write with RETURNING; the row, or None if nothing matched.
+
+        The same statement bumps the user's collection version.
+        """
+        notify = invalidation_notify(
+            self.db, ENTITY_PANEL, id=model_id, user_id=user_id
+        )
+        if notify is not None:
+            stmt = stmt.returning(notify)
+        if self._is_postgres():
+            written = stmt.cte("written")
+            bump = bump_version(user_id, written).cte("bumped")
+            stmt = select(written).add_cte(bump)
+        row = (await self.db.execute(stmt)).first()
+        if row is not None:
+            self._changed_users.add(user_id)
+        return row
 
     async def get_all(self, user_id: int) -> List[PanelModel]:
         result = await self.db.execute(
-            select(PanelModelDB)
+            select(*PANEL_COLUMNS)
             .where(PanelModelDB.user_id == user_id)
             .order_by(PanelModelDB.name)
         )
-        panels = result.scalars().all()
-        return [PanelModel.model_validate(panel.to_dict()) for panel in panels]
+        return PANEL_MODEL_LIST_ADAPTER.validate_python(
+            result.all(), from_attributes=True
+        )
+
+    async def collection_state(self, user_id: int) -> str:
+        version = await self.db.scalar(
+            select(PanelCollectionVersion.version).where(
+                PanelCollectionVersion.user_id == user_id
+            )
+        )
+        return collection_state(user_id, version)
+
+    async def list_page(self, user_id: int, query: PanelModelQuery) -> PanelModelPage:
+        sort_by = query.sort_by or ("relevance" if query.q else "name")
+        # Relevance is always best-first
+        descending = query.descending or sort_by == "relevance"
+        column = (
+            self._search_rank(query.q)
+            if sort_by == "relevance"
+            else SORT_COLUMNS[sort_by]
+        )
+        stmt = select(*PANEL_COLUMNS, column.label("sort_key")).where(
+            PanelModelDB.user_id == user_id
+        )
+
+        if query.q:
+            stmt = stmt.where(self._search_match(query.q))
+        if query.manufacturer is not None:
+            stmt = stmt.where(PanelModelDB.manufacturer == query.manufacturer)
+        if query.panel_type is not None:
+            stmt = stmt.where(PanelModelDB.type == query.panel_type)
+        if query.min_capacity is not None:
+            stmt = stmt.where(PanelModelDB.capacity >= query.min_capacity)
+        if query.min_efficiency is not None:
+            stmt = stmt.where(PanelModelDB.efficiency >= query.min_efficiency)
+
+        position = {"s": sort_by, "d": descending, "q": query.q}
+        if query.cursor is not None:
+            value, last_id = decode_position(query.cursor, position)
+            key = tuple_(column, PanelModelDB.id)
+            after = tuple_(
+                literal(value, column.type), literal(last_id, PanelModelDB.id.type)
+            )
+            stmt = stmt.where(key < after if descending else key > after)
+
+        if descending:
+            stmt = stmt.order_by(column.desc(), PanelModelDB.id.desc())
+        else:
+            stmt = stmt.order_by(column, PanelModelDB.id)
+
+        result = await self.db.execute(stmt.limit(query.limit + 1))
+        rows = result.all()
+
+        next_cursor = None
+        if len(rows) > query.limit:
+            rows = rows[: query.limit]
+            last = rows[-1]
+            next_cursor = encode_cursor(
+                {**position, "v": last.sort_key, "id": last.id}
+            )
+
+        return PanelModelPage(
+            items=PANEL_MODEL_LIST_ADAPTER.validate_python(rows, from_attributes=True),
+            next_cursor=next_cursor,
+        )
+
+    async def iter_export(
+        self, user_id: int, batch_size: int
+    ) -> AsyncIterator[ExportBatch]:
+        # stream() + yield_per reads through a server-side cursor, so only one
+        # batch of plain row tuples is held in memory at a time
+        stmt = (
+            select(*(getattr(PanelModelDB, column) for column in EXPORT_COLUMNS))
+            .where(PanelModelDB.user_id == user_id)
+            .order_by(PanelModelDB.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.db.stream(stmt)
+        async for partition in result.partitions():
+            yield [tuple(row) for row in partition]
+
+    def _is_postgres(self) -> bool:
+        return self.db.get_bind().dialect.name == "postgresql"
+
+    def _uses_trigrams(self) -> bool:
+        return self.trigram_search and self._is_postgres()
+
+    def _search_match(self, q: str):
+        substring = or_(
+            PanelModelDB.name.icontains(q, autoescape=True),
+            PanelModelDB.manufacturer.icontains(q, autoescape=True),
+        )
+        if not self._uses_trigrams():
+            return substring
+        # <% is word similarity; both it and ILIKE use the trigram GIN indexes
+        return or_(
+            literal(q).op("<%")(PanelModelDB.name),
+            literal(q).op("<%")(PanelModelDB.manufacturer),
+            substring,
+        )
+
+    def _search_rank(self, q: str):
+        if self._uses_trigrams():
+            return func.greatest(
+                func.word_similarity(q, PanelModelDB.name),
+                func.word_similarity(q, PanelModelDB.manufacturer),
+            ).cast(Float)
+        # Without pg_trgm, rank exact > prefix > substring matches
+        needle = q.lower()
+        name = func.lower(PanelModelDB.name)
+        manufacturer = func.lower(PanelModelDB.manufacturer)
+        return case(
+            (name == needle, 1.0),
+            (manufacturer == needle, 0.9),
+            (name.startswith(needle, autoescape=True), 0.7),
+            (manufacturer.startswith(needle, autoescape=True), 0.6),
+            (name.contains(needle, autoescape=True), 0.4),
+            else_=0.3,
+        ).cast(Float)
 
     async def get_by_id(self, model_id: UUID, user_id: int) -> Optional[PanelModel]:
         result = await self.db.execute(
-            select(PanelModelDB).where(
+            select(*PANEL_COLUMNS).where(
                 and_(PanelModelDB.id == model_id, PanelModelDB.user_id == user_id)
             )
         )
-        panel = result.scalars().first()
-        return PanelModel.model_validate(panel.to_dict()) if panel else None
+        row = result.first()
+        return PanelModel.model_validate(row) if row else None
 
     async def create(self, panel: PanelModelCreate, user_id: int) -> PanelModel:
-        db_panel = PanelModelDB(
-            name=panel.name,
-            capacity=panel.capacity,
-            efficiency=panel.efficiency,
-            manufacturer=panel.manufacturer,
-            type=panel.type,
-            user_id=user_id,
+        stmt = (
+            insert(PanelModelDB)
+            .values(**panel.model_dump(), user_id=user_id)
+            .returning(*PANEL_COLUMNS)
         )
+        row = await self._write(stmt, user_id, PanelModelDB.id)
+        created = PanelModel.model_validate(row)
+        await self.commit()
+        return created
+
+    async def bulk_create(self, panels: List[PanelModelCreate], user_id: int) -> int:
+        if not panels:
+            return 0
+
+        rows = [
+            {"id": uuid.uuid4(), "user_id": user_id, **panel.model_dump()}
+            for panel in panels
+        ]
+        if self._is_postgres():
+            connection = await self.db.connection()
+            raw = await connection.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(
+                PanelModelDB.__tablename__,
+                records=[tuple(row[c] for c in BULK_COLUMNS) for row in rows],
+                columns=BULK_COLUMNS,
+            )
+            await self.db.execute(bump_version(user_id))
+        else:
+            await self.db.execute(insert(PanelModelDB), rows)
+        await publish_invalidation(self.db, ENTITY_PANEL, user_id=user_id)
+        self._changed_users.add(user_id)
+        return len(rows)
 
-        self.db.add(db_panel)
+    async def commit(self) -> None:
         await self.db.commit()
-        await self.db.refresh(db_panel)
+        # Only after the commit, so no tag is handed out for uncommitted data
+        if self.versions is not None:
+            for user_id in self._changed_users:
+                self.versions.bump(user_id)
+        self._changed_users.clear()
 
-        return PanelModel.model_validate(db_panel.to_dict())
+    async def rollback(self) -> None:
+        await self.db.rollback()
+        self._changed_users.clear()
 
     async def update(
         self, model_id: UUID, panel_update: PanelModelUpdate, user_id: int
     ) -> Optional[PanelModel]:
         update_data = panel_update.model_dump(exclude_unset=True)
 
+        # Ownership is part of the WHERE clause: a foreign id matches no row
         stmt = (
             update(PanelModelDB)
             .where(and_(PanelModelDB.id == model_id, PanelModelDB.user_id == user_id))
             .values(**update_data, updated_at=func.now())
-            .returning(PanelModelDB)
+            .returning(*PANEL_COLUMNS)
         )
+        row = await self._write(stmt, user_id, model_id)
+        if row is None:
+            return None
 
-        result = await self.db.execute(stmt)
-        updated_panel = result.scalars().first()
-
-        if updated_panel:
-            await self.db.commit()
-            await self.db.refresh(updated_panel)
-            return PanelModel.model_validate(updated_panel.to_dict())
-
-        return None
+        updated = PanelModel.model_validate(row)
+        await self.commit()
+        return updated
 
     async def delete(self, model_id: UUID, user_id: int) -> bool:
-        stmt = delete(PanelModelDB).where(
-            and_(PanelModelDB.id == model_id, PanelModelDB.user_id == user_id)
+        stmt = (
+            delete(PanelModelDB)
+            .where(and_(PanelModelDB.id == model_id, PanelModelDB.user_id == user_id))
+            .returning(PanelModelDB.id)
         )
+        if await self._write(stmt, user_id, model_id) is None:
+            return False
 
-        result = await self.db.execute(stmt)
-        await self.db.commit()
-
-        return result.rowcount > 0
+        await self.commit()
+        return True
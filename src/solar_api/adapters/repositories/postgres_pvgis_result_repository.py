@@ -0,0 +1,43 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.solar_api.domain.models import PVGISRequest
+from src.solar_api.database.models import PVGISResult
+from src.solar_api.application.ports.pvgis_result_store import PVGISResultStorePort
+
+
+class PostgresPVGISResultRepository(PVGISResultStorePort):
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession], ttl: float):
+        self.session_factory = session_factory
+        self.ttl = ttl
+
+    async def get(
+        self, key: str, allow_stale: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        stmt = select(PVGISResult.payload).where(PVGISResult.key == key)
+        if not allow_stale:
+            stmt = stmt.where(PVGISResult.expires_at > datetime.now(timezone.utc))
+
+        async with self.session_factory() as session:
+            result = await session.execute(stmt)
+            return result.scalars().first()
+
+    async def set(
+        self, key: str, params: PVGISRequest, result: Dict[str, Any]
+    ) -> None:
+        async with self.session_factory() as session:
+            await session.merge(
+                PVGISResult(
+                    key=key,
+                    lat=params.lat,
+                    lon=params.lon,
+                    peakpower=params.peakpower,
+                    loss=params.loss,
+                    payload=result,
+                    expires_at=datetime.now(timezone.utc)
+                    + timedelta(seconds=self.ttl),
+                )
+            )
+            await session.commit()
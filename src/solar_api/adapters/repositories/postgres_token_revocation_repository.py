@@ -0,0 +1,48 @@
+from datetime import datetime, timezone
+from typing import Dict
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.solar_api.database.models import TokenRevocation
+from src.solar_api.application.ports.token_revocation_store import (
+    TokenRevocationStorePort,
+)
+
+
+def revocation_upsert(session: AsyncSession, user_id: int, revoked_at: datetime):
+    """Single INSERT ... ON CONFLICT statement recording a revocation."""
+    dialect = session.get_bind().dialect.name
+    insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+    stmt = insert(TokenRevocation).values(user_id=user_id, revoked_at=revoked_at)
+    return stmt.on_conflict_do_update(
+        index_elements=["user_id"], set_={"revoked_at": stmt.excluded.revoked_at}
+    )
+
+
+class PostgresTokenRevocationRepository(TokenRevocationStorePort):
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]):
+        self.session_factory = session_factory
+
+    async def load_since(self, since: datetime) -> Dict[int, float]:
+        stmt = select(TokenRevocation.user_id, TokenRevocation.revoked_at).where(
+            TokenRevocation.revoked_at > since
+        )
+        async with self.session_factory() as session:
+            result = await session.execute(stmt)
+            return {
+                user_id: _as_utc(revoked_at).timestamp()
+                for user_id, revoked_at in result.all()
+            }
+
+    async def purge_before(self, before: datetime) -> None:
+        async with self.session_factory() as session:
+            await session.execute(
+                delete(TokenRevocation).where(TokenRevocation.revoked_at <= before)
+            )
+            await session.commit()
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands timezone-aware columns back naive
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
@@ -0,0 +1,41 @@
+from datetime import date
+from typing import Dict, List, Tuple
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.solar_api.database.models import UsageCounter
+from src.solar_api.application.ports.usage_store import UsageKey, UsageStorePort
+
+
+class PostgresUsageRepository(UsageStorePort):
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]):
+        self.session_factory = session_factory
+
+    async def add_counts(self, counts: Dict[UsageKey, int]) -> None:
+        rows = [
+            {"user_id": user_id, "day": day, "scope": scope, "count": count}
+            for (user_id, day, scope), count in counts.items()
+        ]
+        async with self.session_factory() as session:
+            dialect = session.get_bind().dialect.name
+            insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+            stmt = insert(UsageCounter).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["user_id", "day", "scope"],
+                set_={"count": UsageCounter.count + stmt.excluded.count},
+            )
+            await session.execute(stmt)
+            await session.commit()
+
+    async def get_counts(
+        self, user_id: int, since: date
+    ) -> List[Tuple[date, str, int]]:
+        stmt = (
+            select(UsageCounter.day, UsageCounter.scope, UsageCounter.count)
+            .where(UsageCounter.user_id == user_id, UsageCounter.day >= since)
+            .order_by(UsageCounter.day, UsageCounter.scope)
+        )
+        async with self.session_factory() as session:
+            result = await session.execute(stmt)
+            return [tuple(row) for row in result.all()]
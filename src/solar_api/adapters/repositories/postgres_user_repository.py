@@ -1,8 +1,16 @@
+from datetime import datetime, timezone
 from typing import List, Optional, Dict, Any
-from sqlalchemy import select, update, delete
+from sqlalchemy import Row, insert, select, update, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.solar_api.application.security import pwd_context
+from src.solar_api.adapters.notifications.postgres_invalidation import (
+    invalidation_notify,
+)
+from src.solar_api.adapters.repositories.postgres_token_revocation_repository import (
+    revocation_upsert,
+)
+from src.solar_api.application.invalidation import ENTITY_USER
+from src.solar_api.application.security import password_hasher
 from src.solar_api.domain.user_models import UserInDB
 from src.solar_api.database.models import User as UserModel
 from src.solar_api.application.ports.user_repository import UserRepositoryPort
@@ -35,19 +43,49 @@ class PostgresUserRepository(UserRepositoryPort):
         return UserInDB.from_orm(user) if user else None
 
     async def create(self, user_data: Dict[str, Any]) -> UserInDB:
-        db_user = UserModel(
-            email=user_data["email"],
-            password=user_data["password"],
-            api_key=user_data["api_key"],
-            is_active=user_data.get("is_active", True),
-            is_admin=user_data.get("is_admin", False),
+        stmt = (
+            insert(UserModel)
+            .values(
+                email=user_data["email"],
+                password=user_data["password"],
+                api_key=user_data["api_key"],
+                is_active=user_data.get("is_active", True),
+                is_admin=user_data.get("is_admin", False),
+            )
+            .returning(UserModel)
         )
+        notify = invalidation_notify(self.db, ENTITY_USER, api_key=user_data["api_key"])
+        if notify is not None:
+            stmt = stmt.returning(notify)
 
-        self.db.add(db_user)
+        row = (await self.db.execute(stmt)).first()
+        created = UserInDB.from_orm(row[0])
         await self.db.commit()
-        await self.db.refresh(db_user)
+        return created
+
+    async def _revoking_write(self, stmt, user_id: int, **fields: Any) -> Optional[Row]:
+        """Run a write on a user row with RETURNING and revoke the user's tokens.
+
+        On PostgreSQL the revocation rides along as a CTE and the NOTIFY in the
+        RETURNING clause, so this is a single statement (a revocation for a
+        missing user is harmless). Elsewhere the revocation is a second one.
+        """
+        revoked_at = datetime.now(timezone.utc)
+        revocation = revocation_upsert(self.db, user_id, revoked_at)
+        notify = invalidation_notify(
+            self.db,
+            ENTITY_USER,
+            id=user_id,
+            revoked_at=revoked_at.timestamp(),
+            **fields,
+        )
+        if notify is not None:
+            stmt = stmt.add_cte(revocation.cte("revocation")).returning(notify)
 
-        return UserInDB.from_orm(db_user)
+        row = (await self.db.execute(stmt)).first()
+        if row is not None and notify is None:
+            await self.db.execute(revocation)
+        return row
 
     async def update(
         self, user_id: int, user_update: Dict[str, Any]
@@ -58,23 +96,21 @@ class PostgresUserRepository(UserRepositoryPort):
             .values(**user_update)
             .returning(UserModel)
         )
+        row = await self._revoking_write(stmt, user_id, api_key=UserModel.api_key)
+        if row is None:
+            return None
 
-        result = await self.db.execute(stmt)
-        updated_user = result.scalars().first()
-
-        if updated_user:
-            await self.db.commit()
-            await self.db.refresh(updated_user)
-            return UserInDB.from_orm(updated_user)
-
-        return None
+        updated = UserInDB.from_orm(row[0])
+        await self.db.commit()
+        return updated
 
     async def delete(self, user_id: int) -> bool:
-        stmt = delete(UserModel).where(UserModel.id == user_id)
-        result = await self.db.execute(stmt)
-        await self.db.commit()
+        stmt = delete(UserModel).where(UserModel.id == user_id).returning(UserModel.id)
+        if await self._revoking_write(stmt, user_id) is None:
+            return False
 
-        return result.rowcount > 0
+        await self.db.commit()
+        return True
 
     async def list_users(self, skip: int = 0, limit: int = 100) -> List[UserInDB]:
         result = await self.db.execute(select(UserModel).offset(skip).limit(limit))
@@ -87,10 +123,25 @@ class PostgresUserRepository(UserRepositoryPort):
         )
         user = result.scalars().first()
 
-        if not user or not pwd_context.verify(password, user.password):
+        if not user or not user.password:
+            return None
+
+        verified, new_hash = await password_hasher.verify_and_update(
+            password, user.password
+        )
+        if not verified:
             return None
-        
+
         if not user.is_active:
             return None
 
-        return UserInDB.from_orm(user)
+        authenticated = UserInDB.from_orm(user)
+        if new_hash is not None:
+            await self.db.execute(
+                update(UserModel)
+                .where(UserModel.id == user.id)
+                .values(password=new_hash)
+            )
+            await self.db.commit()
+
+        return authenticated
@@ -0,0 +1,175 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from jose import JWTError, jwt
+
+from src.solar_api.application import metrics
+from src.solar_api.application.ports.token_revocation_store import (
+    TokenRevocationStorePort,
+)
+from src.solar_api.domain.user_models import UserInDB
+
+logger = logging.getLogger(__name__)
+
+TOKEN_TYPE = "access"
+
+
+class TokenRevocationList:
+    """user id -> instant before which that user's access tokens are void.
+
+    Entries only matter while a token issued before them could still be
+    alive, so anything older than ``retention`` seconds is dropped.
+    """
+
+    def __init__(self, retention: float):
+        self.retention = retention
+        self._revoked: Dict[int, float] = {}
+
+    def revoke(self, user_id: int, at: Optional[float] = None) -> None:
+        at = time.time() if at is None else at
+        if at > self._revoked.get(user_id, 0):
+            self._revoked[user_id] = at
+
+    def is_revoked(self, user_id: int, issued_at: float) -> bool:
+        revoked_at = self._revoked.get(user_id)
+        return revoked_at is not None and issued_at < revoked_at
+
+    def merge(self, entries: Dict[int, float]) -> None:
+        for user_id, at in entries.items():
+            self.revoke(user_id, at)
+        self.prune()
+
+    def prune(self) -> None:
+        cutoff = time.time() - self.retention
+        for user_id in [u for u, at in self._revoked.items() if at <= cutoff]:
+            del self._revoked[user_id]
+
+    def handle_invalidation(self, event: Dict[str, Any]) -> None:
+        if event.get("id") is not None:
+            self.revoke(int(event["id"]), event.get("revoked_at"))
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+
+class AccessTokenService:
+    """Issues and verifies short-lived signed tokens that stand in for an API key.
+
+    A token carries everything the routes read from the user, so verifying
+    one needs no database round-trip; rotations, deactivations and deletes
+    are caught by the revocation list instead.
+    """
+
+    def __init__(
+        self,
+        secret_key: str,
+        ttl: float,
+        revocations: TokenRevocationList,
+        algorithm: str = "HS256",
+    ):
+        if not secret_key:
+            raise ValueError("secret_key is required to sign access tokens")
+        self.secret_key = secret_key
+        self.ttl = ttl
+        self.revocations = revocations
+        self.algorithm = algorithm
+
+    def issue(self, user: UserInDB) -> Tuple[str, int]:
+        """Return (token, expires_in) for an authenticated, active user."""
+        now = time.time()
+        claims = {
+            "sub": str(user.id),
+            "typ": TOKEN_TYPE,
+            "email": user.email,
+            "adm": user.is_admin,
+            "ctd": user.created_at.timestamp(),
+            "upd": user.updated_at.timestamp(),
+            "iat": now,
+            "exp": datetime.fromtimestamp(now, timezone.utc)
+            + timedelta(seconds=self.ttl),
+        }
+        metrics.increment("access_tokens.issued")
+        return jwt.encode(claims, self.secret_key, algorithm=self.algorithm), int(
+            self.ttl
+        )
+
+    def authenticate(self, token: str) -> Optional[UserInDB]:
+        try:
+            claims = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+            if claims.get("typ") != TOKEN_TYPE:
+                return None
+            user_id = int(claims["sub"])
+            issued_at = float(claims["iat"])
+        except (JWTError, KeyError, TypeError, ValueError):
+            metrics.increment("access_tokens.invalid")
+            return None
+
+        if self.revocations.is_revoked(user_id, issued_at):
+            metrics.increment("access_tokens.revoked")
+            return None
+
+        metrics.increment("access_tokens.verified")
+        # Tokens never carry the API key itself
+        return UserInDB(
+            id=user_id,
+            email=claims["email"],
+            is_active=True,
+            is_admin=bool(claims.get("adm")),
+            api_key="",
+            created_at=datetime.fromtimestamp(claims["ctd"], timezone.utc),
+            updated_at=datetime.fromtimestamp(claims["upd"], timezone.utc),
+        )
+
+
+class TokenRevocationRefresher:
+    """Periodically reloads recent revocations so missed notifications heal."""
+
+    def __init__(
+        self,
+        store: TokenRevocationStorePort,
+        revocations: TokenRevocationList,
+        interval: float,
+    ):
+        self.store = store
+        self.revocations = revocations
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def refresh(self) -> None:
+        since = datetime.now(timezone.utc) - timedelta(
+            seconds=self.revocations.retention
+        )
+        self.revocations.merge(await self.store.load_since(since))
+        await self.store.purge_before(since)
+        metrics.increment("access_tokens.revocation_refreshes")
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def request_refresh(self) -> None:
+        """Refresh soon, outside the schedule; safe to call from sync code."""
+        if self._task is not None:
+            asyncio.get_running_loop().create_task(self._refresh_logged())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _refresh_logged(self) -> None:
+        try:
+            await self.refresh()
+        except Exception as e:
+            logger.error(f"Failed to refresh token revocations: {e}")
+
+    async def _run(self) -> None:
+        # The first refresh is awaited at startup, before serving requests
+        while True:
+            await asyncio.sleep(self.interval)
+            await self._refresh_logged()
@@ -0,0 +1,73 @@
+from typing import Any, Dict, Optional, Tuple
+
+from src.solar_api.application.cache import TTLCache
+from src.solar_api.domain.user_models import UserInDB
+
+
+class ApiKeyCache:
+    """Bounded api_key -> user cache, with a separate bounded cache of misses.
+
+    A user is cached under a single key at a time, so invalidating by user id
+    also drops the key it was authenticated with. The user id -> key index has
+    the same bound and TTL as the users it points to and is touched on every
+    hit, so both evict and expire together.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl: float,
+        negative_max_entries: int,
+        negative_ttl: float,
+    ):
+        self.users = TTLCache(max_entries, ttl, name="auth_cache")
+        self.unknown = TTLCache(
+            negative_max_entries, negative_ttl, name="auth_cache.negative"
+        )
+        self._keys_by_user = TTLCache(max_entries, ttl)
+
+    def get(self, api_key: str) -> Tuple[bool, Optional[UserInDB]]:
+        """Return (found, user); a found None means the key is known to be invalid."""
+        user = self.users.get(api_key)
+        if user is not None:
+            self._keys_by_user.get(user.id)
+            return True, user
+        if self.unknown.get(api_key) is not None:
+            return True, None
+        return False, None
+
+    def set(self, api_key: str, user: Optional[UserInDB]) -> None:
+        if user is None:
+            self.unknown.set(api_key, True)
+            return
+
+        previous_key = self._keys_by_user.get(user.id)
+        if previous_key is not None and previous_key != api_key:
+            self.users.delete(previous_key)
+        self.users.set(api_key, user)
+        self._keys_by_user.set(user.id, api_key)
+        self.unknown.delete(api_key)
+
+    def invalidate_key(self, api_key: str) -> None:
+        user = self.users.get_stale(api_key)
+        if user is not None and self._keys_by_user.get_stale(user.id) == api_key:
+            self._keys_by_user.delete(user.id)
+        self.users.delete(api_key)
+        self.unknown.delete(api_key)
+
+    def invalidate_user(self, user_id: int) -> None:
+        api_key = self._keys_by_user.get_stale(user_id)
+        self._keys_by_user.delete(user_id)
+        if api_key is not None:
+            self.users.delete(api_key)
+
+    def handle_invalidation(self, event: Dict[str, Any]) -> None:
+        if event.get("id") is not None:
+            self.invalidate_user(int(event["id"]))
+        if event.get("api_key"):
+            self.invalidate_key(event["api_key"])
+
+    def clear(self) -> None:
+        self.users.clear()
+        self.unknown.clear()
+        self._keys_by_user.clear()
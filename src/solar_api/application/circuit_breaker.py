@@ -0,0 +1,72 @@
+import time
+from typing import Optional
+
+from src.solar_api.application import metrics
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, retry_after: float):
+        super().__init__(f"Circuit is open, retry after {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        recovery_timeout: float,
+        name: Optional[str] = None,
+    ):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.name = name
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+
+    def _count(self, event: str) -> None:
+        if self.name:
+            metrics.increment(f"{self.name}.{event}")
+
+    def retry_after(self) -> float:
+        if self.state == self.CLOSED:
+            return 0.0
+        return max(0.0, self.opened_at + self.recovery_timeout - time.monotonic())
+
+    def before_call(self) -> None:
+        if self.state == self.OPEN:
+            remaining = self.retry_after()
+            if remaining > 0:
+                self._count("rejected")
+                raise CircuitOpenError(remaining)
+            self.state = self.HALF_OPEN
+            self._count("half_opened")
+
+        if self.state == self.HALF_OPEN:
+            if self._trial_in_flight:
+                self._count("rejected")
+                raise CircuitOpenError(self.recovery_timeout)
+            self._trial_in_flight = True
+
+    def release(self) -> None:
+        self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        self._trial_in_flight = False
+        self.failures = 0
+        if self.state != self.CLOSED:
+            self.state = self.CLOSED
+            self._count("closed")
+
+    def record_failure(self) -> None:
+        self._trial_in_flight = False
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+            self._count("opened")
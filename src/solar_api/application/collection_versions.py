@@ -0,0 +1,79 @@
+import hashlib
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from src.solar_api.application.cache import TTLCache
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against one entity tag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return etag.removeprefix("W/") in (tag.removeprefix("W/") for tag in candidates)
+
+
+def collection_state(user_id: int, version: Optional[int]) -> str:
+    """State string of a user's collection from its stored version counter.
+
+    Every create, update and delete bumps the counter in the writing
+    statement itself, so two states are equal only if no write committed in
+    between. A user who never wrote has no counter yet: version 0.
+    """
+    return f"{user_id}.{version or 0}"
+
+
+class CollectionVersions:
+    """Per-user entity tags for a collection, derived from the stored data.
+
+    A tag hashes a state string loaded from the database (the user's
+    collection version counter), so every worker, and the same worker
+    after a restart, computes the same tag for the same data. The state is
+    cached per user, so repeated polls on one worker skip even that query
+    until a write, a NOTIFY from another worker, or the TTL drops it.
+    """
+
+    def __init__(self, max_entries: int, ttl: float, name: Optional[str] = None):
+        self._states = TTLCache(max_entries, ttl, name=name)
+        # Bumped on every invalidation; a state loaded across one is not cached
+        self._generation = 0
+
+    async def current(
+        self,
+        user_id: int,
+        load: Callable[[], Awaitable[str]],
+        variant: str = "",
+    ) -> str:
+        """Entity tag (quoted) of the user's collection as it is now.
+
+        ``load`` reads the collection state when it is not cached.
+        ``variant`` tells apart different views of the same collection, such
+        as filters or pages. Take the tag before reading the collection: a
+        write that lands in between changes the state, so the tag can never
+        outlive the data it describes.
+        """
+        state = self._states.get(user_id)
+        if state is None:
+            generation = self._generation
+            state = await load()
+            if generation == self._generation:
+                self._states.set(user_id, state)
+        digest = hashlib.blake2s(
+            f"{state}\0{variant}".encode(), digest_size=12
+        ).hexdigest()
+        return f'"{digest}"'
+
+    def bump(self, user_id: int) -> None:
+        self._generation += 1
+        self._states.delete(user_id)
+
+    def handle_invalidation(self, event: Dict[str, Any]) -> None:
+        if event.get("user_id") is not None:
+            self.bump(int(event["user_id"]))
+        else:
+            self.reset()
+
+    def reset(self) -> None:
+        self._generation += 1
+        self._states.clear()
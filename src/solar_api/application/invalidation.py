@@ -0,0 +1,44 @@
+import logging
+from collections import defaultdict
+from typing import Any, Callable, Dict, List
+
+from src.solar_api.application import metrics
+
+logger = logging.getLogger(__name__)
+
+InvalidationEvent = Dict[str, Any]
+
+ENTITY_USER = "user"
+ENTITY_PANEL = "panel"
+
+
+class InvalidationBus:
+    """Routes invalidation events to the in-process caches that subscribed."""
+
+    def __init__(self):
+        self._handlers: Dict[str, List[Callable[[InvalidationEvent], None]]] = (
+            defaultdict(list)
+        )
+        self._reset_handlers: List[Callable[[], None]] = []
+
+    def subscribe(
+        self, entity: str, handler: Callable[[InvalidationEvent], None]
+    ) -> None:
+        self._handlers[entity].append(handler)
+
+    def on_reset(self, handler: Callable[[], None]) -> None:
+        self._reset_handlers.append(handler)
+
+    def dispatch(self, event: InvalidationEvent) -> None:
+        metrics.increment("invalidation.received")
+        for handler in self._handlers.get(event.get("entity"), []):
+            try:
+                handler(event)
+            except Exception as e:
+                logger.warning(f"Invalidation handler failed for {event}: {e}")
+
+    def reset(self) -> None:
+        """Drop everything; used when events may have been missed."""
+        metrics.increment("invalidation.resets")
+        for handler in self._reset_handlers:
+            handler()
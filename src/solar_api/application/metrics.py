@@ -0,0 +1,34 @@
+import threading
+from collections import defaultdict
+from typing import Dict
+
+_lock = threading.Lock()
+_counters: Dict[str, float] = defaultdict(float)
+
+
+def increment(name: str, value: float = 1) -> None:
+    with _lock:
+        _counters[name] += value
+
+
+def observe(name: str, value: float) -> None:
+    """Record a sample as {name}.count, {name}.sum and {name}.max."""
+    with _lock:
+        _counters[f"{name}.count"] += 1
+        _counters[f"{name}.sum"] += value
+        _counters[f"{name}.max"] = max(_counters[f"{name}.max"], value)
+
+
+def get(name: str) -> float:
+    with _lock:
+        return _counters.get(name, 0)
+
+
+def snapshot() -> Dict[str, float]:
+    with _lock:
+        return dict(sorted(_counters.items()))
+
+
+def reset() -> None:
+    with _lock:
+        _counters.clear()
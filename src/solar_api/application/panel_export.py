@@ -0,0 +1,50 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Sequence, Tuple
+from uuid import UUID
+
+# Column order of the rows yielded by PanelRepositoryPort.iter_export
+EXPORT_COLUMNS = (
+    "id",
+    "name",
+    "capacity",
+    "efficiency",
+    "manufacturer",
+    "type",
+    "created_at",
+    "updated_at",
+)
+
+ExportBatch = Sequence[Tuple[Any, ...]]
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+async def iter_csv(batches: AsyncIterator[ExportBatch]) -> AsyncIterator[bytes]:
+    """Header line, then one encoded chunk per batch of rows."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(EXPORT_COLUMNS)
+    yield buffer.getvalue().encode()
+
+    async for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_plain(value) for value in row] for row in batch)
+        yield buffer.getvalue().encode()
+
+
+async def iter_ndjson(batches: AsyncIterator[ExportBatch]) -> AsyncIterator[bytes]:
+    async for batch in batches:
+        yield "".join(
+            json.dumps(dict(zip(EXPORT_COLUMNS, map(_plain, row)))) + "\n"
+            for row in batch
+        ).encode()
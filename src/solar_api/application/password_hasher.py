@@ -0,0 +1,134 @@
+import asyncio
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, Tuple
+
+from passlib.context import CryptContext
+
+from src.solar_api.application import metrics
+
+CALIBRATION_PASSWORD = "calibration-Password-123"
+
+
+def build_context(rounds: int) -> CryptContext:
+    """bcrypt context that also flags hashes below ``rounds`` for rehashing.
+
+    Only a lower cost counts as outdated: a stronger hash from a host that
+    calibrated higher is kept, never rehashed down. (passlib's ``rounds``
+    shortcut would also set ``max_desired_rounds``.)
+    """
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_desired_rounds=rounds,
+    )
+
+
+def calibrate_bcrypt_rounds(
+    target_seconds: float,
+    min_rounds: int,
+    max_rounds: int,
+    timer: Callable[[], float] = time.perf_counter,
+) -> int:
+    """Highest bcrypt cost whose hash time stays within ``target_seconds``.
+
+    The hash is timed once at ``min_rounds``; each extra round doubles the
+    work, so the remaining rounds are extrapolated rather than measured.
+    """
+    context = build_context(min_rounds)
+    context.hash(CALIBRATION_PASSWORD)  # warm up the backend
+
+    started = timer()
+    context.hash(CALIBRATION_PASSWORD)
+    elapsed = timer() - started
+
+    rounds = min_rounds
+    while rounds < max_rounds and elapsed * 2 <= target_seconds:
+        rounds += 1
+        elapsed *= 2
+    return rounds
+
+
+class PasswordHasher:
+    """Runs CryptContext hashing off the event loop with bounded concurrency.
+
+    bcrypt releases the GIL while hashing, so a small thread pool keeps the
+    loop responsive; callers beyond the cap wait on a semaphore, and that wait
+    is reported as ``{name}.queue_seconds``.
+    """
+
+    def __init__(
+        self, context: CryptContext, concurrency: int, name: str = "password_hasher"
+    ):
+        if concurrency <= 0:
+            raise ValueError("concurrency must be positive")
+        self.context = context
+        self.concurrency = concurrency
+        self.name = name
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _ensure_started(self) -> None:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.concurrency, thread_name_prefix=self.name
+            )
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._loop = loop
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        self._ensure_started()
+        queued_at = time.monotonic()
+        async with self._semaphore:
+            started_at = time.monotonic()
+            metrics.observe(f"{self.name}.queue_seconds", started_at - queued_at)
+            try:
+                return await asyncio.get_running_loop().run_in_executor(
+                    self._executor, fn, *args
+                )
+            finally:
+                metrics.observe(
+                    f"{self.name}.run_seconds", time.monotonic() - started_at
+                )
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.context.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(self.context.verify, password, hashed_password)
+
+    def _verify_and_update(
+        self, password: str, hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        if self.context.identify(hashed_password) is None:
+            # Legacy rows stored the password itself; upgrade them on match
+            if secrets.compare_digest(password.encode(), hashed_password.encode()):
+                return True, self.context.hash(password)
+            return False, None
+        return self.context.verify_and_update(password, hashed_password)
+
+    async def verify_and_update(
+        self, password: str, hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        """Verify, returning a fresh hash when the stored one is outdated."""
+        verified, new_hash = await self._run(
+            self._verify_and_update, password, hashed_password
+        )
+        if new_hash is not None:
+            metrics.increment(f"{self.name}.rehashed")
+        return verified, new_hash
+
+    def use_context(self, context: CryptContext) -> None:
+        self.context = context
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._semaphore = None
+        self._loop = None
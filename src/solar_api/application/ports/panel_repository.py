@@ -1,9 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 from uuid import UUID
+from src.solar_api.application.panel_export import ExportBatch
 from src.solar_api.domain.panel_model import (
     PanelModel,
     PanelModelCreate,
+    PanelModelPage,
+    PanelModelQuery,
     PanelModelUpdate,
 )
 
@@ -13,6 +16,21 @@ class PanelRepositoryPort(ABC):
     async def get_all(self, user_id: int) -> List[PanelModel]:
         pass
 
+    @abstractmethod
+    async def list_page(self, user_id: int, query: PanelModelQuery) -> PanelModelPage:
+        """Filtered page in (sort key, id) order, continuing after query.cursor."""
+        pass
+
+    @abstractmethod
+    async def collection_state(self, user_id: int) -> str:
+        """The user's collection_state(), from the version every write bumps."""
+        pass
+
+    @abstractmethod
+    def iter_export(self, user_id: int, batch_size: int) -> AsyncIterator[ExportBatch]:
+        """All of the user's panels as plain EXPORT_COLUMNS tuples, in batches."""
+        pass
+
     @abstractmethod
     async def get_by_id(self, model_id: UUID, user_id: int) -> Optional[PanelModel]:
         pass
@@ -21,6 +39,19 @@ class PanelRepositoryPort(ABC):
     async def create(self, panel: PanelModelCreate, user_id: int) -> PanelModel:
         pass
 
+    @abstractmethod
+    async def bulk_create(self, panels: List[PanelModelCreate], user_id: int) -> int:
+        """Insert in the current transaction without committing; returns the count."""
+        pass
+
+    @abstractmethod
+    async def commit(self) -> None:
+        pass
+
+    @abstractmethod
+    async def rollback(self) -> None:
+        pass
+
     @abstractmethod
     async def update(
         self, model_id: UUID, panel_update: PanelModelUpdate, user_id: int
@@ -0,0 +1,17 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+from src.solar_api.domain.models import PVGISRequest
+
+
+class PVGISResultStorePort(ABC):
+    @abstractmethod
+    async def get(
+        self, key: str, allow_stale: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    async def set(
+        self, key: str, params: PVGISRequest, result: Dict[str, Any]
+    ) -> None:
+        pass
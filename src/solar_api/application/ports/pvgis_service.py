@@ -1,8 +1,26 @@
 from abc import ABC, abstractmethod
+from typing import Optional
 from src.solar_api.domain.models import PVGISRequest
 
 
+class PVGISUnavailableError(Exception):
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class PVGISRateLimitedError(PVGISUnavailableError):
+    pass
+
+
+class PVGISCircuitOpenError(PVGISUnavailableError):
+    pass
+
+
 class PVGISServicePort(ABC):
     @abstractmethod
     async def get_pv_data(self, params: PVGISRequest) -> dict:
         raise NotImplementedError
+
+    def get_cached_pv_data(self, params: PVGISRequest) -> Optional[dict]:
+        return None
@@ -0,0 +1,13 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict
+
+
+class TokenRevocationStorePort(ABC):
+    @abstractmethod
+    async def load_since(self, since: datetime) -> Dict[int, float]:
+        pass
+
+    @abstractmethod
+    async def purge_before(self, before: datetime) -> None:
+        pass
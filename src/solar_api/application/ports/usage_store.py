@@ -0,0 +1,18 @@
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import Dict, List, Tuple
+
+# (user_id, UTC day, scope)
+UsageKey = Tuple[int, date, str]
+
+
+class UsageStorePort(ABC):
+    @abstractmethod
+    async def add_counts(self, counts: Dict[UsageKey, int]) -> None:
+        pass
+
+    @abstractmethod
+    async def get_counts(
+        self, user_id: int, since: date
+    ) -> List[Tuple[date, str, int]]:
+        pass
@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict, defaultdict
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from src.solar_api.application import metrics
+from src.solar_api.application.ports.usage_store import UsageKey, UsageStorePort
+from src.solar_api.application.rate_limiter import RateLimitExceeded, TokenBucket
+
+logger = logging.getLogger(__name__)
+
+
+class QuotaCostTooLarge(Exception):
+    """A single request costs more than the bucket can ever hold."""
+
+    def __init__(self, limit: float):
+        super().__init__(f"Request cost exceeds the quota burst of {limit:g}")
+        self.limit = limit
+
+
+class UserRateLimiter:
+    """One token bucket per user, kept for the most recently seen users only.
+
+    Rejection is purely local to the worker; nothing here touches the database.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float,
+        max_users: int = 10000,
+        name: Optional[str] = None,
+    ):
+        if rate <= 0 or burst <= 0 or max_users <= 0:
+            raise ValueError("rate, burst and max_users must be positive")
+        self.rate = rate
+        self.burst = burst
+        self.max_users = max_users
+        self.name = name
+        self._buckets: "OrderedDict[int, TokenBucket]" = OrderedDict()
+
+    def _count(self, event: str) -> None:
+        if self.name:
+            metrics.increment(f"{self.name}.{event}")
+
+    def _bucket(self, user_id: int) -> TokenBucket:
+        bucket = self._buckets.get(user_id)
+        if bucket is None:
+            bucket = self._buckets[user_id] = TokenBucket(self.rate, self.burst)
+            # An evicted user only gains a full bucket back, which they would
+            # have had after burst / rate seconds of inactivity anyway
+            while len(self._buckets) > self.max_users:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(user_id)
+        return bucket
+
+    def check(self, user_id: int, cost: float = 1) -> None:
+        """Take ``cost`` tokens or raise RateLimitExceeded with the wait time.
+
+        A cost above the burst could never be paid in full, so it raises
+        QuotaCostTooLarge instead of being discounted to the burst.
+        """
+        if cost > self.burst:
+            self._count("rejected")
+            raise QuotaCostTooLarge(self.burst)
+        now = time.monotonic()
+        bucket = self._bucket(user_id)
+        if bucket.try_acquire(now, cost):
+            self._count("allowed")
+            return
+        self._count("rejected")
+        raise RateLimitExceeded(bucket.time_until_available(now, cost))
+
+
+class UsageRecorder:
+    """Counts requests per (user, UTC day, scope) in memory and writes them behind.
+
+    Counts are flushed to the store every ``flush_interval`` seconds and on
+    shutdown, at most ``chunk_size`` rows per write so a statement stays under
+    the driver's bind-parameter limit. A failed flush keeps the unwritten
+    counts for the next one, up to ``max_pending`` rows; past that the oldest
+    days are dropped.
+    """
+
+    def __init__(
+        self,
+        store: UsageStorePort,
+        flush_interval: float,
+        chunk_size: int = 1000,
+        max_pending: int = 100000,
+    ):
+        self.store = store
+        self.flush_interval = flush_interval
+        self.chunk_size = chunk_size
+        self.max_pending = max_pending
+        self._pending: Dict[UsageKey, int] = defaultdict(int)
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    def record(self, user_id: int, scope: str, count: int = 1) -> None:
+        today = datetime.now(timezone.utc).date()
+        self._pending[(user_id, today, scope)] += count
+
+    def pending(self) -> int:
+        return len(self._pending)
+
+    async def flush(self) -> None:
+        async with self._lock:
+            if not self._pending:
+                return
+            rows, self._pending = list(self._pending.items()), defaultdict(int)
+            for start in range(0, len(rows), self.chunk_size):
+                chunk = dict(rows[start : start + self.chunk_size])
+                try:
+                    await self.store.add_counts(chunk)
+                except BaseException:
+                    for key, count in rows[start:]:
+                        self._pending[key] += count
+                    self._trim_pending()
+                    raise
+                metrics.increment("usage.flushed_rows", len(chunk))
+            metrics.increment("usage.flushes")
+
+    def _trim_pending(self) -> None:
+        excess = len(self._pending) - self.max_pending
+        if excess <= 0:
+            return
+        for key in sorted(self._pending, key=lambda key: key[1])[:excess]:
+            del self._pending[key]
+        metrics.increment("usage.dropped_rows", excess)
+        logger.error(
+            f"Usage backlog exceeds {self.max_pending} rows; "
+            f"dropped {excess} counters from the oldest days"
+        )
+
+    async def usage(self, user_id: int, since: date) -> List[Tuple[date, str, int]]:
+        """Stored counts plus this worker's unflushed ones, oldest day first."""
+        totals: Dict[Tuple[date, str], int] = defaultdict(int)
+        for day, scope, count in await self.store.get_counts(user_id, since):
+            totals[(day, scope)] += count
+        for (pending_user, day, scope), count in list(self._pending.items()):
+            if pending_user == user_id and day >= since:
+                totals[(day, scope)] += count
+        return [(day, scope, count) for (day, scope), count in sorted(totals.items())]
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"Failed to flush usage counters on shutdown: {e}")
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Failed to flush usage counters: {e}")
@@ -0,0 +1,127 @@
+import asyncio
+import heapq
+import itertools
+import time
+from typing import List, Optional, Tuple
+
+from src.solar_api.application import metrics
+
+
+class RateLimitExceeded(Exception):
+    def __init__(self, retry_after: float):
+        super().__init__(f"Rate limit exceeded, retry after {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate and capacity must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated_at = now
+
+    def try_acquire(self, now: Optional[float] = None, tokens: float = 1) -> bool:
+        self._refill(time.monotonic() if now is None else now)
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+            return True
+        return False
+
+    def time_until_available(
+        self, now: Optional[float] = None, tokens: float = 1
+    ) -> float:
+        self._refill(time.monotonic() if now is None else now)
+        return max(0.0, (tokens - self.tokens) / self.rate)
+
+
+class PriorityRateLimiter:
+    def __init__(
+        self, rate: float, burst: float, max_queue: int, name: Optional[str] = None
+    ):
+        self.bucket = TokenBucket(rate, burst)
+        self.max_queue = max_queue
+        self.name = name
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._paused_until = 0.0
+
+    def _count(self, event: str) -> None:
+        if self.name:
+            metrics.increment(f"{self.name}.{event}")
+
+    def _prune(self) -> None:
+        self._waiters = [w for w in self._waiters if not w[2].done()]
+        heapq.heapify(self._waiters)
+
+    def queue_size(self) -> int:
+        return sum(1 for waiter in self._waiters if not waiter[2].done())
+
+    def _estimated_wait(self, priority: int, now: float) -> float:
+        ahead = sum(1 for p, _, f in self._waiters if p <= priority and not f.done())
+        wait = self.bucket.time_until_available(now) + ahead / self.bucket.rate
+        return max(wait, self._paused_until - now)
+
+    def pause(self, seconds: float) -> None:
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    async def acquire(self, priority: int = 0, timeout: Optional[float] = None) -> None:
+        now = time.monotonic()
+        if (
+            not self._waiters
+            and now >= self._paused_until
+            and self.bucket.try_acquire(now)
+        ):
+            self._count("acquired")
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            self._prune()
+        estimated_wait = self._estimated_wait(priority, now)
+        if len(self._waiters) >= self.max_queue:
+            self._count("rejected")
+            raise RateLimitExceeded(estimated_wait)
+        if timeout is not None and estimated_wait > timeout:
+            self._count("rejected")
+            raise RateLimitExceeded(estimated_wait)
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        self._count("queued")
+        self._schedule()
+
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            self._count("timeouts")
+            raise RateLimitExceeded(self._estimated_wait(priority, time.monotonic()))
+        self._count("acquired")
+
+    def _schedule(self) -> None:
+        if self._timer is not None or not self._waiters:
+            return
+        now = time.monotonic()
+        delay = max(self._paused_until - now, self.bucket.time_until_available(now))
+        self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+
+    def _dispatch(self) -> None:
+        self._timer = None
+        now = time.monotonic()
+        while self._waiters:
+            future = self._waiters[0][2]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if now < self._paused_until or not self.bucket.try_acquire(now):
+                break
+            heapq.heappop(self._waiters)
+            future.set_result(None)
+        self._schedule()
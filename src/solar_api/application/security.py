@@ -1,6 +1,33 @@
-from passlib.context import CryptContext
+import asyncio
+
+from src.solar_api import config
+from src.solar_api.application.password_hasher import (
+    PasswordHasher,
+    build_context,
+    calibrate_bcrypt_rounds,
+)
+
+pwd_context = build_context(config.PASSWORD_HASH_ROUNDS)
+password_hasher = PasswordHasher(
+    pwd_context, concurrency=config.PASSWORD_HASH_CONCURRENCY
+)
+
+
+async def calibrate_password_hashing() -> int:
+    """Pick the bcrypt cost for this host and switch the shared hasher to it."""
+    global pwd_context
+
+    rounds = await asyncio.get_running_loop().run_in_executor(
+        None,
+        calibrate_bcrypt_rounds,
+        config.PASSWORD_HASH_TARGET_SECONDS,
+        config.PASSWORD_HASH_MIN_ROUNDS,
+        config.PASSWORD_HASH_MAX_ROUNDS,
+    )
+    pwd_context = build_context(rounds)
+    password_hasher.use_context(pwd_context)
+    return rounds
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
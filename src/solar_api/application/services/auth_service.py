@@ -1,41 +1,88 @@
 from typing import Optional
-from fastapi import Depends, HTTPException, status
-from fastapi.security import APIKeyHeader
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import APIKeyHeader, HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.solar_api.application.access_tokens import AccessTokenService
+from src.solar_api.application.auth_cache import ApiKeyCache
+from src.solar_api.application.ports.user_repository import UserRepositoryPort
 from src.solar_api.database import get_db
 from src.solar_api.database.models import User
 from src.solar_api.domain.user_models import UserInDB
 
 API_KEY_HEADER = APIKeyHeader(name="X-API-Key", auto_error=False)
+BEARER_HEADER = HTTPBearer(auto_error=False)
 
 
 class AuthService:
-    def __init__(self, db: AsyncSession):
+    def __init__(
+        self,
+        db: AsyncSession,
+        cache: Optional[ApiKeyCache] = None,
+        users: Optional[UserRepositoryPort] = None,
+    ):
         self.db = db
+        self.cache = cache
+        self.users = users
 
-    async def get_user_by_api_key(self, api_key: str) -> Optional[UserInDB]:
+    async def get_user_by_api_key(
+        self, api_key: str, use_cache: bool = True
+    ) -> Optional[UserInDB]:
+        """User owning ``api_key``; ``use_cache=False`` always asks the database.
+
+        The result is cached either way, so a fresh lookup also refreshes the
+        entry this worker holds.
+        """
         if not api_key:
             return None
 
-        user = await self.db.execute(
-            User.__table__.select().where(User.api_key == api_key)
-        )
-        user = user.fetchone()
+        if self.cache is not None and use_cache:
+            found, cached = self.cache.get(api_key)
+            if found:
+                return cached
 
-        if not user:
-            return None
+        if self.users is not None:
+            user = await self.users.get_by_api_key(api_key)
+        else:
+            user = await self.db.execute(
+                User.__table__.select().where(User.api_key == api_key)
+            )
+            user = user.fetchone()
+            user = UserInDB.from_orm(user) if user else None
 
-        return UserInDB.from_orm(user)
+        if self.cache is not None:
+            self.cache.set(api_key, user)
+        return user
 
 
-async def get_auth_service(db: AsyncSession = Depends(get_db)) -> AuthService:
-    return AuthService(db)
+async def get_auth_service(
+    request: Request, db: AsyncSession = Depends(get_db)
+) -> AuthService:
+    return AuthService(
+        db,
+        getattr(request.app.state, "auth_cache", None),
+        getattr(request.app.state, "user_repository", None),
+    )
 
 
-async def get_current_user(
-    api_key: str = Depends(API_KEY_HEADER),
-    auth_service: AuthService = Depends(get_auth_service),
+def get_access_token_service(request: Request) -> Optional[AccessTokenService]:
+    return getattr(request.app.state, "access_tokens", None)
+
+
+def get_token_user(token: str, access_tokens: Optional[AccessTokenService]) -> UserInDB:
+    """Authorize a bearer token from its claims alone; no database access."""
+    user = access_tokens.authenticate(token) if access_tokens is not None else None
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
+
+
+async def _require_api_key_user(
+    api_key: str, auth_service: AuthService, use_cache: bool
 ) -> UserInDB:
     if not api_key:
         raise HTTPException(
@@ -44,7 +91,7 @@ async def get_current_user(
             headers={"WWW-Authenticate": "API-Key"},
         )
 
-    user = await auth_service.get_user_by_api_key(api_key)
+    user = await auth_service.get_user_by_api_key(api_key, use_cache=use_cache)
     if not user or not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -55,6 +102,39 @@ async def get_current_user(
     return user
 
 
+async def get_api_key_user(
+    api_key: str = Depends(API_KEY_HEADER),
+    auth_service: AuthService = Depends(get_auth_service),
+) -> UserInDB:
+    return await _require_api_key_user(api_key, auth_service, use_cache=True)
+
+
+async def get_fresh_api_key_user(
+    api_key: str = Depends(API_KEY_HEADER),
+    auth_service: AuthService = Depends(get_auth_service),
+) -> UserInDB:
+    """Like get_api_key_user, but checks the key against the database.
+
+    Used where a stale cache entry would outlive the key: a token minted
+    from a just-rotated key is issued after the revocation, so the
+    revocation list would never void it.
+    """
+    return await _require_api_key_user(api_key, auth_service, use_cache=False)
+
+
+async def get_current_user(
+    api_key: str = Depends(API_KEY_HEADER),
+    bearer: Optional[HTTPAuthorizationCredentials] = Depends(BEARER_HEADER),
+    access_tokens: Optional[AccessTokenService] = Depends(get_access_token_service),
+    auth_service: AuthService = Depends(get_auth_service),
+) -> UserInDB:
+    # The session from get_auth_service is never used on this path, so a
+    # token request does not check out a connection
+    if bearer is not None and not api_key:
+        return get_token_user(bearer.credentials, access_tokens)
+    return await get_api_key_user(api_key, auth_service)
+
+
 async def get_admin_user(
     current_user: UserInDB = Depends(get_current_user),
 ) -> UserInDB:
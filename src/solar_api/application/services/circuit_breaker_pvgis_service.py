@@ -0,0 +1,42 @@
+from typing import Any, Dict
+
+from src.solar_api.application.circuit_breaker import CircuitBreaker, CircuitOpenError
+from src.solar_api.application.ports.pvgis_service import (
+    PVGISServicePort,
+    PVGISUnavailableError,
+    PVGISRateLimitedError,
+    PVGISCircuitOpenError,
+)
+from src.solar_api.domain.models import PVGISRequest
+
+
+class CircuitBreakerPVGISService(PVGISServicePort):
+    def __init__(self, pvgis_service: PVGISServicePort, breaker: CircuitBreaker):
+        self.pvgis_service = pvgis_service
+        self.breaker = breaker
+
+    async def get_pv_data(self, params: PVGISRequest) -> Dict[str, Any]:
+        try:
+            self.breaker.before_call()
+        except CircuitOpenError as e:
+            raise PVGISCircuitOpenError(
+                "PVGIS is temporarily unavailable", retry_after=e.retry_after
+            )
+
+        try:
+            result = await self.pvgis_service.get_pv_data(params)
+        except PVGISRateLimitedError:
+            self.breaker.release()
+            raise
+        except PVGISUnavailableError:
+            self.breaker.record_failure()
+            raise
+        except Exception:
+            self.breaker.record_success()
+            raise
+        except BaseException:
+            self.breaker.release()
+            raise
+
+        self.breaker.record_success()
+        return result
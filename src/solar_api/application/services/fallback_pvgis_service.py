@@ -0,0 +1,32 @@
+import logging
+from typing import Any, Dict, Optional
+
+from src.solar_api.application import metrics
+from src.solar_api.application.ports.pvgis_service import (
+    PVGISServicePort,
+    PVGISUnavailableError,
+)
+from src.solar_api.domain.models import PVGISRequest
+
+logger = logging.getLogger(__name__)
+
+
+class FallbackPVGISService(PVGISServicePort):
+    def __init__(self, pvgis_service: PVGISServicePort, fallback: PVGISServicePort):
+        self.pvgis_service = pvgis_service
+        self.fallback = fallback
+
+    def get_cached_pv_data(self, params: PVGISRequest) -> Optional[Dict[str, Any]]:
+        return self.pvgis_service.get_cached_pv_data(params)
+
+    async def get_pv_data(self, params: PVGISRequest) -> Dict[str, Any]:
+        try:
+            return await self.pvgis_service.get_pv_data(params)
+        except PVGISUnavailableError as e:
+            try:
+                result = await self.fallback.get_pv_data(params)
+            except PVGISUnavailableError:
+                raise e
+            logger.info(f"PVGIS unavailable, served local estimate: {e}")
+            metrics.increment("pvgis_fallback.served")
+            return result
@@ -1,15 +1,29 @@
-from typing import List
+import asyncio
+from typing import AsyncIterator, List
 from uuid import UUID
 from fastapi import HTTPException, status
+from pydantic import ValidationError
 
+from src.solar_api.application.pagination import InvalidCursorError
+from src.solar_api.application.panel_export import iter_csv, iter_ndjson
+from src.solar_api.application.panel_import import ImportRecord
 from src.solar_api.application.ports.panel_repository import PanelRepositoryPort
 from src.solar_api.domain.panel_model import (
     PanelModel,
     PanelModelCreate,
+    PanelImportReport,
+    PanelImportRowError,
+    PanelModelPage,
+    PanelModelQuery,
     PanelModelUpdate,
 )
 
 
+def _format_error(error: dict) -> str:
+    field = ".".join(str(part) for part in error["loc"])
+    return f"{field}: {error['msg']}" if field else error["msg"]
+
+
 class PanelService:
     def __init__(self, panel_repository: PanelRepositoryPort):
         self.panel_repository = panel_repository
@@ -23,6 +37,30 @@ class PanelService:
                 detail=f"Failed to retrieve panel models: {str(e)}",
             )
 
+    async def list_models(self, user_id: int, query: PanelModelQuery) -> PanelModelPage:
+        try:
+            return await self.panel_repository.list_page(user_id=user_id, query=query)
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to retrieve panel models: {str(e)}",
+            )
+
+    async def collection_state(self, user_id: int) -> str:
+        return await self.panel_repository.collection_state(user_id=user_id)
+
+    def export_models(
+        self, user_id: int, export_format: str, batch_size: int
+    ) -> AsyncIterator[bytes]:
+        """Encoded export body, produced batch by batch as it is sent."""
+        batches = self.panel_repository.iter_export(
+            user_id=user_id, batch_size=batch_size
+        )
+        encode = iter_csv if export_format == "csv" else iter_ndjson
+        return encode(batches)
+
     async def get_model_by_id(self, model_id: UUID, user_id: int) -> PanelModel:
         panel = await self.panel_repository.get_by_id(
             model_id=model_id, user_id=user_id
@@ -43,11 +81,80 @@ class PanelService:
                 detail=f"Failed to create panel model: {str(e)}",
             )
 
+    async def import_models(
+        self,
+        records: AsyncIterator[ImportRecord],
+        user_id: int,
+        atomic: bool = False,
+        chunk_size: int = 500,
+        max_rows: int = 100000,
+        max_errors: int = 1000,
+    ) -> PanelImportReport:
+        """Validate rows as they stream in and insert them in bounded chunks.
+
+        Chunks are committed as they go, unless ``atomic`` is set: then the
+        whole import is one transaction, rolled back if any row failed.
+        """
+        report = PanelImportReport()
+        chunk: List[PanelModelCreate] = []
+
+        def fail(row: int, errors: List[str]) -> None:
+            report.failed += 1
+            if len(report.errors) < max_errors:
+                report.errors.append(PanelImportRowError(row=row, errors=errors))
+
+        async def flush() -> None:
+            # In all-or-nothing mode, stop writing once the import is doomed
+            if chunk and not (atomic and report.failed):
+                report.imported += await self.panel_repository.bulk_create(
+                    chunk, user_id=user_id
+                )
+                if not atomic:
+                    await self.panel_repository.commit()
+            chunk.clear()
+
+        try:
+            async for row, record, error in records:
+                report.total_rows += 1
+                if report.total_rows > max_rows:
+                    fail(row, [f"Import is limited to {max_rows} rows"])
+                    break
+                if error is not None:
+                    fail(row, [error])
+                    continue
+                try:
+                    chunk.append(PanelModelCreate.model_validate(record))
+                except ValidationError as e:
+                    fail(row, [_format_error(err) for err in e.errors()])
+                    continue
+                if len(chunk) >= chunk_size:
+                    await flush()
+            await flush()
+        except Exception as e:
+            await self.panel_repository.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Failed to import panel models: {str(e)}",
+            )
+        except BaseException:
+            # Cancelled mid-import (the client went away): the open transaction,
+            # and any pooled connection the repository holds for it, still has
+            # to be released
+            await asyncio.shield(self.panel_repository.rollback())
+            raise
+
+        if atomic and report.failed:
+            await self.panel_repository.rollback()
+            report.imported = 0
+            return report
+
+        await self.panel_repository.commit()
+        report.committed = True
+        return report
+
     async def update_model(
         self, model_id: UUID, panel_update: PanelModelUpdate, user_id: int
     ) -> PanelModel:
-        await self.get_model_by_id(model_id=model_id, user_id=user_id)
-
         try:
             updated_panel = await self.panel_repository.update(
                 model_id=model_id, panel_update=panel_update, user_id=user_id
@@ -67,8 +174,6 @@ class PanelService:
             )
 
     async def delete_model(self, model_id: UUID, user_id: int) -> bool:
-        await self.get_model_by_id(model_id=model_id, user_id=user_id)
-
         try:
             success = await self.panel_repository.delete(
                 model_id=model_id, user_id=user_id
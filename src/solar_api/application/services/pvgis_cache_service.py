@@ -0,0 +1,191 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from src.solar_api.application import metrics
+from src.solar_api.application.cache import TTLCache
+from src.solar_api.application.ports.pvgis_service import (
+    PVGISServicePort,
+    PVGISUnavailableError,
+)
+from src.solar_api.application.ports.pvgis_result_store import PVGISResultStorePort
+from src.solar_api.application.single_flight import SingleFlight
+from src.solar_api.domain.models import PVGISRequest
+
+logger = logging.getLogger(__name__)
+
+REVALIDATION_MAX_ATTEMPTS = 10
+REVALIDATION_MIN_DELAY = 1.0
+REVALIDATION_MAX_DELAY = 300.0
+
+
+class PVGISResultCache:
+    def __init__(
+        self, memory: TTLCache, store: Optional[PVGISResultStorePort] = None
+    ):
+        self.memory = memory
+        self.store = store
+        self._revalidations: Dict[str, asyncio.Task] = {}
+
+    def get_memory(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.memory.get(key)
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        result = self.memory.get(key)
+        if result is not None:
+            return result
+        return await self.get_persistent(key)
+
+    async def get_persistent(self, key: str) -> Optional[Dict[str, Any]]:
+        if self.store is None:
+            return None
+
+        try:
+            result = await self.store.get(key)
+        except Exception as e:
+            logger.warning(f"PVGIS result store read failed: {e}")
+            metrics.increment("pvgis_cache.store.errors")
+            return None
+
+        if result is None:
+            metrics.increment("pvgis_cache.store.misses")
+            return None
+
+        metrics.increment("pvgis_cache.store.hits")
+        self.memory.set(key, result)
+        return result
+
+    async def get_stale(self, key: str) -> Optional[Dict[str, Any]]:
+        result = self.memory.get_stale(key)
+        if result is not None or self.store is None:
+            return result
+
+        try:
+            return await self.store.get(key, allow_stale=True)
+        except Exception as e:
+            logger.warning(f"PVGIS result store read failed: {e}")
+            metrics.increment("pvgis_cache.store.errors")
+            return None
+
+    async def set(
+        self, key: str, params: PVGISRequest, result: Dict[str, Any]
+    ) -> None:
+        self.memory.set(key, result)
+
+        if self.store is None:
+            return
+
+        try:
+            await self.store.set(key, params, result)
+        except Exception as e:
+            logger.warning(f"PVGIS result store write failed: {e}")
+            metrics.increment("pvgis_cache.store.errors")
+
+    def schedule_revalidation(
+        self,
+        key: str,
+        params: PVGISRequest,
+        fetch: Callable[[], Awaitable[Dict[str, Any]]],
+        delay: float,
+    ) -> None:
+        if key in self._revalidations:
+            return
+        task = asyncio.create_task(self._revalidate(key, params, fetch, delay))
+        self._revalidations[key] = task
+        task.add_done_callback(lambda _: self._revalidations.pop(key, None))
+
+    async def _revalidate(
+        self,
+        key: str,
+        params: PVGISRequest,
+        fetch: Callable[[], Awaitable[Dict[str, Any]]],
+        delay: float,
+    ) -> None:
+        for _ in range(REVALIDATION_MAX_ATTEMPTS):
+            await asyncio.sleep(
+                min(max(delay, REVALIDATION_MIN_DELAY), REVALIDATION_MAX_DELAY)
+            )
+            try:
+                result = await fetch()
+            except PVGISUnavailableError as e:
+                delay = e.retry_after or delay * 2
+                continue
+            except Exception as e:
+                logger.warning(f"PVGIS revalidation for {key} failed: {e}")
+                return
+
+            await self.set(key, params, result)
+            metrics.increment("pvgis_cache.revalidated")
+            return
+
+        logger.warning(f"PVGIS revalidation for {key} gave up")
+
+    def pending_revalidations(self) -> Set[str]:
+        return set(self._revalidations)
+
+    async def close(self) -> None:
+        tasks = list(self._revalidations.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+class CachedPVGISService(PVGISServicePort):
+    def __init__(
+        self,
+        pvgis_service: PVGISServicePort,
+        cache: PVGISResultCache,
+        bypass: bool = False,
+        single_flight: Optional[SingleFlight] = None,
+    ):
+        self.pvgis_service = pvgis_service
+        self.cache = cache
+        self.bypass = bypass
+        self.single_flight = single_flight
+
+    def get_cached_pv_data(self, params: PVGISRequest) -> Optional[Dict[str, Any]]:
+        if self.bypass:
+            return None
+        return self.cache.get_memory(params.cache_key())
+
+    async def get_pv_data(self, params: PVGISRequest) -> Dict[str, Any]:
+        key = params.cache_key()
+
+        if self.bypass:
+            metrics.increment("pvgis_cache.bypass")
+        else:
+            cached = self.cache.get_memory(key)
+            if cached is not None:
+                return cached
+
+        if self.single_flight is None:
+            return await self._load(key, params)
+
+        flight_key = f"no-cache:{key}" if self.bypass else key
+        return await self.single_flight.do(
+            flight_key, lambda: self._load(key, params)
+        )
+
+    async def _load(self, key: str, params: PVGISRequest) -> Dict[str, Any]:
+        if not self.bypass:
+            cached = await self.cache.get_persistent(key)
+            if cached is not None:
+                return cached
+
+        try:
+            result = await self.pvgis_service.get_pv_data(params)
+        except PVGISUnavailableError as e:
+            stale = None if self.bypass else await self.cache.get_stale(key)
+            if stale is None:
+                raise
+            metrics.increment("pvgis_cache.stale_served")
+            self.cache.schedule_revalidation(
+                key,
+                params,
+                lambda: self.pvgis_service.get_pv_data(params),
+                delay=e.retry_after or REVALIDATION_MIN_DELAY,
+            )
+            return {**stale, "stale": True}
+
+        await self.cache.set(key, params, result)
+        return result
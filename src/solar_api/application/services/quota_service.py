@@ -0,0 +1,66 @@
+import math
+from typing import Callable, Dict, Optional
+from fastapi import Depends, HTTPException, Request, status
+
+from src.solar_api.application.quota import (
+    QuotaCostTooLarge,
+    UsageRecorder,
+    UserRateLimiter,
+)
+from src.solar_api.application.rate_limiter import RateLimitExceeded
+from src.solar_api.application.services.auth_service import get_current_user
+from src.solar_api.domain.user_models import UserInDB
+
+SCOPE_CALCULATE = "calculate"
+SCOPE_PANELS = "panels"
+
+
+class QuotaService:
+    def __init__(
+        self,
+        limiters: Dict[str, UserRateLimiter],
+        recorder: Optional[UsageRecorder] = None,
+    ):
+        self.limiters = limiters
+        self.recorder = recorder
+
+    def charge(self, user_id: int, scope: str, cost: int = 1) -> None:
+        limiter = self.limiters.get(scope)
+        if limiter is not None:
+            limiter.check(user_id, cost)
+        if self.recorder is not None:
+            self.recorder.record(user_id, scope, cost)
+
+
+def get_quota_service(request: Request) -> Optional[QuotaService]:
+    return getattr(request.app.state, "quota", None)
+
+
+def charge_quota(
+    quota: Optional[QuotaService], user: UserInDB, scope: str, cost: int = 1
+) -> None:
+    if quota is None:
+        return
+    try:
+        quota.charge(user.id, scope, cost)
+    except QuotaCostTooLarge as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Request exceeds the quota; send at most {int(e.limit)} items",
+        )
+    except RateLimitExceeded as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Request quota exceeded",
+            headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))},
+        )
+
+
+def require_quota(scope: str) -> Callable:
+    async def dependency(
+        current_user: UserInDB = Depends(get_current_user),
+        quota: Optional[QuotaService] = Depends(get_quota_service),
+    ) -> None:
+        charge_quota(quota, current_user, scope)
+
+    return dependency
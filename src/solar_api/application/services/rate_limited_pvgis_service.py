@@ -0,0 +1,48 @@
+from typing import Any, Dict, Optional
+
+from src.solar_api.application.ports.pvgis_service import (
+    PVGISServicePort,
+    PVGISRateLimitedError,
+)
+from src.solar_api.application.rate_limiter import (
+    PriorityRateLimiter,
+    RateLimitExceeded,
+)
+from src.solar_api.domain.models import PVGISRequest
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 1
+PRIORITY_PREFETCH = 2
+
+DEFAULT_UPSTREAM_RETRY_AFTER = 1.0
+
+
+class RateLimitedPVGISService(PVGISServicePort):
+    def __init__(
+        self,
+        pvgis_service: PVGISServicePort,
+        rate_limiter: PriorityRateLimiter,
+        priority: int = PRIORITY_INTERACTIVE,
+        timeout: Optional[float] = None,
+    ):
+        self.pvgis_service = pvgis_service
+        self.rate_limiter = rate_limiter
+        self.priority = priority
+        self.timeout = timeout
+
+    async def get_pv_data(self, params: PVGISRequest) -> Dict[str, Any]:
+        try:
+            await self.rate_limiter.acquire(
+                priority=self.priority, timeout=self.timeout
+            )
+        except RateLimitExceeded as e:
+            raise PVGISRateLimitedError(
+                "PVGIS request rate limit reached, try again later",
+                retry_after=e.retry_after,
+            )
+
+        try:
+            return await self.pvgis_service.get_pv_data(params)
+        except PVGISRateLimitedError as e:
+            self.rate_limiter.pause(e.retry_after or DEFAULT_UPSTREAM_RETRY_AFTER)
+            raise
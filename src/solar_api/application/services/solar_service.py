@@ -1,10 +1,134 @@
+import asyncio
+from typing import Any, AsyncIterator, Dict, Iterator, List, Tuple
 from src.solar_api.application.ports.pvgis_service import PVGISServicePort
 from src.solar_api.domain.models import PVGISRequest
 
+REFERENCE_PEAKPOWER = 1.0
+REFERENCE_LOSS = 0.0
+
+ENERGY_FIELDS = ("E_d", "E_m", "E_y", "SD_m", "SD_y")
+
+
+def normalize_request(params: PVGISRequest) -> PVGISRequest:
+    return PVGISRequest(
+        lat=params.lat,
+        lon=params.lon,
+        peakpower=REFERENCE_PEAKPOWER,
+        loss=REFERENCE_LOSS,
+    )
+
+
+def _scale_values(
+    values: Dict[str, Any], factor: float, loss_factor: float
+) -> Dict[str, Any]:
+    scaled = dict(values)
+    for field in ENERGY_FIELDS:
+        if isinstance(scaled.get(field), (int, float)):
+            scaled[field] = round(scaled[field] * factor, 2)
+    if isinstance(scaled.get("l_total"), (int, float)):
+        scaled["l_total"] = round(
+            ((1 + scaled["l_total"] / 100) * loss_factor - 1) * 100, 2
+        )
+    return scaled
+
+
+def rescale_pv_data(
+    base: Dict[str, Any], peakpower: float, loss: float
+) -> Dict[str, Any]:
+    loss_factor = (1 - loss / 100) / (1 - REFERENCE_LOSS / 100)
+    factor = (peakpower / REFERENCE_PEAKPOWER) * loss_factor
+
+    result = dict(base)
+    if "pv_module" in base:
+        result["pv_module"] = {
+            **base["pv_module"],
+            "peak_power": peakpower,
+            "system_loss": loss,
+        }
+
+    outputs = base.get("outputs", {})
+    result["outputs"] = {
+        **outputs,
+        "monthly": {
+            mounting: [_scale_values(row, factor, loss_factor) for row in rows]
+            for mounting, rows in outputs.get("monthly", {}).items()
+        },
+        "totals": {
+            mounting: _scale_values(totals, factor, loss_factor)
+            for mounting, totals in outputs.get("totals", {}).items()
+        },
+    }
+    return result
+
+
+def _batch_results(
+    items: List[PVGISRequest], indexes: List[int], outcome: Any
+) -> Iterator[Dict[str, Any]]:
+    rescaled: Dict[str, Dict[str, Any]] = {}
+    for index in indexes:
+        if isinstance(outcome, Exception):
+            yield {"index": index, "status": "error", "detail": str(outcome)}
+            continue
+
+        item = items[index]
+        item_key = item.cache_key()
+        if item_key not in rescaled:
+            rescaled[item_key] = rescale_pv_data(outcome, item.peakpower, item.loss)
+        yield {"index": index, "status": "ok", "result": rescaled[item_key]}
+
 
 class SolarService:
     def __init__(self, pvgis_service: PVGISServicePort):
         self.pvgis_service = pvgis_service
 
     async def calculate_energy_production(self, params: PVGISRequest) -> dict:
-        return await self.pvgis_service.get_pv_data(params)
+        base = await self.pvgis_service.get_pv_data(normalize_request(params))
+        return rescale_pv_data(base, params.peakpower, params.loss)
+
+    async def calculate_batch(
+        self, items: List[PVGISRequest], concurrency: int
+    ) -> List[Dict[str, Any]]:
+        results = [
+            result async for result in self.iter_batch(items, concurrency=concurrency)
+        ]
+        results.sort(key=lambda result: result["index"])
+        return results
+
+    async def iter_batch(
+        self, items: List[PVGISRequest], concurrency: int
+    ) -> AsyncIterator[Dict[str, Any]]:
+        locations: Dict[str, PVGISRequest] = {}
+        indexes: Dict[str, List[int]] = {}
+        for index, item in enumerate(items):
+            normalized = normalize_request(item)
+            key = normalized.cache_key()
+            locations.setdefault(key, normalized)
+            indexes.setdefault(key, []).append(index)
+
+        pending = []
+        for key, normalized in locations.items():
+            cached = self.pvgis_service.get_cached_pv_data(normalized)
+            if cached is None:
+                pending.append(key)
+                continue
+            for result in _batch_results(items, indexes[key], cached):
+                yield result
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(key: str) -> Tuple[str, Any]:
+            async with semaphore:
+                try:
+                    return key, await self.pvgis_service.get_pv_data(locations[key])
+                except Exception as e:
+                    return key, e
+
+        tasks = [asyncio.ensure_future(fetch(key)) for key in pending]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                key, outcome = await next_done
+                for result in _batch_results(items, indexes[key], outcome):
+                    yield result
+        finally:
+            for task in tasks:
+                task.cancel()
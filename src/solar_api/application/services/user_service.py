@@ -1,11 +1,21 @@
 from typing import Optional, List
 from ...domain.user_models import UserCreate, UserUpdate, UserInDB, generate_api_key
 from ...application.ports.user_repository import UserRepositoryPort
-from ..security import pwd_context
+from ...application.auth_cache import ApiKeyCache
+from ..security import password_hasher
 
 class UserService:
-    def __init__(self, user_repository: UserRepositoryPort):
+    def __init__(
+        self,
+        user_repository: UserRepositoryPort,
+        auth_cache: Optional[ApiKeyCache] = None,
+    ):
         self.user_repository = user_repository
+        self.auth_cache = auth_cache
+
+    def _invalidate(self, user_id: int) -> None:
+        if self.auth_cache is not None:
+            self.auth_cache.invalidate_user(user_id)
 
     async def get_user(self, user_id: int) -> Optional[UserInDB]:
         return await self.user_repository.get_by_id(user_id)
@@ -21,10 +31,12 @@ class UserService:
         if existing_user:
             raise ValueError("User with this email already exists")
 
-        hashed_password = pwd_context.hash(user.password)
+        hashed_password = await password_hasher.hash(user.password)
         user_data = user.model_dump()
         user_data["password"] = hashed_password
         user_data["api_key"] = generate_api_key()
+        if self.auth_cache is not None:
+            self.auth_cache.invalidate_key(user_data["api_key"])
 
         return await self.user_repository.create(user_data)
 
@@ -34,7 +46,13 @@ class UserService:
         if user_id != current_user.id and not current_user.is_admin:
             raise ValueError("Not authorized to update this user")
         update_data = user_update.model_dump(exclude_unset=True)
-        return await self.user_repository.update(user_id, update_data)
+        if update_data.get("password"):
+            update_data["password"] = await password_hasher.hash(
+                update_data["password"]
+            )
+        updated = await self.user_repository.update(user_id, update_data)
+        self._invalidate(user_id)
+        return updated
 
     async def delete_user(self, user_id: int, current_user: UserInDB) -> bool:
         if user_id != current_user.id and not current_user.is_admin:
@@ -43,7 +61,9 @@ class UserService:
         if user_id == current_user.id:
             raise ValueError("Cannot delete your own account")
 
-        return await self.user_repository.delete(user_id)
+        deleted = await self.user_repository.delete(user_id)
+        self._invalidate(user_id)
+        return deleted
 
     async def rotate_api_key(
         self, user_id: int, current_user: UserInDB
@@ -53,6 +73,9 @@ class UserService:
 
         new_api_key = generate_api_key()
         await self.user_repository.update(user_id, {"api_key": new_api_key})
+        self._invalidate(user_id)
+        if self.auth_cache is not None:
+            self.auth_cache.invalidate_key(new_api_key)
         return new_api_key
 
     async def list_users(
@@ -87,6 +110,8 @@ class UserService:
             ):
                 raise ValueError("Current password is incorrect")
 
-        await self.user_repository.update(user_id, {"password": new_password})
+        hashed_password = await password_hasher.hash(new_password)
+        await self.user_repository.update(user_id, {"password": hashed_password})
+        self._invalidate(user_id)
 
         return True
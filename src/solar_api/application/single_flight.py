@@ -0,0 +1,50 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from src.solar_api.application import metrics
+
+
+class _Call:
+    def __init__(self, task: "asyncio.Task[Any]"):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self, name: Optional[str] = None):
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def _count(self, event: str) -> None:
+        if self.name:
+            metrics.increment(f"{self.name}.{event}")
+
+    def _forget(self, key: Hashable, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+            self._count("leaders")
+        else:
+            self._count("coalesced")
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Forget the call before cancelling it: the task stays pending
+                # until its cancellation is delivered, and a caller arriving in
+                # that window must start a new flight, not inherit the
+                # CancelledError
+                self._forget(key, call)
+                call.task.cancel()
@@ -3,5 +3,94 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+
+def _env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).lower() in ("1", "true", "yes")
+
+
 API_USERNAME = os.getenv("API_USERNAME")
 API_PASSWORD = os.getenv("API_PASSWORD")
+
+PVGIS_MAX_CONNECTIONS = int(os.getenv("PVGIS_MAX_CONNECTIONS", "100"))
+PVGIS_MAX_KEEPALIVE_CONNECTIONS = int(
+    os.getenv("PVGIS_MAX_KEEPALIVE_CONNECTIONS", "20")
+)
+PVGIS_KEEPALIVE_EXPIRY = float(os.getenv("PVGIS_KEEPALIVE_EXPIRY", "60"))
+PVGIS_CONNECT_TIMEOUT = float(os.getenv("PVGIS_CONNECT_TIMEOUT", "5"))
+PVGIS_READ_TIMEOUT = float(os.getenv("PVGIS_READ_TIMEOUT", "30"))
+PVGIS_WRITE_TIMEOUT = float(os.getenv("PVGIS_WRITE_TIMEOUT", "5"))
+PVGIS_POOL_TIMEOUT = float(os.getenv("PVGIS_POOL_TIMEOUT", "5"))
+PVGIS_HTTP2 = _env_bool("PVGIS_HTTP2", False)
+
+PVGIS_CACHE_MAX_ENTRIES = int(os.getenv("PVGIS_CACHE_MAX_ENTRIES", "10000"))
+PVGIS_CACHE_TTL = float(os.getenv("PVGIS_CACHE_TTL", "86400"))
+PVGIS_STORE_ENABLED = _env_bool("PVGIS_STORE_ENABLED", True)
+PVGIS_STORE_TTL = float(os.getenv("PVGIS_STORE_TTL", "2592000"))
+
+PVGIS_BATCH_MAX_ITEMS = int(os.getenv("PVGIS_BATCH_MAX_ITEMS", "1000"))
+PVGIS_BATCH_CONCURRENCY = int(os.getenv("PVGIS_BATCH_CONCURRENCY", "8"))
+
+PVGIS_RATE_LIMIT = float(os.getenv("PVGIS_RATE_LIMIT", "10"))
+PVGIS_RATE_LIMIT_BURST = float(os.getenv("PVGIS_RATE_LIMIT_BURST", "10"))
+PVGIS_RATE_LIMIT_QUEUE_SIZE = int(os.getenv("PVGIS_RATE_LIMIT_QUEUE_SIZE", "200"))
+PVGIS_RATE_LIMIT_INTERACTIVE_TIMEOUT = float(
+    os.getenv("PVGIS_RATE_LIMIT_INTERACTIVE_TIMEOUT", "2")
+)
+PVGIS_RATE_LIMIT_BATCH_TIMEOUT = float(
+    os.getenv("PVGIS_RATE_LIMIT_BATCH_TIMEOUT", "30")
+)
+
+PVGIS_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("PVGIS_CIRCUIT_FAILURE_THRESHOLD", "5"))
+PVGIS_CIRCUIT_RECOVERY_TIMEOUT = float(
+    os.getenv("PVGIS_CIRCUIT_RECOVERY_TIMEOUT", "30")
+)
+PVGIS_CACHE_STALE_TTL = float(os.getenv("PVGIS_CACHE_STALE_TTL", "604800"))
+
+PVGIS_LOCAL_CLIMATOLOGY_PATH = os.getenv("PVGIS_LOCAL_CLIMATOLOGY_PATH", "")
+PVGIS_LOCAL_FALLBACK = _env_bool("PVGIS_LOCAL_FALLBACK", False)
+
+PVGIS_YIELD_GRID_PATH = os.getenv("PVGIS_YIELD_GRID_PATH", "")
+
+AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "10000"))
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", "60"))
+AUTH_CACHE_NEGATIVE_MAX_ENTRIES = int(
+    os.getenv("AUTH_CACHE_NEGATIVE_MAX_ENTRIES", "1000")
+)
+AUTH_CACHE_NEGATIVE_TTL = float(os.getenv("AUTH_CACHE_NEGATIVE_TTL", "10"))
+
+INVALIDATION_LISTENER_ENABLED = _env_bool("INVALIDATION_LISTENER_ENABLED", True)
+
+PASSWORD_HASH_CONCURRENCY = int(os.getenv("PASSWORD_HASH_CONCURRENCY", "2"))
+PASSWORD_HASH_ROUNDS = int(os.getenv("PASSWORD_HASH_ROUNDS", "12"))
+PASSWORD_HASH_CALIBRATE = _env_bool("PASSWORD_HASH_CALIBRATE", True)
+PASSWORD_HASH_TARGET_SECONDS = float(os.getenv("PASSWORD_HASH_TARGET_SECONDS", "0.25"))
+PASSWORD_HASH_MIN_ROUNDS = int(os.getenv("PASSWORD_HASH_MIN_ROUNDS", "10"))
+PASSWORD_HASH_MAX_ROUNDS = int(os.getenv("PASSWORD_HASH_MAX_ROUNDS", "15"))
+
+SECRET_KEY = os.getenv("SECRET_KEY", "")
+ACCESS_TOKEN_ALGORITHM = os.getenv("ALGORITHM", "HS256")
+ACCESS_TOKEN_EXPIRE_MINUTES = float(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "15"))
+TOKEN_REVOCATION_REFRESH_INTERVAL = float(
+    os.getenv("TOKEN_REVOCATION_REFRESH_INTERVAL", "30")
+)
+
+QUOTA_ENABLED = _env_bool("QUOTA_ENABLED", True)
+QUOTA_CALCULATE_RATE = float(os.getenv("QUOTA_CALCULATE_RATE", "1"))
+QUOTA_CALCULATE_BURST = float(os.getenv("QUOTA_CALCULATE_BURST", "30"))
+QUOTA_PANELS_RATE = float(os.getenv("QUOTA_PANELS_RATE", "5"))
+QUOTA_PANELS_BURST = float(os.getenv("QUOTA_PANELS_BURST", "50"))
+QUOTA_MAX_USERS = int(os.getenv("QUOTA_MAX_USERS", "10000"))
+USAGE_FLUSH_INTERVAL = float(os.getenv("USAGE_FLUSH_INTERVAL", "15"))
+USAGE_FLUSH_CHUNK_SIZE = int(os.getenv("USAGE_FLUSH_CHUNK_SIZE", "1000"))
+USAGE_MAX_PENDING = int(os.getenv("USAGE_MAX_PENDING", "100000"))
+
+PANEL_IMPORT_CHUNK_SIZE = int(os.getenv("PANEL_IMPORT_CHUNK_SIZE", "500"))
+PANEL_IMPORT_MAX_ROWS = int(os.getenv("PANEL_IMPORT_MAX_ROWS", "100000"))
+PANEL_ETAG_MAX_USERS = int(os.getenv("PANEL_ETAG_MAX_USERS", "10000"))
+PANEL_ETAG_TTL = float(os.getenv("PANEL_ETAG_TTL", "300"))
+PANEL_EXPORT_BATCH_SIZE = int(os.getenv("PANEL_EXPORT_BATCH_SIZE", "1000"))
+
+# "sqlalchemy" (ORM on the shared engine) or "asyncpg" (raw pool, prepared statements)
+REPOSITORY_BACKEND = os.getenv("REPOSITORY_BACKEND", "sqlalchemy")
+ASYNCPG_POOL_MIN_SIZE = int(os.getenv("ASYNCPG_POOL_MIN_SIZE", "5"))
+ASYNCPG_POOL_MAX_SIZE = int(os.getenv("ASYNCPG_POOL_MAX_SIZE", "15"))
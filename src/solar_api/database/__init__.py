@@ -3,24 +3,41 @@ from .config import (
     engine,
     get_db,
     get_db_sync,
+    get_session_factory,
+    unit_of_work,
     init_db,
     create_tables,
+    pg_trgm_available,
     ensure_database_exists,
     async_session_factory,
     create_db_engine,
 )
-from .models import User, PanelModel
+from .models import (
+    User,
+    PanelModel,
+    PanelCollectionVersion,
+    PVGISResult,
+    TokenRevocation,
+    UsageCounter,
+)
 
 __all__ = [
     "Base",
     "engine",
     "async_session_factory",
     "get_db",
+    "get_session_factory",
+    "unit_of_work",
     "get_db_sync",
     "init_db",
     "create_tables",
+    "pg_trgm_available",
     "ensure_database_exists",
     "create_db_engine",
     "User",
     "PanelModel",
+    "PanelCollectionVersion",
+    "PVGISResult",
+    "TokenRevocation",
+    "UsageCounter",
 ]
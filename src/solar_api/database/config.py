@@ -1,18 +1,22 @@
 import os
 import logging
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from pathlib import Path
-from typing import AsyncGenerator, Optional
+from typing import AsyncGenerator, AsyncIterator, List, Optional
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
     AsyncSession,
     AsyncEngine,
     async_sessionmaker,
 )
-from sqlalchemy.orm import declarative_base
-from sqlalchemy import text
+from sqlalchemy.orm import ORMExecuteState, Session, declarative_base
+from sqlalchemy import Engine, event, text
 from sqlalchemy.schema import CreateTable, CreateIndex
 from dotenv import load_dotenv
 
+from src.solar_api.application import metrics
+
 logger = logging.getLogger(__name__)
 
 project_root = Path(__file__).parent.parent.parent.parent
@@ -62,17 +66,95 @@ async_session_factory = async_sessionmaker(
 Base = declarative_base()
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    async with async_session_factory() as session:
+# Sessions opened by unit_of_work() track, in session.info, how many
+# connections they checked out and whether anything may have been written.
+UOW_CONNECTIONS = "uow_connections"
+UOW_WRITES = "uow_writes"
+
+
+# Statements sent by the current unit of work, whichever session or
+# connection sends them; a list so the greenlet running the driver can add to it
+_statement_count: ContextVar[Optional[List[int]]] = ContextVar(
+    "uow_statement_count", default=None
+)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    counter = _statement_count.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+@event.listens_for(Session, "after_begin")
+def _count_connection(session: Session, transaction, connection) -> None:
+    if UOW_CONNECTIONS in session.info:
+        session.info[UOW_CONNECTIONS] += 1
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_writes(state: ORMExecuteState) -> None:
+    # Anything that is not a plain SELECT (DML, text(), pg_notify) counts
+    if UOW_WRITES in state.session.info and not state.is_select:
+        state.session.info[UOW_WRITES] = True
+
+
+@event.listens_for(Session, "before_flush")
+def _track_flush(session: Session, flush_context, instances) -> None:
+    if UOW_WRITES in session.info:
+        session.info[UOW_WRITES] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _reset_writes(session: Session) -> None:
+    # Repositories commit their own writes; nothing is left for the request
+    if UOW_WRITES in session.info:
+        session.info[UOW_WRITES] = False
+
+
+@asynccontextmanager
+async def unit_of_work(
+    session_factory: Optional[async_sessionmaker[AsyncSession]] = None,
+) -> AsyncIterator[AsyncSession]:
+    """One session for the whole request, committed only if it wrote something.
+
+    The session checks out a pool connection lazily, on its first statement,
+    so requests answered from memory never touch the pool.
+    """
+    statements = [0]
+    token = _statement_count.set(statements)
+    async with (session_factory or async_session_factory)() as session:
+        session.info[UOW_CONNECTIONS] = 0
+        session.info[UOW_WRITES] = False
         try:
             yield session
-            await session.commit()
+            pending = session.new or session.dirty or session.deleted
+            if pending or (session.info[UOW_WRITES] and session.in_transaction()):
+                await session.commit()
+                metrics.increment("db.commits")
+            else:
+                metrics.increment("db.commits_skipped")
         except Exception as e:
             logger.error(f"Database error: {e}")
             await session.rollback()
             raise
         finally:
+            metrics.observe("db.connections_per_request", session.info[UOW_CONNECTIONS])
+            metrics.observe("db.queries_per_request", statements[0])
             await session.close()
+            _statement_count.reset(token)
+
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    # FastAPI caches dependencies per request, so auth, services and
+    # repositories that depend on get_db all share this single session
+    async with unit_of_work() as session:
+        yield session
+
+
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    # For work that outlives the request session, such as streamed responses
+    return async_session_factory
 
 
 async def ensure_database_exists():
@@ -153,12 +235,37 @@ async def drop_tables(engine: AsyncEngine) -> None:
         raise
 
 
+def _needs_pg_trgm(index) -> bool:
+    ops = index.dialect_options["postgresql"]["ops"] or {}
+    return "gin_trgm_ops" in ops.values()
+
+
+async def pg_trgm_available(engine: AsyncEngine) -> bool:
+    """Whether the pg_trgm extension is installed, so search can use trigrams."""
+    if engine.dialect.name != "postgresql":
+        return False
+    async with engine.connect() as conn:
+        installed = await conn.scalar(
+            text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        )
+    return bool(installed)
+
+
 async def create_tables(engine: AsyncEngine, drop_existing: bool = False) -> None:
     from .models import Base
     from sqlalchemy.exc import SQLAlchemyError
 
     logger.info("Starting table creation...")
 
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    except Exception as e:
+        logger.warning(f"Could not enable pg_trgm: {e}")
+    trigram = await pg_trgm_available(engine)
+    if not trigram:
+        logger.warning("pg_trgm is not installed, panel search falls back to ILIKE")
+
     try:
         async with engine.begin() as conn:
             if drop_existing:
@@ -191,6 +298,8 @@ async def create_tables(engine: AsyncEngine, drop_existing: bool = False) -> Non
             logger.info("Ensuring indexes exist...")
             for table in Base.metadata.tables.values():
                 for index in table.indexes:
+                    if _needs_pg_trgm(index):
+                        continue
                     try:
                         index_exists = await conn.scalar(
                             text("""
@@ -237,6 +346,20 @@ async def create_tables(engine: AsyncEngine, drop_existing: bool = False) -> Non
         logger.error(f"Unexpected error in create_tables: {e}")
         raise
 
+    if not trigram:
+        return
+    # One transaction per trigram index, so a failure cannot roll back the
+    # tables and indexes created above
+    for table in Base.metadata.tables.values():
+        for index in filter(_needs_pg_trgm, table.indexes):
+            try:
+                async with engine.begin() as conn:
+                    create_index_ddl = CreateIndex(index, if_not_exists=True)
+                    await conn.execute(text(str(create_index_ddl.compile(engine))))
+                logger.info(f"Ensured index: {index.name}")
+            except Exception as e:
+                logger.warning(f"Error creating index {index.name}: {e}")
+
 
 def get_db_sync():
     from sqlalchemy.orm import sessionmaker as sync_sessionmaker
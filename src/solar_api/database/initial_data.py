@@ -8,6 +8,7 @@ from dotenv import load_dotenv
 project_root = Path(__file__).parent.parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from src.solar_api.application.security import password_hasher
 from src.solar_api.database.models import User
 from src.solar_api.domain.user_models import generate_api_key
 
@@ -39,7 +40,7 @@ async def init_admin_user(db: AsyncSession) -> bool:
 
             admin_user = User(
                 email=admin_email,
-                password=admin_password,
+                password=await password_hasher.hash(admin_password),
                 api_key=generate_api_key(),
                 is_active=True,
                 is_admin=True,
@@ -1,13 +1,18 @@
 from sqlalchemy import (
     Column,
+    DDL,
     Integer,
     String,
+    BigInteger,
     Boolean,
+    Date,
     DateTime,
     func,
     Index,
     Float,
     ForeignKey,
+    JSON,
+    event,
     UUID as SQLAlchemyUUID,
 )
 import uuid
@@ -72,6 +77,25 @@ class PanelModel(Base):
     __table_args__ = (
         Index("ix_panel_models_user_id", "user_id"),
         Index("ix_panel_models_manufacturer_type", "manufacturer", "type", "user_id"),
+        # Keyset pagination: one index per sort key, with id as tie-breaker
+        Index("ix_panel_models_user_name", "user_id", "name", "id"),
+        Index("ix_panel_models_user_capacity", "user_id", "capacity", "id"),
+        Index("ix_panel_models_user_efficiency", "user_id", "efficiency", "id"),
+        Index("ix_panel_models_user_created_at", "user_id", "created_at", "id"),
+        Index("ix_panel_models_user_type", "user_id", "type"),
+        # Fuzzy search (q=); needs the pg_trgm extension
+        Index(
+            "ix_panel_models_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_panel_models_manufacturer_trgm",
+            "manufacturer",
+            postgresql_using="gin",
+            postgresql_ops={"manufacturer": "gin_trgm_ops"},
+        ),
     )
 
     def to_dict(self):
@@ -85,3 +109,66 @@ class PanelModel(Base):
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
         }
+
+
+class PanelCollectionVersion(Base):
+    __tablename__ = "panel_collection_versions"
+
+    # Bumped by the same statement as every write to the user's panel_models
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    version = Column(BigInteger, nullable=False, default=0)
+
+
+# PostgreSQL bumps the version from the writing statement itself, through a
+# data-modifying CTE (see the panel repositories). SQLite has no such CTEs, so
+# a trigger, which runs inside the writing statement, does it there.
+for _operation, _row in (("insert", "NEW"), ("update", "NEW"), ("delete", "OLD")):
+    event.listen(
+        PanelModel.__table__,
+        "after_create",
+        DDL(
+            f"CREATE TRIGGER panel_models_{_operation}_bump_version "
+            f"AFTER {_operation.upper()} ON panel_models BEGIN "
+            "INSERT INTO panel_collection_versions (user_id, version) "
+            f"VALUES ({_row}.user_id, 1) ON CONFLICT (user_id) DO UPDATE "
+            "SET version = version + 1; END"
+        ).execute_if(dialect="sqlite"),
+    )
+
+
+class PVGISResult(Base):
+    __tablename__ = "pvgis_results"
+
+    key = Column(String, primary_key=True)
+    lat = Column(Float, nullable=False)
+    lon = Column(Float, nullable=False)
+    peakpower = Column(Float, nullable=False)
+    loss = Column(Float, nullable=False)
+    payload = Column(JSON, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (Index("ix_pvgis_results_expires_at", "expires_at"),)
+
+
+class TokenRevocation(Base):
+    __tablename__ = "token_revocations"
+
+    # No foreign key: deleted users must stay revoked until their tokens expire
+    user_id = Column(Integer, primary_key=True)
+    revoked_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (Index("ix_token_revocations_revoked_at", "revoked_at"),)
+
+
+class UsageCounter(Base):
+    __tablename__ = "usage_counters"
+
+    # No foreign key: a batch flushed after a user is deleted must not fail
+    user_id = Column(Integer, primary_key=True)
+    day = Column(Date, primary_key=True)
+    scope = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
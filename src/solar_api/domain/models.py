@@ -1,3 +1,4 @@
+from typing import List
 from pydantic import BaseModel, Field
 
 
@@ -8,3 +9,15 @@ class PVGISRequest(BaseModel):
         ..., gt=0, description="Peak power of the PV system in kWp"
     )
     loss: float = Field(..., ge=0, le=100, description="System loss in percentage")
+
+    def cache_key(self) -> str:
+        return (
+            f"pvcalc:{self.lat:.6f}:{self.lon:.6f}"
+            f":{self.peakpower:.6f}:{self.loss:.6f}"
+        )
+
+
+class PVGISBatchRequest(BaseModel):
+    items: List[PVGISRequest] = Field(
+        ..., min_length=1, description="Sites to calculate, answered in input order"
+    )
@@ -1,7 +1,7 @@
 from uuid import UUID, uuid4
 from datetime import datetime
-from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional
+from pydantic import BaseModel, Field, ConfigDict, TypeAdapter
+from typing import List, Literal, Optional
 
 
 class PanelModelBase(BaseModel):
@@ -92,3 +92,51 @@ class PanelModel(PanelModelBase):
             }
         },
     )
+
+
+# Built once: a TypeAdapter compiles its validator and serializer on creation.
+# Validates straight from ORM objects or result rows (from_attributes=True).
+PANEL_MODEL_LIST_ADAPTER = TypeAdapter(List[PanelModel])
+
+
+PanelSortField = Literal["name", "capacity", "efficiency", "created_at", "relevance"]
+
+
+class PanelModelQuery(BaseModel):
+    q: Optional[str] = Field(
+        None, description="Fuzzy search over name and manufacturer"
+    )
+    manufacturer: Optional[str] = None
+    panel_type: Optional[str] = None
+    min_capacity: Optional[float] = None
+    min_efficiency: Optional[float] = None
+    sort_by: Optional[PanelSortField] = Field(
+        None, description="Defaults to relevance when searching, name otherwise"
+    )
+    descending: bool = False
+    limit: int = Field(100, ge=1, le=1000)
+    cursor: Optional[str] = Field(
+        None, description="Opaque cursor returned with the previous page"
+    )
+
+
+class PanelModelPage(BaseModel):
+    items: List[PanelModel]
+    next_cursor: Optional[str] = None
+
+
+class PanelImportRowError(BaseModel):
+    row: int = Field(..., description="1-based data row (CSV header excluded)")
+    errors: List[str]
+
+
+class PanelImportReport(BaseModel):
+    total_rows: int = 0
+    imported: int = 0
+    failed: int = 0
+    committed: bool = Field(
+        False, description="False when all-or-nothing mode rolled the import back"
+    )
+    errors: List[PanelImportRowError] = Field(
+        default_factory=list, description="Row errors, truncated to the first ones"
+    )
@@ -1,5 +1,5 @@
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from typing import List, Optional
 import secrets
 import string
 from pydantic import BaseModel, EmailStr, Field, validator
@@ -60,6 +60,21 @@ class UserResponse(UserBase):
 class Token(BaseModel):
     access_token: str
     token_type: str
+    expires_in: Optional[int] = Field(
+        default=None, description="Seconds until the token expires"
+    )
+
+
+class UsageEntry(BaseModel):
+    day: date
+    scope: str
+    requests: int
+
+
+class UserUsage(BaseModel):
+    user_id: int
+    since: date
+    usage: List[UsageEntry]
 
 
 def generate_api_key() -> str:
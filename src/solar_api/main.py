@@ -10,10 +10,71 @@ sys.path.insert(0, str(project_root))
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.security import APIKeyHeader
 
 from src.solar_api.adapters.api import routes, panel_routes, user_routes, auth_routes
-from src.solar_api.database import init_db, engine
+from src.solar_api import config
+from src.solar_api.database import (
+    init_db,
+    engine,
+    async_session_factory,
+    pg_trgm_available,
+)
+from src.solar_api.database.config import DATABASE_URL
+from src.solar_api.adapters.notifications.postgres_invalidation import (
+    PostgresInvalidationListener,
+)
+from src.solar_api.adapters.pvgis.http_client import create_pvgis_client
+from src.solar_api.adapters.pvgis.local_yield_adapter import (
+    Climatology,
+    LocalYieldAdapter,
+)
+from src.solar_api.adapters.pvgis.yield_grid import YieldGrid
+from src.solar_api.adapters.repositories.asyncpg_panel_repository import (
+    PANEL_STATEMENTS,
+)
+from src.solar_api.adapters.repositories.asyncpg_pool import create_asyncpg_pool
+from src.solar_api.adapters.repositories.asyncpg_user_repository import (
+    USER_STATEMENTS,
+    AsyncpgUserRepository,
+)
+from src.solar_api.adapters.repositories.postgres_pvgis_result_repository import (
+    PostgresPVGISResultRepository,
+)
+from src.solar_api.adapters.repositories.postgres_token_revocation_repository import (
+    PostgresTokenRevocationRepository,
+)
+from src.solar_api.adapters.repositories.postgres_usage_repository import (
+    PostgresUsageRepository,
+)
+from src.solar_api.application.access_tokens import (
+    AccessTokenService,
+    TokenRevocationList,
+    TokenRevocationRefresher,
+)
+from src.solar_api.application.auth_cache import ApiKeyCache
+from src.solar_api.application.cache import TTLCache
+from src.solar_api.application.security import (
+    calibrate_password_hashing,
+    password_hasher,
+)
+from src.solar_api.application.collection_versions import CollectionVersions
+from src.solar_api.application.invalidation import (
+    ENTITY_PANEL,
+    ENTITY_USER,
+    InvalidationBus,
+)
+from src.solar_api.application.circuit_breaker import CircuitBreaker
+from src.solar_api.application.quota import UsageRecorder, UserRateLimiter
+from src.solar_api.application.services.quota_service import (
+    QuotaService,
+    SCOPE_CALCULATE,
+    SCOPE_PANELS,
+)
+from src.solar_api.application.single_flight import SingleFlight
+from src.solar_api.application.rate_limiter import PriorityRateLimiter
+from src.solar_api.application.services.pvgis_cache_service import PVGISResultCache
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -22,16 +83,168 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     logger.info("Starting application...")
+    if config.PASSWORD_HASH_CALIBRATE:
+        rounds = await calibrate_password_hashing()
+        logger.info(f"Password hashing calibrated to bcrypt cost {rounds}")
+
     try:
         await init_db()
         logger.info("Database initialized successfully")
     except Exception as e:
         logger.error(f"Failed to initialize database: {e}")
         raise
+    # Panel search uses trigram operators only when the extension is there
+    app.state.pg_trgm = await pg_trgm_available(engine)
+
+    app.state.asyncpg_pool = None
+    app.state.user_repository = None
+    if config.REPOSITORY_BACKEND == "asyncpg":
+        app.state.asyncpg_pool = await create_asyncpg_pool(
+            DATABASE_URL,
+            {**PANEL_STATEMENTS, **USER_STATEMENTS},
+            min_size=config.ASYNCPG_POOL_MIN_SIZE,
+            max_size=config.ASYNCPG_POOL_MAX_SIZE,
+        )
+        app.state.user_repository = AsyncpgUserRepository(app.state.asyncpg_pool)
+        logger.info("Using asyncpg repositories with prepared statements")
+
+    app.state.auth_cache = ApiKeyCache(
+        max_entries=config.AUTH_CACHE_MAX_ENTRIES,
+        ttl=config.AUTH_CACHE_TTL,
+        negative_max_entries=config.AUTH_CACHE_NEGATIVE_MAX_ENTRIES,
+        negative_ttl=config.AUTH_CACHE_NEGATIVE_TTL,
+    )
+    app.state.invalidation_bus = InvalidationBus()
+    app.state.invalidation_bus.subscribe(
+        ENTITY_USER, app.state.auth_cache.handle_invalidation
+    )
+    app.state.invalidation_bus.on_reset(app.state.auth_cache.clear)
+    app.state.panel_versions = CollectionVersions(
+        max_entries=config.PANEL_ETAG_MAX_USERS,
+        ttl=config.PANEL_ETAG_TTL,
+        name="panel_versions",
+    )
+    app.state.invalidation_bus.subscribe(
+        ENTITY_PANEL, app.state.panel_versions.handle_invalidation
+    )
+    app.state.invalidation_bus.on_reset(app.state.panel_versions.reset)
+    app.state.access_tokens = None
+    app.state.token_revocation_refresher = None
+    if config.SECRET_KEY:
+        revocations = TokenRevocationList(
+            retention=config.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        )
+        app.state.access_tokens = AccessTokenService(
+            secret_key=config.SECRET_KEY,
+            ttl=config.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+            revocations=revocations,
+            algorithm=config.ACCESS_TOKEN_ALGORITHM,
+        )
+        app.state.token_revocation_refresher = TokenRevocationRefresher(
+            PostgresTokenRevocationRepository(async_session_factory),
+            revocations,
+            interval=config.TOKEN_REVOCATION_REFRESH_INTERVAL,
+        )
+        app.state.invalidation_bus.subscribe(
+            ENTITY_USER, revocations.handle_invalidation
+        )
+        app.state.invalidation_bus.on_reset(
+            app.state.token_revocation_refresher.request_refresh
+        )
+        await app.state.token_revocation_refresher.refresh()
+        app.state.token_revocation_refresher.start()
+    app.state.invalidation_listener = None
+    if config.INVALIDATION_LISTENER_ENABLED:
+        app.state.invalidation_listener = PostgresInvalidationListener(
+            DATABASE_URL, app.state.invalidation_bus
+        )
+        app.state.invalidation_listener.start()
+    app.state.usage_recorder = UsageRecorder(
+        PostgresUsageRepository(async_session_factory),
+        flush_interval=config.USAGE_FLUSH_INTERVAL,
+        chunk_size=config.USAGE_FLUSH_CHUNK_SIZE,
+        max_pending=config.USAGE_MAX_PENDING,
+    )
+    app.state.usage_recorder.start()
+    app.state.quota = QuotaService(
+        limiters=(
+            {
+                SCOPE_CALCULATE: UserRateLimiter(
+                    rate=config.QUOTA_CALCULATE_RATE,
+                    burst=config.QUOTA_CALCULATE_BURST,
+                    max_users=config.QUOTA_MAX_USERS,
+                    name="quota.calculate",
+                ),
+                SCOPE_PANELS: UserRateLimiter(
+                    rate=config.QUOTA_PANELS_RATE,
+                    burst=config.QUOTA_PANELS_BURST,
+                    max_users=config.QUOTA_MAX_USERS,
+                    name="quota.panels",
+                ),
+            }
+            if config.QUOTA_ENABLED
+            else {}
+        ),
+        recorder=app.state.usage_recorder,
+    )
+    app.state.pvgis_client = create_pvgis_client()
+    app.state.pvgis_rate_limiter = PriorityRateLimiter(
+        rate=config.PVGIS_RATE_LIMIT,
+        burst=config.PVGIS_RATE_LIMIT_BURST,
+        max_queue=config.PVGIS_RATE_LIMIT_QUEUE_SIZE,
+        name="pvgis_rate_limiter",
+    )
+    app.state.pvgis_circuit_breaker = CircuitBreaker(
+        failure_threshold=config.PVGIS_CIRCUIT_FAILURE_THRESHOLD,
+        recovery_timeout=config.PVGIS_CIRCUIT_RECOVERY_TIMEOUT,
+        name="pvgis_circuit",
+    )
+    app.state.pvgis_single_flight = SingleFlight(name="pvgis_single_flight")
+    app.state.pvgis_cache = PVGISResultCache(
+        memory=TTLCache(
+            max_entries=config.PVGIS_CACHE_MAX_ENTRIES,
+            ttl=config.PVGIS_CACHE_TTL,
+            name="pvgis_cache.memory",
+            stale_ttl=config.PVGIS_CACHE_STALE_TTL,
+        ),
+        store=(
+            PostgresPVGISResultRepository(
+                async_session_factory, ttl=config.PVGIS_STORE_TTL
+            )
+            if config.PVGIS_STORE_ENABLED
+            else None
+        ),
+    )
+    app.state.pvgis_local_engine = None
+    if config.PVGIS_LOCAL_CLIMATOLOGY_PATH:
+        try:
+            app.state.pvgis_local_engine = LocalYieldAdapter(
+                Climatology.load(config.PVGIS_LOCAL_CLIMATOLOGY_PATH)
+            )
+            logger.info("Local yield engine loaded")
+        except Exception as e:
+            logger.error(f"Failed to load local climatology: {e}")
+    app.state.pvgis_yield_grid = None
+    if config.PVGIS_YIELD_GRID_PATH:
+        try:
+            app.state.pvgis_yield_grid = YieldGrid(config.PVGIS_YIELD_GRID_PATH)
+            logger.info("PVGIS yield grid memory-mapped")
+        except Exception as e:
+            logger.error(f"Failed to load PVGIS yield grid: {e}")
 
     yield
 
     logger.info("Shutting down application...")
+    if app.state.invalidation_listener is not None:
+        await app.state.invalidation_listener.stop()
+    if app.state.token_revocation_refresher is not None:
+        await app.state.token_revocation_refresher.stop()
+    await app.state.usage_recorder.stop()
+    await app.state.pvgis_cache.close()
+    await app.state.pvgis_client.aclose()
+    password_hasher.shutdown()
+    if app.state.asyncpg_pool is not None:
+        await app.state.asyncpg_pool.close()
     await engine.dispose()
 
 
@@ -49,6 +262,8 @@ app = FastAPI(
     This API uses API Key for authentication. To get started:
     1. Login at `/auth/login` with your email and password
     2. Use the returned API key in the `X-API-Key` header for all requests
+    3. Optionally exchange the API key at `/auth/token` for a short-lived token
+       and send it as `Authorization: Bearer <token>`
     
     ## Security
     - All API endpoints require authentication by default
@@ -60,6 +275,7 @@ app = FastAPI(
     redoc_url="/redoc",
     openapi_url="/openapi.json",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     openapi_tags=[
         {"name": "Authentication", "description": "Authentication related endpoints"},
         {"name": "Users", "description": "User management (admin only)"},
@@ -80,10 +296,11 @@ def custom_openapi():
         openapi_schema["components"] = {}
 
     openapi_schema["components"]["securitySchemes"] = {
-        "APIKeyHeader": {"type": "apiKey", "name": "X-API-Key", "in": "header"}
+        "APIKeyHeader": {"type": "apiKey", "name": "X-API-Key", "in": "header"},
+        "HTTPBearer": {"type": "http", "scheme": "bearer", "bearerFormat": "JWT"},
     }
 
-    openapi_schema["security"] = [{"APIKeyHeader": []}]
+    openapi_schema["security"] = [{"APIKeyHeader": []}, {"HTTPBearer": []}]
 
     app.openapi_schema = openapi_schema
     return openapi_schema
@@ -97,6 +314,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Retry-After"],
 )
 
 app.include_router(routes.router)
@@ -8,8 +8,10 @@ from sqlalchemy import select, delete
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.pool import StaticPool
 
+from passlib.context import CryptContext
+
 from src.solar_api.main import app
-from src.solar_api.database import get_db
+from src.solar_api.database import get_db, get_session_factory, unit_of_work
 from src.solar_api.database.models import Base as ModelsBase
 from src.solar_api.database.models import User, PanelModel as PanelModelDB
 from src.solar_api.domain.user_models import UserInDB
@@ -79,13 +81,11 @@ async def _clean_panel_models():
 async def client():
 
     async def override_get_db():
-        async with TestingSessionLocal() as session:
-            try:
-                yield session
-            finally:
-                await session.close()
+        async with unit_of_work(TestingSessionLocal) as session:
+            yield session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: TestingSessionLocal
 
     async def _get_user_by_api_key(
         request: Request, db=Depends(override_get_db)
@@ -153,6 +153,9 @@ TEST_ADMIN_PASSWORD = "adminpassword"
 TEST_USER_EMAIL = "user@example.com"
 TEST_USER_PASSWORD = "userpassword"
 
+# Minimum bcrypt cost keeps fixture setup fast
+fixture_pwd_context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4)
+
 
 @pytest.fixture
 def admin_user_data():
@@ -184,6 +187,7 @@ async def admin_user(db_session, admin_user_data):
     session = db_session
     user = User(
         email=admin_user_data["email"],
+        password=fixture_pwd_context.hash(admin_user_data["password"]),
         is_active=admin_user_data["is_active"],
         is_admin=admin_user_data["is_admin"],
         api_key=generate_api_key(),
@@ -207,6 +211,7 @@ async def regular_user(db_session, regular_user_data):
     session = db_session
     user = User(
         email=regular_user_data["email"],
+        password=fixture_pwd_context.hash(regular_user_data["password"]),
         is_active=regular_user_data["is_active"],
         is_admin=regular_user_data["is_admin"],
         api_key=generate_api_key(),
@@ -0,0 +1,203 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from sqlalchemy import update
+
+from src.solar_api.adapters.repositories.postgres_token_revocation_repository import (
+    PostgresTokenRevocationRepository,
+)
+from src.solar_api.application.access_tokens import (
+    AccessTokenService,
+    TokenRevocationList,
+    TokenRevocationRefresher,
+)
+from src.solar_api.application.auth_cache import ApiKeyCache
+from src.solar_api.application.ports.token_revocation_store import (
+    TokenRevocationStorePort,
+)
+from src.solar_api.database.models import User
+from src.solar_api.domain.user_models import UserInDB
+from src.solar_api.main import app
+from tests.conftest import TestingSessionLocal
+from tests.test_utils import assert_response_status, assert_error_response
+
+
+def _user(user_id: int = 1, is_admin: bool = False) -> UserInDB:
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return UserInDB(
+        id=user_id,
+        email=f"user{user_id}@example.com",
+        api_key="key-1",
+        is_admin=is_admin,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def _service(ttl: float = 60, retention: float = 60) -> AccessTokenService:
+    return AccessTokenService("test-secret", ttl, TokenRevocationList(retention))
+
+
+class InMemoryRevocationStore(TokenRevocationStorePort):
+    def __init__(self):
+        self.rows = {}
+
+    async def load_since(self, since):
+        return {
+            user_id: at.timestamp() for user_id, at in self.rows.items() if at > since
+        }
+
+    async def purge_before(self, before):
+        self.rows = {u: at for u, at in self.rows.items() if at > before}
+
+
+def test_token_round_trip_carries_id_and_role():
+    service = _service()
+    token, expires_in = service.issue(_user(7, is_admin=True))
+
+    user = service.authenticate(token)
+    assert expires_in == 60
+    assert user.id == 7
+    assert user.is_admin is True
+    assert user.email == "user7@example.com"
+    assert user.api_key == ""
+
+
+def test_tampered_expired_and_foreign_tokens_are_rejected():
+    service = _service()
+    token, _ = service.issue(_user())
+
+    assert service.authenticate(token[:-2] + "xx") is None
+    assert (
+        AccessTokenService("other-secret", 60, TokenRevocationList(60)).authenticate(
+            token
+        )
+        is None
+    )
+
+    expired, _ = _service(ttl=-1).issue(_user())
+    assert service.authenticate(expired) is None
+
+
+def test_revocation_voids_tokens_issued_before_it_only():
+    service = _service()
+    old_token, _ = service.issue(_user())
+    service.revocations.revoke(1)
+    new_token, _ = service.issue(_user())
+
+    assert service.authenticate(old_token) is None
+    assert service.authenticate(new_token).id == 1
+
+
+def test_revocation_list_keeps_latest_and_prunes_old_entries():
+    revocations = TokenRevocationList(retention=60)
+    now = time.time()
+    revocations.merge({1: now - 10, 2: now - 120})
+    revocations.handle_invalidation({"entity": "user", "id": 1, "revoked_at": now - 30})
+
+    assert len(revocations) == 1
+    assert revocations.is_revoked(1, now - 20)
+    assert not revocations.is_revoked(1, now - 5)
+
+
+@pytest.mark.asyncio
+async def test_refresher_loads_recent_revocations_and_purges_expired_rows():
+    store = InMemoryRevocationStore()
+    now = datetime.now(timezone.utc)
+    store.rows = {1: now, 2: now - timedelta(minutes=10)}
+    revocations = TokenRevocationList(retention=60)
+
+    await TokenRevocationRefresher(store, revocations, interval=30).refresh()
+
+    assert revocations.is_revoked(1, now.timestamp() - 1)
+    assert not revocations.is_revoked(2, 0)
+    assert list(store.rows) == [1]
+
+
+@pytest.mark.asyncio
+async def test_exchange_api_key_for_token_and_use_it(
+    client: AsyncClient, admin_auth_header, monkeypatch
+):
+    monkeypatch.setattr(app.state, "access_tokens", _service(), raising=False)
+
+    response = await client.post("/auth/token", headers=admin_auth_header)
+    assert_response_status(response, status.HTTP_200_OK)
+    data = response.json()
+    assert data["token_type"] == "bearer"
+    assert data["expires_in"] == 60
+
+    bearer = {"Authorization": f"Bearer {data['access_token']}"}
+    response = await client.get("/users/", headers=bearer)
+    assert_response_status(response, status.HTTP_200_OK)
+
+    # A token cannot be exchanged for another one
+    response = await client.post("/auth/token", headers=bearer)
+    assert_error_response(response, status.HTTP_401_UNAUTHORIZED)
+
+
+@pytest.mark.asyncio
+async def test_rotating_the_key_revokes_outstanding_tokens(
+    client: AsyncClient, admin_auth_header, monkeypatch
+):
+    service = _service()
+    monkeypatch.setattr(app.state, "access_tokens", service, raising=False)
+    response = await client.post("/auth/token", headers=admin_auth_header)
+    bearer = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    response = await client.post("/auth/rotate-key", headers=bearer)
+    assert_response_status(response, status.HTTP_200_OK)
+
+    # No NOTIFY on SQLite: the background refresh picks the revocation up
+    await TokenRevocationRefresher(
+        PostgresTokenRevocationRepository(TestingSessionLocal),
+        service.revocations,
+        interval=30,
+    ).refresh()
+    response = await client.get("/auth/me", headers=bearer)
+    assert_error_response(response, status.HTTP_401_UNAUTHORIZED)
+
+
+@pytest.mark.asyncio
+async def test_rotated_key_cannot_mint_a_token_from_a_stale_cache(
+    client: AsyncClient, admin_user, admin_auth_header, monkeypatch
+):
+    """A token is only issued for a key the database still knows."""
+    monkeypatch.setattr(app.state, "access_tokens", _service(), raising=False)
+    monkeypatch.setattr(
+        app.state,
+        "auth_cache",
+        ApiKeyCache(max_entries=10, ttl=60, negative_max_entries=10, negative_ttl=60),
+        raising=False,
+    )
+    response = await client.get("/auth/me", headers=admin_auth_header)
+    assert_response_status(response, status.HTTP_200_OK)
+
+    # Rotated by another worker: this worker's cache still holds the old key
+    async with TestingSessionLocal() as session:
+        await session.execute(
+            update(User).where(User.id == admin_user.id).values(api_key="rotated")
+        )
+        await session.commit()
+    response = await client.get("/auth/me", headers=admin_auth_header)
+    assert_response_status(response, status.HTTP_200_OK)
+
+    response = await client.post("/auth/token", headers=admin_auth_header)
+    assert_error_response(response, status.HTTP_401_UNAUTHORIZED)
+
+
+@pytest.mark.asyncio
+async def test_token_endpoint_disabled_without_secret(
+    client: AsyncClient, admin_auth_header, monkeypatch
+):
+    monkeypatch.setattr(app.state, "access_tokens", None, raising=False)
+
+    response = await client.post("/auth/token", headers=admin_auth_header)
+    assert_error_response(response, status.HTTP_501_NOT_IMPLEMENTED)
+
+    response = await client.get(
+        "/auth/me", headers={"Authorization": "Bearer anything"}
+    )
+    assert_error_response(response, status.HTTP_401_UNAUTHORIZED)
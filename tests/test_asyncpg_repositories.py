@@ -0,0 +1,246 @@
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from unittest.mock import AsyncMock, Mock
+
+from src.solar_api.adapters.repositories import (
+    AsyncpgPanelRepository,
+    AsyncpgUserRepository,
+    PostgresPanelRepository,
+    PostgresUserRepository,
+    select_panel_repository,
+    select_user_repository,
+)
+from src.solar_api.adapters.repositories.asyncpg_panel_repository import (
+    PANEL_STATEMENTS,
+    build_list_query,
+)
+from src.solar_api.adapters.repositories.asyncpg_user_repository import (
+    USER_STATEMENTS,
+)
+from src.solar_api.application.collection_versions import CollectionVersions
+from src.solar_api.application.pagination import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+)
+from src.solar_api.application.services.auth_service import AuthService
+from src.solar_api.application.services.panel_service import PanelService
+from src.solar_api.domain.panel_model import PanelModelQuery, PanelModelUpdate
+from src.solar_api.domain.user_models import UserInDB
+
+NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _panel_row(name: str, **extra) -> dict:
+    return {
+        "id": uuid.uuid4(),
+        "name": name,
+        "capacity": 0.4,
+        "efficiency": 21.0,
+        "manufacturer": "Acme",
+        "type": "Monocristalino",
+        "created_at": NOW,
+        "updated_at": NOW,
+        **extra,
+    }
+
+
+def _pool(connection: Mock) -> Mock:
+    """Stand-in for an asyncpg pool of PreparedConnections."""
+
+    @asynccontextmanager
+    async def acquire():
+        yield connection
+
+    pool = Mock()
+    pool.acquire = acquire
+    return pool
+
+
+def _connection() -> Mock:
+    connection = Mock()
+    connection.fetch = AsyncMock(return_value=[])
+    connection.fetchrow = AsyncMock(return_value=None)
+    connection.statements = {
+        name: Mock(fetch=AsyncMock(return_value=[]), fetchrow=AsyncMock())
+        for name in {**PANEL_STATEMENTS, **USER_STATEMENTS}
+    }
+    return connection
+
+
+def test_list_query_binds_every_value_and_continues_after_the_cursor():
+    """Filters, search and the cursor position are all parameters, never SQL text."""
+    query = PanelModelQuery(q="acme_%", manufacturer="Acme", min_capacity=0.3, limit=2)
+    sql, args, position = build_list_query(7, query, trigram_search=True)
+
+    assert position == {"s": "relevance", "d": True, "q": "acme_%"}
+    assert args == [7, "acme_%", "%acme\\_\\%%", "Acme", 0.3, 3]
+    assert "acme" not in sql
+    assert "ORDER BY greatest(" in sql and sql.endswith("id DESC LIMIT $6")
+
+    last_id = uuid.uuid4()
+    cursor_query = query.model_copy(
+        update={"cursor": encode_cursor({**position, "v": 0.5, "id": last_id})}
+    )
+    sql, args, _ = build_list_query(7, cursor_query, trigram_search=True)
+    assert args[-3:] == [0.5, last_id, 3]
+    assert "id) < ($6::float8, $7::uuid)" in sql
+
+    with pytest.raises(InvalidCursorError):
+        build_list_query(7, cursor_query.model_copy(update={"q": "other"}))
+
+
+def test_search_without_pg_trgm_uses_ilike_and_a_case_rank():
+    """No trigram operator is sent when the extension is not installed."""
+    sql, args, position = build_list_query(7, PanelModelQuery(q="Acme_", limit=2))
+
+    assert "<%" not in sql and "similarity" not in sql
+    assert args == [7, "%Acme\\_%", "acme_", "Acme\\_%", 3]
+    assert "(name ILIKE $2 OR manufacturer ILIKE $2)" in sql
+    assert "ORDER BY (CASE WHEN lower(name) = $3 THEN 1.0" in sql
+    assert position == {"s": "relevance", "d": True, "q": "Acme_"}
+
+
+def test_orm_search_uses_trigrams_only_when_pg_trgm_is_installed():
+    db = Mock()
+    db.get_bind.return_value.dialect.name = "postgresql"
+
+    def compiled(repository):
+        clauses = (repository._search_match("acme"), repository._search_rank("acme"))
+        return " ".join(str(c.compile(dialect=postgresql.dialect())) for c in clauses)
+
+    assert "<%" not in compiled(PostgresPanelRepository(db))
+    assert "word_similarity" not in compiled(PostgresPanelRepository(db))
+    assert "<%" in compiled(PostgresPanelRepository(db, trigram_search=True))
+
+
+@pytest.mark.asyncio
+async def test_first_page_uses_the_prepared_statement():
+    connection = _connection()
+    rows = [_panel_row(name, sort_key=name) for name in ("A", "B", "C")]
+    connection.statements["panel_list_by_name"].fetch.return_value = rows
+
+    page = await AsyncpgPanelRepository(_pool(connection)).list_page(
+        7, PanelModelQuery(limit=2)
+    )
+
+    connection.statements["panel_list_by_name"].fetch.assert_awaited_once_with(7, 3)
+    connection.fetch.assert_not_awaited()
+    assert [panel.name for panel in page.items] == ["A", "B"]
+    assert decode_cursor(page.next_cursor) == {
+        "s": "name",
+        "d": False,
+        "q": None,
+        "v": "B",
+        "id": str(rows[1]["id"]),
+    }
+
+
+@pytest.mark.asyncio
+async def test_panel_writes_are_one_statement_and_bump_the_version():
+    connection = _connection()
+    versions = CollectionVersions(max_entries=10, ttl=60)
+    repository = AsyncpgPanelRepository(_pool(connection), versions)
+    load = AsyncMock(return_value="7.1")
+    await versions.current(7, load)
+
+    connection.fetchrow.return_value = _panel_row("Renamed", notified="")
+    updated = await repository.update(
+        uuid.uuid4(), PanelModelUpdate(name="Renamed"), 7
+    )
+
+    assert updated.name == "Renamed"
+    sql, model_id, user_id, name = connection.fetchrow.await_args.args
+    assert "SET name = $3, updated_at = now()" in sql
+    assert "pg_notify(" in sql and (user_id, name) == (7, "Renamed")
+    assert "INSERT INTO panel_collection_versions" in sql
+    await versions.current(7, load)
+    assert load.await_count == 2
+    connection.fetchrow.return_value = None
+    assert await repository.update(model_id, PanelModelUpdate(name="x"), 7) is None
+    connection.statements["panel_delete"].fetchrow.return_value = None
+    assert await repository.delete(model_id, 7) is False
+    await versions.current(7, load)
+    assert load.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_import_releases_its_connection():
+    """A client that disconnects mid-import does not leak a pooled connection."""
+    transaction = Mock(start=AsyncMock(), commit=AsyncMock(), rollback=AsyncMock())
+    connection = _connection()
+    connection.transaction = Mock(return_value=transaction)
+    connection.copy_records_to_table = AsyncMock()
+    connection.execute = AsyncMock()
+    pool = Mock(acquire=AsyncMock(return_value=connection), release=AsyncMock())
+
+    async def records():
+        yield 1, _panel_row("A"), None
+        raise asyncio.CancelledError
+
+    service = PanelService(AsyncpgPanelRepository(pool))
+    with pytest.raises(asyncio.CancelledError):
+        await service.import_models(records(), user_id=7, atomic=True, chunk_size=1)
+
+    connection.copy_records_to_table.assert_awaited_once()
+    transaction.rollback.assert_awaited_once()
+    transaction.commit.assert_not_awaited()
+    pool.release.assert_awaited_once_with(connection)
+
+
+@pytest.mark.asyncio
+async def test_user_update_revokes_tokens_in_the_same_statement():
+    connection = _connection()
+    connection.fetchrow.return_value = {
+        "id": 3,
+        "email": "a@example.com",
+        "api_key": "new-key",
+        "is_active": True,
+        "is_admin": False,
+        "created_at": NOW,
+        "updated_at": NOW,
+        "notified": "",
+    }
+    users = AsyncpgUserRepository(_pool(connection))
+
+    user = await users.update(3, {"api_key": "new-key"})
+
+    assert user.api_key == "new-key"
+    sql, user_id, revoked_at, timestamp, api_key = connection.fetchrow.await_args.args
+    assert sql.startswith("WITH revocation AS (INSERT INTO token_revocations")
+    assert (user_id, api_key, timestamp) == (3, "new-key", revoked_at.timestamp())
+
+    with pytest.raises(ValueError):
+        await users.update(3, {"id": 4})
+
+
+@pytest.mark.asyncio
+async def test_backend_follows_the_asyncpg_pool_on_app_state():
+    db = Mock()
+    state = SimpleNamespace()
+    assert isinstance(select_panel_repository(state, db), PostgresPanelRepository)
+    assert not select_panel_repository(state, db).trigram_search
+    assert isinstance(select_user_repository(state, db), PostgresUserRepository)
+
+    pool = _pool(_connection())
+    state = SimpleNamespace(
+        asyncpg_pool=pool, user_repository=AsyncpgUserRepository(pool)
+    )
+    assert isinstance(select_panel_repository(state, db), AsyncpgPanelRepository)
+    state.pg_trgm = True
+    assert select_panel_repository(state, db).trigram_search
+    assert select_user_repository(state, db) is state.user_repository
+
+    user = UserInDB(
+        id=1, email="a@example.com", api_key="key", created_at=NOW, updated_at=NOW
+    )
+    users = Mock(get_by_api_key=AsyncMock(return_value=user))
+    db.execute = AsyncMock()
+    assert await AuthService(db, users=users).get_user_by_api_key("key") == user
+    db.execute.assert_not_awaited()
@@ -32,6 +32,17 @@ async def test_login_invalid_credentials(client: AsyncClient):
     assert response.json()["detail"] == "Incorrect email or password"
 
 
+@pytest.mark.asyncio
+async def test_login_wrong_password(client: AsyncClient, admin_user):
+    """A known email with the wrong password is rejected."""
+    response = await client.post(
+        "/auth/login",
+        params={"email": "admin@example.com", "password": "not-the-password"},
+    )
+    assert_error_response(response, status.HTTP_401_UNAUTHORIZED)
+    assert response.json()["detail"] == "Incorrect email or password"
+
+
 @pytest.mark.asyncio
 async def test_get_current_user(client: AsyncClient, admin_auth_header):
     """Test getting current user with valid token."""
@@ -0,0 +1,106 @@
+from datetime import datetime
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from src.solar_api.application.auth_cache import ApiKeyCache
+from src.solar_api.application.services.auth_service import AuthService
+from src.solar_api.application.services.user_service import UserService
+from src.solar_api.domain.user_models import UserInDB, UserUpdate
+
+
+def _user(user_id: int = 1, api_key: str = "key-1", is_admin: bool = False):
+    now = datetime(2024, 1, 1)
+    return UserInDB(
+        id=user_id,
+        email=f"user{user_id}@example.com",
+        api_key=api_key,
+        is_admin=is_admin,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def _db_returning(row):
+    result = Mock()
+    result.fetchone = Mock(return_value=row)
+    db = AsyncMock()
+    db.execute = AsyncMock(return_value=result)
+    return db
+
+
+def _cache(**overrides) -> ApiKeyCache:
+    options = dict(max_entries=10, ttl=60, negative_max_entries=2, negative_ttl=60)
+    options.update(overrides)
+    return ApiKeyCache(**options)
+
+
+@pytest.mark.asyncio
+async def test_known_and_unknown_keys_hit_the_database_once():
+    """Both valid users and unknown keys are served from memory after one query."""
+    user = _user()
+    cache = _cache()
+
+    db = _db_returning(user)
+    service = AuthService(db, cache)
+    assert (await service.get_user_by_api_key("key-1")).id == user.id
+    assert (await service.get_user_by_api_key("key-1")).id == user.id
+    assert db.execute.await_count == 1
+
+    db = _db_returning(None)
+    service = AuthService(db, cache)
+    assert await service.get_user_by_api_key("bogus") is None
+    assert await service.get_user_by_api_key("bogus") is None
+    assert db.execute.await_count == 1
+
+
+def test_negative_cache_is_bounded():
+    """Spraying random keys cannot grow the negative cache past its limit."""
+    cache = _cache(negative_max_entries=2)
+    for index in range(5):
+        cache.set(f"bogus-{index}", None)
+
+    assert len(cache.unknown) == 2
+    assert cache.get("bogus-0") == (False, None)
+    assert cache.get("bogus-4") == (True, None)
+
+
+def test_user_index_is_bounded_with_the_users_it_points_to():
+    """Authenticating many users does not grow the id -> key index past the cache."""
+    cache = _cache(max_entries=2)
+    cache.set("key-1", _user(1, "key-1"))
+    for user_id in range(2, 6):
+        cache.get("key-1")
+        cache.set(f"key-{user_id}", _user(user_id, f"key-{user_id}"))
+
+    assert len(cache.users) == len(cache._keys_by_user) == 2
+    cache.invalidate_user(1)
+    assert cache.get("key-1") == (False, None)
+    assert cache.get("key-5")[1].id == 5
+
+    cache.invalidate_key("key-5")
+    assert len(cache._keys_by_user) == 0
+
+
+@pytest.mark.asyncio
+async def test_rotation_update_and_delete_invalidate_cached_user():
+    """Every user mutation drops the user from the auth cache."""
+    admin = _user(user_id=99, api_key="admin-key", is_admin=True)
+    repository = AsyncMock()
+    repository.update = AsyncMock(return_value=_user())
+    repository.delete = AsyncMock(return_value=True)
+    cache = _cache()
+    service = UserService(repository, cache)
+
+    cache.set("key-1", _user())
+    new_key = await service.rotate_api_key(1, admin)
+    assert cache.get("key-1") == (False, None)
+    assert cache.get(new_key) == (False, None)
+
+    cache.set("key-1", _user())
+    await service.update_user(1, UserUpdate(is_active=False), admin)
+    assert cache.get("key-1") == (False, None)
+
+    cache.set("key-1", _user())
+    await service.delete_user(1, admin)
+    assert cache.get("key-1") == (False, None)
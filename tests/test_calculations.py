@@ -1,3 +1,6 @@
+import json
+from pathlib import Path
+
 import pytest
 from fastapi import status
 from httpx import AsyncClient
@@ -138,8 +141,9 @@ async def test_calculate_solar_production(
     args, _ = mock_instance.get_pv_data.call_args
     assert args[0].lat == request_data["lat"]
     assert args[0].lon == request_data["lon"]
-    assert args[0].peakpower == request_data["peakpower"]
-    assert args[0].loss == request_data["loss"]
+    # PVGIS is queried once per location with the normalized system
+    assert args[0].peakpower == 1
+    assert args[0].loss == 0
 
 
 @pytest.mark.parametrize("missing_field", ["lat", "lon", "peakpower", "loss"])
@@ -180,3 +184,203 @@ async def test_calculate_solar_production_invalid_coordinates(
 
     # Verify PVGIS client was called
     mock_pvgis_client.get_pv_data.assert_called()
+
+
+RAW_PVGIS_RESPONSE = {
+    "inputs": {
+        "location": {"latitude": -23.5505, "longitude": -46.6333, "elevation": 760},
+        "meteo_data": {"year_min": 2005, "year_max": 2020},
+        "mounting_system": {"fixed": {"slope": {"value": 22, "optimal": True}}},
+        "pv_module": {"technology": "c-Si", "peak_power": 5, "system_loss": 14},
+        "economic_data": {"system_cost": None, "interest": None, "lifetime": None},
+    },
+    "outputs": {
+        "monthly": SAMPLE_PVGIS_RESPONSE["outputs"]["monthly"],
+        "totals": SAMPLE_PVGIS_RESPONSE["outputs"]["totals"],
+    },
+}
+
+
+@pytest.mark.asyncio
+async def test_pvgis_adapter_reuses_injected_client():
+    """The adapter should send every request through the shared client."""
+    import httpx
+    from src.solar_api.adapters.pvgis.pvgis_adapter import PVGISAdapter
+    from src.solar_api.domain.models import PVGISRequest
+
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(200, json=RAW_PVGIS_RESPONSE)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        adapter = PVGISAdapter(client=client)
+        params = PVGISRequest(lat=-23.5505, lon=-46.6333, peakpower=5, loss=14)
+        first = await adapter.get_pv_data(params)
+        await adapter.get_pv_data(params)
+
+    assert len(seen) == 2
+    assert seen[0].url.params["peakpower"] == "5.0"
+    assert first["pv_module"]["peak_power"] == 5
+    assert first["meteo_data"] == {"year_min": 2005, "year_max": 2020}
+
+
+# Generated in the pvcalc format, not recorded from PVGIS
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "pvgis" / "synthetic"
+
+
+def _load_formatted_fixture(name: str) -> dict:
+    from src.solar_api.adapters.pvgis.pvgis_adapter import PVGISAdapter
+
+    raw = json.loads((FIXTURES_DIR / name).read_text())
+    return PVGISAdapter()._format_response(raw)
+
+
+@pytest.mark.parametrize("site", ["sao_paulo", "fortaleza"])
+@pytest.mark.parametrize(
+    "peakpower, loss, fixture", [(5, 14, "5kwp_14loss"), (12.5, 20, "12_5kwp_20loss")]
+)
+def test_rescaled_output_matches_synthetic_fixture(site, peakpower, loss, fixture):
+    """Rescaling a 1 kWp / 0% response matches a pvcalc fixture for that system.
+
+    The fixtures are synthetic and scale linearly by construction, so this
+    checks the rescaling arithmetic and rounding, not how PVGIS itself
+    behaves across peak power and loss.
+    """
+    from src.solar_api.application.services.solar_service import rescale_pv_data
+
+    base = _load_formatted_fixture(f"{site}_1kwp_0loss.json")
+    expected = _load_formatted_fixture(f"{site}_{fixture}.json")
+
+    result = rescale_pv_data(base, peakpower, loss)
+
+    assert result["pv_module"] == expected["pv_module"]
+    for actual, wanted in zip(
+        result["outputs"]["monthly"]["fixed"], expected["outputs"]["monthly"]["fixed"]
+    ):
+        for field in ("E_d", "E_m", "SD_m", "H(i)_d", "H(i)_m"):
+            assert actual[field] == pytest.approx(wanted[field], rel=5e-3, abs=0.02)
+
+    totals = result["outputs"]["totals"]["fixed"]
+    expected_totals = expected["outputs"]["totals"]["fixed"]
+    for field in ("E_d", "E_m", "E_y", "SD_m", "SD_y", "l_total"):
+        assert totals[field] == pytest.approx(
+            expected_totals[field], rel=5e-3, abs=0.02
+        )
+
+    assert base["pv_module"]["peak_power"] == 1
+
+
+@pytest.mark.asyncio
+async def test_solar_service_reuses_normalized_response():
+    """Different system sizes at one location share a single upstream call."""
+    from src.solar_api.application.cache import TTLCache
+    from src.solar_api.application.services.pvgis_cache_service import (
+        CachedPVGISService,
+        PVGISResultCache,
+    )
+    from src.solar_api.application.services.solar_service import SolarService
+    from src.solar_api.domain.models import PVGISRequest
+
+    inner = AsyncMock()
+    inner.get_pv_data = AsyncMock(
+        return_value=_load_formatted_fixture("sao_paulo_1kwp_0loss.json")
+    )
+    cache = PVGISResultCache(TTLCache(max_entries=10, ttl=60))
+    service = SolarService(CachedPVGISService(inner, cache))
+
+    small = await service.calculate_energy_production(
+        PVGISRequest(lat=-23.5505, lon=-46.6333, peakpower=2, loss=10)
+    )
+    large = await service.calculate_energy_production(
+        PVGISRequest(lat=-23.5505, lon=-46.6333, peakpower=8, loss=10)
+    )
+
+    inner.get_pv_data.assert_called_once()
+    assert small["pv_module"]["peak_power"] == 2
+    assert large["outputs"]["totals"]["fixed"]["E_y"] == pytest.approx(
+        4 * small["outputs"]["totals"]["fixed"]["E_y"], rel=1e-3
+    )
+
+
+@pytest.mark.asyncio
+async def test_calculate_batch_dedupes_and_keeps_input_order():
+    """Items are answered in order, with one fetch per location."""
+    import asyncio
+    from src.solar_api.application.services.solar_service import SolarService
+    from src.solar_api.domain.models import PVGISRequest
+
+    base = _load_formatted_fixture("sao_paulo_1kwp_0loss.json")
+    active = 0
+    peak = 0
+
+    async def get_pv_data(params):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0)
+        active -= 1
+        if params.lat == 0:
+            raise RuntimeError("PVGIS error")
+        return base
+
+    inner = AsyncMock()
+    inner.get_pv_data = AsyncMock(side_effect=get_pv_data)
+    inner.get_cached_pv_data = lambda params: base if params.lat == 10 else None
+
+    items = [
+        PVGISRequest(lat=-23.5505, lon=-46.6333, peakpower=2, loss=14),
+        PVGISRequest(lat=0, lon=0, peakpower=1, loss=14),
+        PVGISRequest(lat=-23.5505, lon=-46.6333, peakpower=4, loss=14),
+        PVGISRequest(lat=10, lon=10, peakpower=1, loss=0),
+    ] + [PVGISRequest(lat=i, lon=i, peakpower=1, loss=0) for i in range(20, 30)]
+
+    results = await SolarService(inner).calculate_batch(items, concurrency=3)
+
+    assert [r["index"] for r in results] == list(range(len(items)))
+    assert results[0]["status"] == "ok"
+    assert results[0]["result"]["pv_module"]["peak_power"] == 2
+    assert results[1] == {"index": 1, "status": "error", "detail": "PVGIS error"}
+    assert results[2]["result"]["outputs"]["totals"]["fixed"]["E_y"] == (
+        pytest.approx(
+            2 * results[0]["result"]["outputs"]["totals"]["fixed"]["E_y"], rel=1e-4
+        )
+    )
+    assert results[3]["status"] == "ok"
+    # Two repeated locations collapse and the cached site never goes upstream
+    assert inner.get_pv_data.call_count == 12
+    assert peak <= 3
+
+
+@pytest.mark.asyncio
+async def test_iter_batch_yields_results_as_they_complete():
+    """Streaming mode emits fast sites before slow ones, tagged by index."""
+    import asyncio
+    from src.solar_api.application.services.solar_service import SolarService
+    from src.solar_api.domain.models import PVGISRequest
+
+    base = _load_formatted_fixture("fortaleza_1kwp_0loss.json")
+    slow_site = asyncio.Event()
+
+    async def get_pv_data(params):
+        if params.lat == 1:
+            await slow_site.wait()
+        return base
+
+    inner = AsyncMock()
+    inner.get_pv_data = AsyncMock(side_effect=get_pv_data)
+    inner.get_cached_pv_data = lambda params: None
+
+    items = [
+        PVGISRequest(lat=1, lon=1, peakpower=1, loss=0),
+        PVGISRequest(lat=2, lon=2, peakpower=1, loss=0),
+    ]
+    stream = SolarService(inner).iter_batch(items, concurrency=2)
+
+    first = await stream.__anext__()
+    slow_site.set()
+    second = await stream.__anext__()
+
+    assert (first["index"], second["index"]) == (1, 0)
+    assert second["status"] == "ok"
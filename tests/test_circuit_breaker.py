@@ -0,0 +1,141 @@
+import asyncio
+
+import httpx
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from src.solar_api.adapters.pvgis.pvgis_adapter import PVGISAdapter
+from src.solar_api.application import metrics
+from src.solar_api.application.cache import TTLCache
+from src.solar_api.application.circuit_breaker import CircuitBreaker, CircuitOpenError
+from src.solar_api.application.ports.pvgis_service import (
+    PVGISCircuitOpenError,
+    PVGISUnavailableError,
+)
+from src.solar_api.application.services.circuit_breaker_pvgis_service import (
+    CircuitBreakerPVGISService,
+)
+from src.solar_api.application.services.pvgis_cache_service import (
+    CachedPVGISService,
+    PVGISResultCache,
+)
+from src.solar_api.domain.models import PVGISRequest
+
+SAMPLE_REQUEST = PVGISRequest(lat=-23.5505, lon=-46.6333, peakpower=1, loss=0)
+SAMPLE_RESULT = {"latitude": -23.5505, "outputs": {"totals": {"fixed": {"E_y": 1}}}}
+
+
+def test_breaker_opens_after_threshold_and_recovers_after_trial():
+    """Consecutive failures open the circuit; one successful trial closes it."""
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=30)
+    now = 1000.0
+
+    with patch(
+        "src.solar_api.application.circuit_breaker.time.monotonic",
+        side_effect=lambda: now,
+    ):
+        for _ in range(2):
+            breaker.before_call()
+            breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+
+        with pytest.raises(CircuitOpenError) as exc_info:
+            breaker.before_call()
+        assert exc_info.value.retry_after == pytest.approx(30)
+
+        now += 31
+        breaker.before_call()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+        breaker.before_call()
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast_without_calling_pvgis():
+    """Once open, the wrapped service is not called until the timeout elapses."""
+    inner = AsyncMock()
+    inner.get_pv_data = AsyncMock(side_effect=PVGISUnavailableError("down"))
+    service = CircuitBreakerPVGISService(
+        inner, CircuitBreaker(failure_threshold=1, recovery_timeout=30)
+    )
+
+    with pytest.raises(PVGISUnavailableError):
+        await service.get_pv_data(SAMPLE_REQUEST)
+    with pytest.raises(PVGISCircuitOpenError) as exc_info:
+        await service.get_pv_data(SAMPLE_REQUEST)
+
+    assert exc_info.value.retry_after > 0
+    inner.get_pv_data.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_stale_result_is_served_and_revalidated_during_outage():
+    """An expired entry is returned flagged as stale and refreshed in the background."""
+    metrics.reset()
+    key = SAMPLE_REQUEST.cache_key()
+    memory = TTLCache(max_entries=10, ttl=60, stale_ttl=3600)
+    cache = PVGISResultCache(memory)
+    memory.set(key, SAMPLE_RESULT, ttl=0)
+
+    inner = AsyncMock()
+    inner.get_pv_data = AsyncMock(
+        side_effect=[
+            PVGISCircuitOpenError("open", retry_after=0.01),
+            {**SAMPLE_RESULT, "latitude": 1.0},
+        ]
+    )
+    service = CachedPVGISService(inner, cache)
+
+    with patch(
+        "src.solar_api.application.services.pvgis_cache_service.REVALIDATION_MIN_DELAY",
+        0.01,
+    ):
+        result = await service.get_pv_data(SAMPLE_REQUEST)
+        assert result["stale"] is True
+        assert result["latitude"] == SAMPLE_RESULT["latitude"]
+        await asyncio.wait_for(
+            asyncio.gather(*cache._revalidations.values()), timeout=1
+        )
+
+    assert memory.get(key)["latitude"] == 1.0
+    assert metrics.get("pvgis_cache.stale_served") == 1
+    assert metrics.get("pvgis_cache.revalidated") == 1
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_outage_without_stale_result_is_raised():
+    """Without anything cached the unavailability error reaches the caller."""
+    cache = PVGISResultCache(TTLCache(max_entries=10, ttl=60, stale_ttl=3600))
+    inner = AsyncMock()
+    inner.get_pv_data = AsyncMock(side_effect=PVGISUnavailableError("down"))
+
+    with pytest.raises(PVGISUnavailableError):
+        await CachedPVGISService(inner, cache).get_pv_data(SAMPLE_REQUEST)
+    assert not cache.pending_revalidations()
+
+
+@pytest.mark.asyncio
+async def test_adapter_maps_server_and_transport_errors_to_unavailable():
+    """5xx responses and connection failures surface as PVGISUnavailableError."""
+
+    def server_error(request):
+        return httpx.Response(503, headers={"Retry-After": "12"})
+
+    def connect_error(request):
+        raise httpx.ConnectError("connection refused", request=request)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(server_error)) as client:
+        with pytest.raises(PVGISUnavailableError) as exc_info:
+            await PVGISAdapter(client=client).get_pv_data(SAMPLE_REQUEST)
+    assert exc_info.value.retry_after == 12
+
+    async with httpx.AsyncClient(
+        transport=httpx.MockTransport(connect_error)
+    ) as client:
+        with pytest.raises(PVGISUnavailableError):
+            await PVGISAdapter(client=client).get_pv_data(SAMPLE_REQUEST)
@@ -0,0 +1,98 @@
+import json
+from datetime import datetime
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from src.solar_api.adapters.notifications.postgres_invalidation import (
+    INVALIDATION_CHANNEL,
+    PostgresInvalidationListener,
+    publish_invalidation,
+)
+from src.solar_api.application.auth_cache import ApiKeyCache
+from src.solar_api.application.invalidation import (
+    ENTITY_PANEL,
+    ENTITY_USER,
+    InvalidationBus,
+)
+from src.solar_api.domain.user_models import UserInDB
+from tests.conftest import TestingSessionLocal
+
+
+def _session(dialect: str) -> Mock:
+    bind = Mock()
+    bind.dialect.name = dialect
+    session = Mock()
+    session.get_bind = Mock(return_value=bind)
+    session.execute = AsyncMock()
+    return session
+
+
+@pytest.mark.asyncio
+async def test_publish_sends_pg_notify_only_on_postgres():
+    """Writes queue a NOTIFY inside their transaction; other databases skip it."""
+    session = _session("postgresql")
+    await publish_invalidation(session, ENTITY_USER, id=7, api_key="new-key")
+
+    statement, params = session.execute.await_args.args
+    assert "pg_notify" in str(statement)
+    assert params["channel"] == INVALIDATION_CHANNEL
+    assert json.loads(params["payload"]) == {
+        "entity": "user",
+        "id": 7,
+        "api_key": "new-key",
+    }
+
+    async with TestingSessionLocal() as sqlite_session:
+        await publish_invalidation(sqlite_session, ENTITY_PANEL, id=1)
+
+
+def test_notifications_reach_subscribed_caches():
+    """A user event from another worker evicts that user's cached API key."""
+    now = datetime(2024, 1, 1)
+    cache = ApiKeyCache(
+        max_entries=10, ttl=60, negative_max_entries=10, negative_ttl=60
+    )
+    cache.set(
+        "key-1",
+        UserInDB(
+            id=1, email="a@example.com", api_key="key-1", created_at=now, updated_at=now
+        ),
+    )
+    cache.set("key-2", None)
+
+    bus = InvalidationBus()
+    bus.subscribe(ENTITY_USER, cache.handle_invalidation)
+    bus.subscribe(ENTITY_USER, Mock(side_effect=RuntimeError("broken handler")))
+    panel_handler = Mock()
+    bus.subscribe(ENTITY_PANEL, panel_handler)
+
+    listener = PostgresInvalidationListener("postgresql+asyncpg://db/solarview", bus)
+    assert listener.dsn == "postgresql://db/solarview"
+    listener._on_notification(
+        None, 1, INVALIDATION_CHANNEL, json.dumps({"entity": "user", "id": 1})
+    )
+    listener._on_notification(
+        None,
+        1,
+        INVALIDATION_CHANNEL,
+        json.dumps({"entity": "user", "api_key": "key-2"}),
+    )
+    listener._on_notification(None, 1, INVALIDATION_CHANNEL, "not json")
+
+    assert cache.get("key-1") == (False, None)
+    assert cache.get("key-2") == (False, None)
+    panel_handler.assert_not_called()
+
+
+def test_reset_clears_caches_after_missed_events():
+    """Reconnecting drops every cached entry since events may have been lost."""
+    cache = ApiKeyCache(
+        max_entries=10, ttl=60, negative_max_entries=10, negative_ttl=60
+    )
+    cache.set("unknown", None)
+    bus = InvalidationBus()
+    bus.on_reset(cache.clear)
+
+    bus.reset()
+    assert cache.get("unknown") == (False, None)
@@ -0,0 +1,144 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock
+
+from src.solar_api.adapters.pvgis.local_yield_adapter import (
+    Climatology,
+    LocalYieldAdapter,
+)
+from src.solar_api.adapters.pvgis.pvgis_adapter import format_pvcalc_response
+from src.solar_api.application.ports.pvgis_service import PVGISUnavailableError
+from src.solar_api.application.services.fallback_pvgis_service import (
+    FallbackPVGISService,
+)
+from src.solar_api.domain.models import PVGISRequest
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "pvgis" / "synthetic"
+
+# Mean daily GHI (kWh/m²/day) and air temperature (°C) close to São Paulo's
+GHI = np.array([5.5, 5.6, 4.9, 4.3, 3.6, 3.4, 3.6, 4.5, 4.6, 5.1, 5.5, 5.6])
+T2M = np.array([23, 23, 22, 20, 18, 17, 16, 18, 19, 20, 21, 22], dtype=float)
+
+
+def _climatology(lats, lons, ghi=GHI) -> Climatology:
+    shape = (len(lats), len(lons), 1)
+    return Climatology(
+        lat=lats,
+        lon=lons,
+        ghi=np.tile(ghi, shape),
+        t2m=np.tile(T2M, shape),
+        ghi_sd=np.tile(GHI * 0.05, shape),
+        year_min=2005,
+        year_max=2023,
+    )
+
+
+@pytest.fixture
+def engine() -> LocalYieldAdapter:
+    return LocalYieldAdapter(_climatology([-24.0, -23.0], [-47.0, -46.0]))
+
+
+def test_estimate_matches_pvgis_response_shape(engine):
+    """Local estimates can be consumed anywhere a formatted PVGIS result is."""
+    reference = format_pvcalc_response(
+        json.loads((FIXTURES_DIR / "sao_paulo_5kwp_14loss.json").read_text())
+    )
+    result = engine.estimate(
+        PVGISRequest(lat=-23.5505, lon=-46.6333, peakpower=5, loss=14)
+    )
+
+    assert set(result) - {"source"} == set(reference)
+    assert result["source"] == "local"
+    assert set(result["outputs"]["totals"]["fixed"]) == set(
+        reference["outputs"]["totals"]["fixed"]
+    )
+    assert [set(row) for row in result["outputs"]["monthly"]["fixed"]] == [
+        set(row) for row in reference["outputs"]["monthly"]["fixed"]
+    ]
+
+
+def test_estimate_scales_with_peakpower_and_loss(engine):
+    """Yield is linear in peak power and in the remaining share after losses."""
+    base = engine.estimate(PVGISRequest(lat=-23.5, lon=-46.6, peakpower=1, loss=0))
+    scaled = engine.estimate(PVGISRequest(lat=-23.5, lon=-46.6, peakpower=4, loss=20))
+
+    base_e_y = base["outputs"]["totals"]["fixed"]["E_y"]
+    assert scaled["outputs"]["totals"]["fixed"]["E_y"] == pytest.approx(
+        base_e_y * 4 * 0.8, rel=1e-4
+    )
+    assert (
+        scaled["outputs"]["totals"]["fixed"]["H(i)_y"]
+        == base["outputs"]["totals"]["fixed"]["H(i)_y"]
+    )
+
+
+@pytest.mark.parametrize(
+    "lat, azimuth, ghi", [(-30.0, 180.0, GHI), (40.0, 0.0, np.roll(GHI, 6))]
+)
+def test_optimal_plane_faces_the_equator(lat, azimuth, ghi):
+    """The chosen fixed plane points at the equator, tilted roughly by latitude."""
+    engine = LocalYieldAdapter(_climatology([lat], [0.0], ghi))
+    result = engine.estimate(PVGISRequest(lat=lat, lon=0, peakpower=1, loss=0))
+
+    mounting = result["mounting_system"]["fixed"]
+    assert mounting["azimuth"]["value"] == azimuth
+    assert abs(mounting["slope"]["value"] - abs(lat)) < 15
+
+
+@pytest.mark.asyncio
+async def test_locations_outside_coverage_are_unavailable(engine):
+    """Points beyond the climatology grid are refused rather than extrapolated."""
+    params = PVGISRequest(lat=48.85, lon=2.35, peakpower=1, loss=0)
+
+    assert engine.get_cached_pv_data(params) is None
+    with pytest.raises(PVGISUnavailableError):
+        await engine.get_pv_data(params)
+
+
+@pytest.mark.asyncio
+async def test_cells_without_data_are_unavailable():
+    """A cell PVGIS did not answer is refused instead of yielding zero."""
+    ghi = np.tile(GHI, (2, 2, 1))
+    ghi[0, 0] = np.nan
+    climatology = Climatology(
+        lat=[-24.0, -23.0], lon=[-47.0, -46.0], ghi=ghi, t2m=np.tile(T2M, (2, 2, 1))
+    )
+    engine = LocalYieldAdapter(climatology)
+    params = PVGISRequest(lat=-23.9, lon=-46.9, peakpower=1, loss=0)
+
+    assert not climatology.valid[0, 0] and climatology.valid[1, 1]
+    assert engine.get_cached_pv_data(params) is None
+    with pytest.raises(PVGISUnavailableError):
+        await engine.get_pv_data(params)
+    covered = params.model_copy(update={"lat": -23.1})
+    assert engine.estimate(covered)["source"] == "local"
+
+
+def test_climatology_round_trips_through_npz(tmp_path):
+    """A saved climatology loads back with every optional field."""
+    path = tmp_path / "climatology.npz"
+    _climatology([-24.0, -23.0], [-47.0]).save(path)
+
+    loaded = Climatology.load(path)
+    assert loaded.ghi.shape == (2, 1, 12)
+    np.testing.assert_allclose(loaded.ghi_sd, np.tile(GHI * 0.05, (2, 1, 1)))
+    assert (loaded.year_min, loaded.year_max) == (2005, 2023)
+    assert loaded.valid.shape == (2, 1) and loaded.valid.all()
+
+
+@pytest.mark.asyncio
+async def test_fallback_serves_local_estimate_when_pvgis_is_unavailable(engine):
+    """Only unavailability falls back; the local engine is not consulted otherwise."""
+    params = PVGISRequest(lat=-23.5, lon=-46.6, peakpower=1, loss=0)
+    primary = AsyncMock()
+    primary.get_pv_data = AsyncMock(side_effect=PVGISUnavailableError("down"))
+
+    result = await FallbackPVGISService(primary, engine).get_pv_data(params)
+    assert result["source"] == "local"
+
+    primary.get_pv_data = AsyncMock(return_value={"source": "pvgis"})
+    result = await FallbackPVGISService(primary, engine).get_pv_data(params)
+    assert result == {"source": "pvgis"}
@@ -1,6 +1,18 @@
+import json
+
 import pytest
+from unittest.mock import AsyncMock
 from fastapi import status
 from tests.test_utils import assert_response_status, assert_error_response
+from src.solar_api import config
+from src.solar_api.adapters.repositories.postgres_panel_repository import (
+    PostgresPanelRepository,
+)
+from src.solar_api.application.collection_versions import (
+    CollectionVersions,
+    etag_matches,
+)
+from src.solar_api.main import app
 
 SAMPLE_PANEL = {
     "name": "Test Panel",
@@ -210,3 +222,416 @@ async def test_search_panels(client, admin_auth_header):
     assert all(
         r["manufacturer"] == "SolarTech" and r["efficiency"] >= 19.5 for r in results
     )
+
+
+@pytest.mark.asyncio
+async def test_list_panels_keyset_pagination(client, admin_auth_header):
+    for i in range(5):
+        panel = {**SAMPLE_PANEL, "name": f"Page Panel {i}", "capacity": 0.1 * (i + 1)}
+        await client.post("/api/panel-models/", headers=admin_auth_header, json=panel)
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2, "sort_by": "capacity", "descending": True}
+        if cursor:
+            params["cursor"] = cursor
+        response = await client.get(
+            "/api/panel-models/", headers=admin_auth_header, params=params
+        )
+        assert_response_status(response, status.HTTP_200_OK)
+        page = response.json()
+        assert len(page) <= 2
+        seen.extend(page)
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    capacities = [panel["capacity"] for panel in seen]
+    assert len(seen) == 5
+    assert capacities == sorted(capacities, reverse=True)
+    assert len({panel["id"] for panel in seen}) == 5
+
+
+@pytest.mark.asyncio
+async def test_list_panels_rejects_mismatched_cursor(client, admin_auth_header):
+    for i in range(2):
+        panel = {**SAMPLE_PANEL, "name": f"Cursor Panel {i}"}
+        await client.post("/api/panel-models/", headers=admin_auth_header, json=panel)
+
+    response = await client.get(
+        "/api/panel-models/", headers=admin_auth_header, params={"limit": 1}
+    )
+    cursor = response.headers["X-Next-Cursor"]
+
+    response = await client.get(
+        "/api/panel-models/",
+        headers=admin_auth_header,
+        params={"limit": 1, "cursor": cursor, "sort_by": "efficiency"},
+    )
+    assert_error_response(response, status.HTTP_400_BAD_REQUEST)
+
+    response = await client.get(
+        "/api/panel-models/",
+        headers=admin_auth_header,
+        params={"cursor": "not-a-cursor"},
+    )
+    assert_error_response(response, status.HTTP_400_BAD_REQUEST)
+
+
+@pytest.mark.asyncio
+async def test_search_panels_ranks_matches(client, admin_auth_header):
+    panels = [
+        {**SAMPLE_PANEL, "name": "Tiger Neo 580W", "manufacturer": "Jinko Solar"},
+        {**SAMPLE_PANEL, "name": "Jinko Cheetah", "manufacturer": "Jinko Solar"},
+        {**SAMPLE_PANEL, "name": "Hi-MO 6", "manufacturer": "LONGi"},
+    ]
+    for panel in panels:
+        await client.post("/api/panel-models/", headers=admin_auth_header, json=panel)
+
+    response = await client.get(
+        "/api/panel-models/", headers=admin_auth_header, params={"q": "jinko"}
+    )
+    assert_response_status(response, status.HTTP_200_OK)
+    names = [panel["name"] for panel in response.json()]
+    # A name match outranks a manufacturer-only match
+    assert names == ["Jinko Cheetah", "Tiger Neo 580W"]
+
+    response = await client.get(
+        "/api/panel-models/",
+        headers=admin_auth_header,
+        params={"q": "jinko", "limit": 1},
+    )
+    cursor = response.headers["X-Next-Cursor"]
+    response = await client.get(
+        "/api/panel-models/",
+        headers=admin_auth_header,
+        params={"q": "jinko", "limit": 1, "cursor": cursor},
+    )
+    assert [panel["name"] for panel in response.json()] == ["Tiger Neo 580W"]
+
+    response = await client.get(
+        "/api/panel-models/",
+        headers=admin_auth_header,
+        params={"q": "longi", "limit": 1, "cursor": cursor},
+    )
+    assert_error_response(response, status.HTTP_400_BAD_REQUEST)
+
+
+@pytest.mark.asyncio
+async def test_relevance_sort_requires_query(client, admin_auth_header):
+    response = await client.get(
+        "/api/panel-models/",
+        headers=admin_auth_header,
+        params={"sort_by": "relevance"},
+    )
+    assert_error_response(response, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+
+IMPORT_CSV = (
+    "name,capacity,efficiency,manufacturer,type\n"
+    'Import A,0.4,20.5,"Solar, Inc.",Monocristalino\n'
+    "Import B,-1,20.5,SolarTech,Monocristalino\n"
+    "Import C,0.45,21,SolarTech,Policristalino\n"
+    "Import D,0.5\n"
+)
+
+
+@pytest.mark.asyncio
+async def test_import_panels_csv_reports_row_errors(client, admin_auth_header):
+    response = await client.post(
+        "/api/panel-models/import",
+        headers={**admin_auth_header, "Content-Type": "text/csv"},
+        content=IMPORT_CSV.encode(),
+    )
+    assert_response_status(response, status.HTTP_200_OK)
+    report = response.json()
+    assert report["total_rows"] == 4
+    assert report["imported"] == 2
+    assert report["failed"] == 2
+    assert report["committed"] is True
+    assert [error["row"] for error in report["errors"]] == [2, 4]
+    assert report["errors"][0]["errors"][0].startswith("capacity")
+
+    response = await client.get("/api/panel-models/", headers=admin_auth_header)
+    names = {panel["name"]: panel for panel in response.json()}
+    assert set(names) == {"Import A", "Import C"}
+    assert names["Import A"]["manufacturer"] == "Solar, Inc."
+
+
+@pytest.mark.asyncio
+async def test_import_panels_atomic_rolls_back_on_any_error(client, admin_auth_header):
+    response = await client.post(
+        "/api/panel-models/import",
+        params={"atomic": True},
+        headers={**admin_auth_header, "Content-Type": "text/csv"},
+        content=IMPORT_CSV.encode(),
+    )
+    assert_response_status(response, status.HTTP_200_OK)
+    report = response.json()
+    assert report["imported"] == 0
+    assert report["committed"] is False
+
+    response = await client.get("/api/panel-models/", headers=admin_auth_header)
+    assert response.json() == []
+
+
+@pytest.mark.asyncio
+async def test_import_panels_ndjson_streamed(client, admin_auth_header):
+    async def body():
+        for i in range(3):
+            line = json.dumps({**SAMPLE_PANEL, "name": f"Streamed {i}"}) + "\n"
+            # Split every line across two chunks
+            yield line[:10].encode()
+            yield line[10:].encode()
+        yield b"not json\n"
+
+    response = await client.post(
+        "/api/panel-models/import",
+        params={"atomic": False},
+        headers={**admin_auth_header, "Content-Type": "application/x-ndjson"},
+        content=body(),
+    )
+    assert_response_status(response, status.HTTP_200_OK)
+    report = response.json()
+    assert (report["imported"], report["failed"]) == (3, 1)
+    assert report["errors"][0]["row"] == 4
+
+
+@pytest.mark.asyncio
+async def test_import_panels_rejects_unknown_format(client, admin_auth_header):
+    response = await client.post(
+        "/api/panel-models/import",
+        headers={**admin_auth_header, "Content-Type": "application/json"},
+        content=b"[]",
+    )
+    assert_error_response(response, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+
+
+@pytest.mark.asyncio
+async def test_export_panels_streams_all_rows(
+    client, admin_auth_header, user_auth_header, monkeypatch
+):
+    monkeypatch.setattr(config, "PANEL_EXPORT_BATCH_SIZE", 2)
+    for i in range(5):
+        await client.post(
+            "/api/panel-models/",
+            json={**SAMPLE_PANEL, "name": f"Export {i}"},
+            headers=admin_auth_header,
+        )
+    await client.post("/api/panel-models/", json=SAMPLE_PANEL, headers=user_auth_header)
+
+    response = await client.get(
+        "/api/panel-models/export", params={"format": "csv"}, headers=admin_auth_header
+    )
+    assert_response_status(response, status.HTTP_200_OK)
+    assert response.headers["content-type"].startswith("text/csv")
+    lines = response.text.splitlines()
+    assert lines[0] == "id,name,capacity,efficiency,manufacturer,type,created_at,updated_at"
+    assert sorted(line.split(",")[1] for line in lines[1:]) == [
+        f"Export {i}" for i in range(5)
+    ]
+
+    response = await client.get(
+        "/api/panel-models/export",
+        params={"format": "ndjson"},
+        headers=admin_auth_header,
+    )
+    assert_response_status(response, status.HTTP_200_OK)
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == 5
+    assert rows[0]["capacity"] == SAMPLE_PANEL["capacity"]
+    assert rows == sorted(rows, key=lambda row: row["id"])
+
+
+@pytest.fixture
+def panel_versions(monkeypatch):
+    versions = CollectionVersions(max_entries=100, ttl=60)
+    monkeypatch.setattr(app.state, "panel_versions", versions, raising=False)
+    return versions
+
+
+@pytest.mark.asyncio
+async def test_list_etag_answers_304_until_a_write(
+    client, admin_auth_header, panel_versions, monkeypatch
+):
+    await client.post("/api/panel-models/", json=SAMPLE_PANEL, headers=admin_auth_header)
+    response = await client.get("/api/panel-models/", headers=admin_auth_header)
+    assert_response_status(response, status.HTTP_200_OK)
+    etag = response.headers["ETag"]
+
+    async def fail_list(*args, **kwargs):
+        raise AssertionError("list query should not run")
+
+    with monkeypatch.context() as patched:
+        patched.setattr(PostgresPanelRepository, "list_page", fail_list)
+        response = await client.get(
+            "/api/panel-models/",
+            headers={**admin_auth_header, "If-None-Match": etag},
+        )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+    # Other filters are a different representation
+    response = await client.get(
+        "/api/panel-models/",
+        params={"sort_by": "capacity"},
+        headers={**admin_auth_header, "If-None-Match": etag},
+    )
+    assert_response_status(response, status.HTTP_200_OK)
+
+    await client.post(
+        "/api/panel-models/",
+        json={**SAMPLE_PANEL, "name": "Another"},
+        headers=admin_auth_header,
+    )
+    response = await client.get(
+        "/api/panel-models/", headers={**admin_auth_header, "If-None-Match": etag}
+    )
+    assert_response_status(response, status.HTTP_200_OK)
+    assert response.headers["ETag"] != etag
+    assert len(response.json()) == 2
+
+
+@pytest.mark.asyncio
+async def test_list_etag_changes_on_update_and_delete_within_the_same_second(
+    client, admin_auth_header, panel_versions
+):
+    """Polls after a write never get a 304, even where no NOTIFY arrives."""
+    response = await client.post(
+        "/api/panel-models/", json=SAMPLE_PANEL, headers=admin_auth_header
+    )
+    model_id = response.json()["id"]
+    response = await client.get("/api/panel-models/", headers=admin_auth_header)
+    etag = response.headers["ETag"]
+
+    for write in (
+        lambda: client.put(
+            f"/api/panel-models/{model_id}",
+            json={"name": "Renamed"},
+            headers=admin_auth_header,
+        ),
+        lambda: client.delete(
+            f"/api/panel-models/{model_id}", headers=admin_auth_header
+        ),
+    ):
+        assert (await write()).status_code < 300
+        # As on a worker that did not see the write
+        panel_versions.reset()
+        response = await client.get(
+            "/api/panel-models/", headers={**admin_auth_header, "If-None-Match": etag}
+        )
+        assert_response_status(response, status.HTTP_200_OK)
+        assert response.headers["ETag"] != etag
+        etag = response.headers["ETag"]
+
+
+@pytest.mark.asyncio
+async def test_list_etag_state_is_cached_until_notified_write_or_reset(
+    panel_versions,
+):
+    load = AsyncMock(return_value="1.3")
+    etag = await panel_versions.current(1, load)
+    assert await panel_versions.current(1, load) == etag
+    assert await panel_versions.current(1, load, variant="limit=1") != etag
+    assert load.await_count == 1
+
+    panel_versions.handle_invalidation({"entity": "panel", "id": "x", "user_id": 1})
+    load.return_value = "1.4"
+    assert await panel_versions.current(1, load) != etag
+    assert load.await_count == 2
+
+    panel_versions.reset()
+    await panel_versions.current(1, load)
+    assert load.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_list_etag_matches_across_workers(
+    client, admin_user, admin_auth_header, monkeypatch
+):
+    """A tag from one worker is answered with 304 by another, or after a restart."""
+    await client.post("/api/panel-models/", json=SAMPLE_PANEL, headers=admin_auth_header)
+    worker_a = CollectionVersions(max_entries=100, ttl=60)
+    worker_b = CollectionVersions(max_entries=100, ttl=60)
+
+    monkeypatch.setattr(app.state, "panel_versions", worker_a, raising=False)
+    response = await client.get("/api/panel-models/", headers=admin_auth_header)
+    etag = response.headers["ETag"]
+
+    monkeypatch.setattr(app.state, "panel_versions", worker_b, raising=False)
+    response = await client.get(
+        "/api/panel-models/", headers={**admin_auth_header, "If-None-Match": etag}
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    # A write on worker B reaches worker A as a NOTIFY; both then agree again
+    await client.post(
+        "/api/panel-models/",
+        json={**SAMPLE_PANEL, "name": "Another"},
+        headers=admin_auth_header,
+    )
+    response = await client.get("/api/panel-models/", headers=admin_auth_header)
+    new_etag = response.headers["ETag"]
+    assert new_etag != etag
+
+    worker_a.handle_invalidation({"entity": "panel", "user_id": admin_user.id})
+    monkeypatch.setattr(app.state, "panel_versions", worker_a, raising=False)
+    response = await client.get(
+        "/api/panel-models/", headers={**admin_auth_header, "If-None-Match": etag}
+    )
+    assert_response_status(response, status.HTTP_200_OK)
+    assert response.headers["ETag"] == new_etag
+
+
+def test_etag_matches_lists_weak_tags_and_wildcard():
+    assert etag_matches('"a", W/"b"', '"b"')
+    assert etag_matches("*", '"b"')
+    assert not etag_matches('"a"', '"b"')
+    assert not etag_matches(None, '"b"')
+
+
+@pytest.mark.asyncio
+async def test_item_etag_follows_updated_at(client, admin_auth_header):
+    response = await client.post(
+        "/api/panel-models/", json=SAMPLE_PANEL, headers=admin_auth_header
+    )
+    panel = response.json()
+    url = f"/api/panel-models/{panel['id']}"
+
+    response = await client.get(url, headers=admin_auth_header)
+    assert_response_status(response, status.HTTP_200_OK)
+    etag = response.headers["ETag"]
+    assert panel["id"] in etag
+
+    response = await client.get(
+        url, headers={**admin_auth_header, "If-None-Match": etag}
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+@pytest.mark.asyncio
+async def test_panel_responses_are_serialized_from_rows(client, admin_auth_header):
+    response = await client.post(
+        "/api/panel-models/",
+        json={**SAMPLE_PANEL, "name": "Painel Solar Três"},
+        headers=admin_auth_header,
+    )
+    assert_response_status(response, status.HTTP_201_CREATED)
+    created = response.json()
+
+    response = await client.get("/api/panel-models/", headers=admin_auth_header)
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == [created]
+    assert set(created) == {
+        "id",
+        "name",
+        "capacity",
+        "efficiency",
+        "manufacturer",
+        "type",
+        "created_at",
+        "updated_at",
+    }
+    assert created["name"] == "Painel Solar Três"
@@ -0,0 +1,114 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from passlib.context import CryptContext
+
+from src.solar_api.application import metrics
+from src.solar_api.application.password_hasher import (
+    PasswordHasher,
+    build_context,
+    calibrate_bcrypt_rounds,
+)
+
+# Cheapest bcrypt cost, so the tests stay fast
+FAST_CONTEXT = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4)
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_round_trip():
+    """Hashes produced off the loop verify with the same context."""
+    hasher = PasswordHasher(FAST_CONTEXT, concurrency=2)
+    try:
+        hashed = await hasher.hash("SecurePassword123")
+        assert await hasher.verify("SecurePassword123", hashed)
+        assert not await hasher.verify("WrongPassword123", hashed)
+    finally:
+        hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_hashing_is_capped_and_does_not_block_the_loop():
+    """Slow hashes run in worker threads; excess callers queue and are measured."""
+    metrics.reset()
+    running, peak = 0, 0
+    lock = threading.Lock()
+
+    class SlowContext:
+        def hash(self, password):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.05)
+            with lock:
+                running -= 1
+            return password[::-1]
+
+    hasher = PasswordHasher(SlowContext(), concurrency=2, name="test_hasher")
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.005)
+
+    ticking = asyncio.create_task(ticker())
+    try:
+        results = await asyncio.gather(*(hasher.hash(f"pw{i}") for i in range(6)))
+    finally:
+        ticking.cancel()
+        hasher.shutdown()
+
+    assert results == [f"pw{i}"[::-1] for i in range(6)]
+    assert peak == 2
+    assert ticks >= 10
+    assert metrics.get("test_hasher.queue_seconds.count") == 6
+    assert metrics.get("test_hasher.queue_seconds.max") >= 0.05
+
+
+def test_calibration_picks_highest_cost_within_budget():
+    """Each extra round doubles the measured time until the budget is exceeded."""
+    ticks = iter([0.0, 0.05])
+    rounds = calibrate_bcrypt_rounds(
+        target_seconds=0.25, min_rounds=4, max_rounds=15, timer=lambda: next(ticks)
+    )
+    # 0.05s at cost 4 -> 0.1s at 5 -> 0.2s at 6 -> 0.4s at 7 is over budget
+    assert rounds == 6
+
+
+@pytest.mark.asyncio
+async def test_outdated_and_plaintext_hashes_are_upgraded_on_verify():
+    """Hashes below the configured cost, or stored in plain text, get a new hash."""
+    hasher = PasswordHasher(build_context(5), concurrency=1)
+    try:
+        weak = FAST_CONTEXT.hash("SecurePassword123")
+        verified, new_hash = await hasher.verify_and_update("SecurePassword123", weak)
+        assert verified and new_hash is not None
+        assert not hasher.context.needs_update(new_hash)
+
+        verified, new_hash = await hasher.verify_and_update(
+            "SecurePassword123", "SecurePassword123"
+        )
+        assert verified and hasher.context.identify(new_hash) == "bcrypt"
+        assert await hasher.verify_and_update("wrong", "SecurePassword123") == (
+            False,
+            None,
+        )
+
+        current = await hasher.hash("SecurePassword123")
+        assert await hasher.verify_and_update("SecurePassword123", current) == (
+            True,
+            None,
+        )
+
+        # A host calibrated to a higher cost must not be downgraded here
+        stronger = build_context(6).hash("SecurePassword123")
+        assert await hasher.verify_and_update("SecurePassword123", stronger) == (
+            True,
+            None,
+        )
+    finally:
+        hasher.shutdown()
@@ -0,0 +1,116 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from src.solar_api.application import metrics
+from src.solar_api.application.cache import TTLCache
+from src.solar_api.application.services.pvgis_cache_service import (
+    CachedPVGISService,
+    PVGISResultCache,
+)
+from src.solar_api.adapters.repositories.postgres_pvgis_result_repository import (
+    PostgresPVGISResultRepository,
+)
+from src.solar_api.domain.models import PVGISRequest
+from tests.conftest import TestingSessionLocal
+
+SAMPLE_REQUEST = PVGISRequest(lat=-23.5505, lon=-46.6333, peakpower=5, loss=14)
+SAMPLE_RESULT = {"latitude": -23.5505, "outputs": {"totals": {"fixed": {"E_y": 1}}}}
+
+
+class InMemoryStore:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key, allow_stale=False):
+        return self.data.get(key)
+
+    async def set(self, key, params, result):
+        self.data[key] = result
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    """The oldest untouched entry is evicted once the cache is full."""
+    metrics.reset()
+    cache = TTLCache(max_entries=2, ttl=60, name="test_cache")
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert cache.get("c") == 3
+    assert metrics.get("test_cache.evictions") == 1
+    assert metrics.get("test_cache.hits") == 2
+
+
+def test_ttl_cache_expires_entries():
+    """Entries are not served past their TTL."""
+    cache = TTLCache(max_entries=2, ttl=60)
+    with patch("src.solar_api.application.cache.time.monotonic", return_value=0):
+        cache.set("a", 1)
+    with patch("src.solar_api.application.cache.time.monotonic", return_value=61):
+        assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_cached_service_serves_repeated_requests_from_memory():
+    """Identical requests only reach PVGIS once."""
+    inner = AsyncMock()
+    inner.get_pv_data = AsyncMock(return_value=SAMPLE_RESULT)
+    cache = PVGISResultCache(TTLCache(max_entries=10, ttl=60))
+
+    service = CachedPVGISService(inner, cache)
+    assert await service.get_pv_data(SAMPLE_REQUEST) == SAMPLE_RESULT
+    assert await service.get_pv_data(SAMPLE_REQUEST) == SAMPLE_RESULT
+
+    inner.get_pv_data.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_cached_service_falls_back_to_store():
+    """A cold memory tier is refilled from the persistent store."""
+    inner = AsyncMock()
+    inner.get_pv_data = AsyncMock(return_value=SAMPLE_RESULT)
+    store = InMemoryStore()
+    store.data[SAMPLE_REQUEST.cache_key()] = SAMPLE_RESULT
+    memory = TTLCache(max_entries=10, ttl=60)
+
+    service = CachedPVGISService(inner, PVGISResultCache(memory, store))
+    assert await service.get_pv_data(SAMPLE_REQUEST) == SAMPLE_RESULT
+
+    inner.get_pv_data.assert_not_called()
+    assert SAMPLE_REQUEST.cache_key() in memory
+
+
+@pytest.mark.asyncio
+async def test_cached_service_bypass_refreshes_cache():
+    """Cache-Control: no-cache skips the lookup but stores the fresh result."""
+    inner = AsyncMock()
+    inner.get_pv_data = AsyncMock(return_value=SAMPLE_RESULT)
+    store = InMemoryStore()
+    store.data[SAMPLE_REQUEST.cache_key()] = {"stale": True}
+    cache = PVGISResultCache(TTLCache(max_entries=10, ttl=60), store)
+
+    service = CachedPVGISService(inner, cache, bypass=True)
+    assert await service.get_pv_data(SAMPLE_REQUEST) == SAMPLE_RESULT
+
+    inner.get_pv_data.assert_called_once()
+    assert store.data[SAMPLE_REQUEST.cache_key()] == SAMPLE_RESULT
+
+
+@pytest.mark.asyncio
+async def test_postgres_result_repository_round_trip():
+    """Results written to pvgis_results can be read back until they expire."""
+    repository = PostgresPVGISResultRepository(TestingSessionLocal, ttl=60)
+    key = SAMPLE_REQUEST.cache_key()
+
+    assert await repository.get(key) is None
+    await repository.set(key, SAMPLE_REQUEST, SAMPLE_RESULT)
+    await repository.set(key, SAMPLE_REQUEST, SAMPLE_RESULT)
+    assert await repository.get(key) == SAMPLE_RESULT
+
+    expired = PostgresPVGISResultRepository(TestingSessionLocal, ttl=-1)
+    await expired.set(key, SAMPLE_REQUEST, SAMPLE_RESULT)
+    assert await repository.get(key) is None
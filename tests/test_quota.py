@@ -0,0 +1,227 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+
+from src.solar_api.adapters.repositories.postgres_usage_repository import (
+    PostgresUsageRepository,
+)
+from src.solar_api.application.ports.usage_store import UsageStorePort
+from src.solar_api.application.quota import (
+    QuotaCostTooLarge,
+    UsageRecorder,
+    UserRateLimiter,
+)
+from src.solar_api.application.rate_limiter import RateLimitExceeded
+from src.solar_api.application.services.quota_service import (
+    QuotaService,
+    SCOPE_CALCULATE,
+    SCOPE_PANELS,
+)
+from src.solar_api.main import app
+from tests.conftest import TestingSessionLocal
+from tests.test_utils import assert_response_status, assert_error_response
+
+
+class InMemoryUsageStore(UsageStorePort):
+    def __init__(self, fail: bool = False):
+        self.rows = {}
+        self.batches = 0
+        self.fail = fail
+
+    async def add_counts(self, counts):
+        if self.fail:
+            raise ConnectionError("database is down")
+        self.batches += 1
+        for key, count in counts.items():
+            self.rows[key] = self.rows.get(key, 0) + count
+
+    async def get_counts(self, user_id, since):
+        return [
+            (day, scope, count)
+            for (uid, day, scope), count in self.rows.items()
+            if uid == user_id and day >= since
+        ]
+
+
+def _today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def test_limiter_rejects_after_burst_with_retry_after():
+    limiter = UserRateLimiter(rate=1, burst=2)
+    limiter.check(1)
+    limiter.check(1)
+
+    with pytest.raises(RateLimitExceeded) as exc_info:
+        limiter.check(1)
+    assert 0 < exc_info.value.retry_after <= 1
+
+    # Other users have their own bucket
+    limiter.check(2)
+
+
+def test_limiter_rejects_cost_above_burst_and_bounds_users():
+    """A large batch is refused outright, not charged at the burst."""
+    limiter = UserRateLimiter(rate=1, burst=5, max_users=2)
+    with pytest.raises(QuotaCostTooLarge) as exc_info:
+        limiter.check(1, cost=50)
+    assert exc_info.value.limit == 5
+    limiter.check(1, cost=5)
+    with pytest.raises(RateLimitExceeded):
+        limiter.check(1)
+
+    limiter.check(2)
+    limiter.check(3)
+    assert len(limiter._buckets) == 2
+
+
+@pytest.mark.asyncio
+async def test_recorder_writes_counts_behind_in_one_batch():
+    store = InMemoryUsageStore()
+    recorder = UsageRecorder(store, flush_interval=60)
+    for _ in range(5):
+        recorder.record(1, "calculate")
+    recorder.record(1, "panels", count=3)
+    recorder.record(2, "calculate")
+    assert store.batches == 0
+
+    await recorder.flush()
+
+    assert store.batches == 1
+    assert store.rows[(1, _today(), "calculate")] == 5
+    assert store.rows[(1, _today(), "panels")] == 3
+    assert recorder.pending() == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_counts_and_usage_includes_pending():
+    store = InMemoryUsageStore(fail=True)
+    recorder = UsageRecorder(store, flush_interval=60)
+    recorder.record(1, "calculate", count=2)
+
+    with pytest.raises(ConnectionError):
+        await recorder.flush()
+    recorder.record(1, "calculate")
+
+    assert await recorder.usage(1, _today()) == [(_today(), "calculate", 3)]
+
+    store.fail = False
+    await recorder.flush()
+    assert store.rows == {(1, _today(), "calculate"): 3}
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_bounded_chunks_and_caps_the_backlog():
+    """Many users flush in several statements; a failure re-queues only the rest."""
+    store = InMemoryUsageStore()
+    recorder = UsageRecorder(store, flush_interval=60, chunk_size=2, max_pending=3)
+    for user_id in range(5):
+        recorder.record(user_id, "calculate")
+
+    await recorder.flush()
+    assert store.batches == 3
+    assert len(store.rows) == 5
+
+    # The first chunk is written, then the store goes down
+    yesterday = _today() - timedelta(days=1)
+    for user_id in range(5):
+        recorder.record(user_id, "panels")
+    recorder._pending[(8, yesterday, "calculate")] = 1
+    recorder._pending[(9, yesterday, "calculate")] = 1
+    add_counts = store.add_counts
+
+    async def fail_after_first(counts):
+        store.fail = store.batches > 3
+        await add_counts(counts)
+
+    store.add_counts = fail_after_first
+    with pytest.raises(ConnectionError):
+        await recorder.flush()
+
+    # Only the five unwritten rows are kept, then trimmed to max_pending by
+    # dropping yesterday's counters first
+    assert store.rows[(0, _today(), "panels")] == 1
+    assert recorder.pending() == 3
+    assert all(day == _today() for _, day, _ in recorder._pending)
+
+
+@pytest.mark.asyncio
+async def test_usage_repository_upserts_counts():
+    store = PostgresUsageRepository(TestingSessionLocal)
+    yesterday = _today() - timedelta(days=1)
+    await store.add_counts({(99, yesterday, "calculate"): 2})
+    await store.add_counts(
+        {(99, yesterday, "calculate"): 3, (99, _today(), "panels"): 1}
+    )
+
+    assert await store.get_counts(99, yesterday) == [
+        (yesterday, "calculate", 5),
+        (_today(), "panels", 1),
+    ]
+    assert await store.get_counts(99, _today()) == [(_today(), "panels", 1)]
+
+
+@pytest.mark.asyncio
+async def test_panel_endpoints_return_429_with_retry_after(
+    client: AsyncClient, user_auth_header, monkeypatch
+):
+    quota = QuotaService({SCOPE_PANELS: UserRateLimiter(rate=0.5, burst=2)})
+    monkeypatch.setattr(app.state, "quota", quota, raising=False)
+
+    for _ in range(2):
+        response = await client.get("/api/panel-models/", headers=user_auth_header)
+        assert_response_status(response, status.HTTP_200_OK)
+
+    response = await client.get("/api/panel-models/", headers=user_auth_header)
+    assert_error_response(response, status.HTTP_429_TOO_MANY_REQUESTS)
+    assert response.headers["Retry-After"] == "2"
+
+
+@pytest.mark.asyncio
+async def test_batch_larger_than_burst_is_refused_not_discounted(
+    client: AsyncClient, regular_user, user_auth_header, monkeypatch
+):
+    limiter = UserRateLimiter(rate=0.01, burst=3)
+    quota = QuotaService({SCOPE_CALCULATE: limiter})
+    monkeypatch.setattr(app.state, "quota", quota, raising=False)
+    item = {"lat": -23.5, "lon": -46.6, "peakpower": 1, "loss": 14}
+
+    response = await client.post(
+        "/calculate/batch", json={"items": [item] * 4}, headers=user_auth_header
+    )
+    assert_error_response(response, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+    assert "at most 3 items" in response.json()["detail"]
+
+    # Nothing was charged for the refused batch
+    limiter.check(regular_user.id, cost=3)
+
+
+@pytest.mark.asyncio
+async def test_usage_view(
+    client: AsyncClient, regular_user, user_auth_header, admin_user, monkeypatch
+):
+    recorder = UsageRecorder(InMemoryUsageStore(), flush_interval=60)
+    quota = QuotaService({}, recorder)
+    monkeypatch.setattr(app.state, "quota", quota, raising=False)
+    monkeypatch.setattr(app.state, "usage_recorder", recorder, raising=False)
+
+    await client.get("/api/panel-models/", headers=user_auth_header)
+    await recorder.flush()
+    await client.get("/api/panel-models/", headers=user_auth_header)
+
+    response = await client.get(
+        f"/users/{regular_user.id}/usage", headers=user_auth_header
+    )
+    assert_response_status(response, status.HTTP_200_OK)
+    data = response.json()
+    assert data["user_id"] == regular_user.id
+    assert data["usage"] == [
+        {"day": _today().isoformat(), "scope": "panels", "requests": 2}
+    ]
+
+    response = await client.get(
+        f"/users/{admin_user.id}/usage", headers=user_auth_header
+    )
+    assert_error_response(response, status.HTTP_403_FORBIDDEN)
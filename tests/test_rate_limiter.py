@@ -0,0 +1,99 @@
+import asyncio
+
+import httpx
+import pytest
+from unittest.mock import AsyncMock
+
+from src.solar_api.adapters.pvgis.pvgis_adapter import PVGISAdapter
+from src.solar_api.application.ports.pvgis_service import PVGISRateLimitedError
+from src.solar_api.application.rate_limiter import (
+    PriorityRateLimiter,
+    RateLimitExceeded,
+    TokenBucket,
+)
+from src.solar_api.application.services.rate_limited_pvgis_service import (
+    RateLimitedPVGISService,
+)
+from src.solar_api.domain.models import PVGISRequest
+
+SAMPLE_REQUEST = PVGISRequest(lat=-23.5505, lon=-46.6333, peakpower=1, loss=0)
+
+
+def test_token_bucket_refills_over_time():
+    """Tokens come back at the configured rate, up to the capacity."""
+    bucket = TokenBucket(rate=2, capacity=2)
+    assert bucket.try_acquire(now=bucket.updated_at)
+    assert bucket.try_acquire(now=bucket.updated_at)
+    assert not bucket.try_acquire(now=bucket.updated_at)
+    assert bucket.time_until_available(now=bucket.updated_at) == pytest.approx(0.5)
+    assert bucket.try_acquire(now=bucket.updated_at + 0.5)
+
+
+@pytest.mark.asyncio
+async def test_interactive_callers_are_served_before_batch_callers():
+    """Queued high-priority waiters get the next token first."""
+    limiter = PriorityRateLimiter(rate=50, burst=1, max_queue=10)
+    await limiter.acquire()
+
+    order = []
+
+    async def take(priority, label):
+        await limiter.acquire(priority=priority, timeout=1)
+        order.append(label)
+
+    batch = asyncio.create_task(take(1, "batch"))
+    await asyncio.sleep(0)
+    interactive = asyncio.create_task(take(0, "interactive"))
+    await asyncio.gather(batch, interactive)
+
+    assert order == ["interactive", "batch"]
+
+
+@pytest.mark.asyncio
+async def test_callers_fail_fast_when_deadline_cannot_be_met():
+    """A full queue or an impossible deadline is rejected immediately."""
+    limiter = PriorityRateLimiter(rate=1, burst=1, max_queue=1)
+    await limiter.acquire()
+
+    with pytest.raises(RateLimitExceeded) as exc_info:
+        await limiter.acquire(timeout=0.1)
+    assert exc_info.value.retry_after > 0.1
+
+    waiter = asyncio.create_task(limiter.acquire(timeout=5))
+    await asyncio.sleep(0)
+    with pytest.raises(RateLimitExceeded):
+        await limiter.acquire(timeout=5)
+    waiter.cancel()
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_service_maps_rejections_and_pauses_on_429():
+    """Local rejections and upstream 429s surface as PVGISRateLimitedError."""
+    limiter = PriorityRateLimiter(rate=1, burst=1, max_queue=5)
+    inner = AsyncMock()
+    inner.get_pv_data = AsyncMock(
+        side_effect=PVGISRateLimitedError("PVGIS rate limit exceeded", retry_after=30)
+    )
+    service = RateLimitedPVGISService(inner, limiter, timeout=0.1)
+
+    with pytest.raises(PVGISRateLimitedError):
+        await service.get_pv_data(SAMPLE_REQUEST)
+    with pytest.raises(PVGISRateLimitedError) as exc_info:
+        await service.get_pv_data(SAMPLE_REQUEST)
+
+    assert exc_info.value.retry_after >= 29
+    inner.get_pv_data.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_adapter_raises_rate_limited_error_on_429():
+    """PVGIS 429 responses carry their Retry-After hint."""
+
+    def handler(request):
+        return httpx.Response(429, headers={"Retry-After": "7"})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        with pytest.raises(PVGISRateLimitedError) as exc_info:
+            await PVGISAdapter(client=client).get_pv_data(SAMPLE_REQUEST)
+
+    assert exc_info.value.retry_after == 7
@@ -0,0 +1,170 @@
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock
+
+from src.solar_api.application import metrics
+from src.solar_api.application.cache import TTLCache
+from src.solar_api.application.single_flight import SingleFlight
+from src.solar_api.application.services.pvgis_cache_service import (
+    CachedPVGISService,
+    PVGISResultCache,
+)
+from src.solar_api.domain.models import PVGISRequest
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    """Duplicates arriving while a call is in flight await the same result."""
+    metrics.reset()
+    flight = SingleFlight(name="test_flight")
+    release = asyncio.Event()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return {"value": 42}
+
+    waiters = [asyncio.create_task(flight.do("key", fetch)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters)
+
+    assert calls == 1
+    assert all(result == {"value": 42} for result in results)
+    assert metrics.get("test_flight.coalesced") == 4
+    assert flight.in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_waiter_and_are_not_cached():
+    """A failed call is propagated to all waiters and retried afterwards."""
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def failing():
+        await release.wait()
+        raise RuntimeError("upstream down")
+
+    waiters = [asyncio.create_task(flight.do("key", failing)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+    async def succeeding():
+        return "ok"
+
+    assert await flight.do("key", succeeding) == "ok"
+
+
+@pytest.mark.asyncio
+async def test_cancelling_one_waiter_keeps_the_call_running():
+    """Only the cancelled caller gives up; the others still get the result."""
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def fetch():
+        await release.wait()
+        return "done"
+
+    first = asyncio.create_task(flight.do("key", fetch))
+    second = asyncio.create_task(flight.do("key", fetch))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await second == "done"
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+@pytest.mark.asyncio
+async def test_cancelling_every_waiter_cancels_the_call():
+    """Nobody is left waiting, so the in-flight work is abandoned."""
+    flight = SingleFlight()
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def fetch():
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    waiter = asyncio.create_task(flight.do("key", fetch))
+    await started.wait()
+    waiter.cancel()
+
+    await asyncio.wait_for(cancelled.wait(), timeout=1)
+    await asyncio.sleep(0)
+    assert flight.in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_caller_after_the_last_waiter_left_starts_a_new_call():
+    """A call still winding down its cancellation is not joined by new callers."""
+    flight = SingleFlight()
+    started = asyncio.Event()
+    cleaning_up = asyncio.Event()
+    finish_cleanup = asyncio.Event()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        if calls > 1:
+            return calls
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cleaning_up.set()
+            await finish_cleanup.wait()
+            raise
+
+    waiter = asyncio.create_task(flight.do("key", fetch))
+    await started.wait()
+    waiter.cancel()
+    await cleaning_up.wait()
+
+    second = asyncio.create_task(flight.do("key", fetch))
+    await asyncio.sleep(0)
+    finish_cleanup.set()
+    assert await second == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_service_coalesces_concurrent_misses():
+    """Concurrent cache misses for one location trigger one PVGIS call."""
+    release = asyncio.Event()
+
+    async def get_pv_data(params):
+        await release.wait()
+        return {"latitude": params.lat}
+
+    inner = AsyncMock()
+    inner.get_pv_data = AsyncMock(side_effect=get_pv_data)
+    cache = PVGISResultCache(TTLCache(max_entries=10, ttl=60))
+    flight = SingleFlight()
+    params = PVGISRequest(lat=-23.5505, lon=-46.6333, peakpower=1, loss=0)
+
+    waiters = [
+        asyncio.create_task(
+            CachedPVGISService(inner, cache, single_flight=flight).get_pv_data(params)
+        )
+        for _ in range(10)
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters)
+
+    inner.get_pv_data.assert_called_once()
+    assert all(result == {"latitude": -23.5505} for result in results)
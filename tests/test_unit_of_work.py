@@ -0,0 +1,134 @@
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from src.solar_api.application import metrics
+from src.solar_api.database import unit_of_work
+from src.solar_api.database.models import TokenRevocation
+from tests.conftest import TestingSessionLocal
+from tests.test_utils import assert_response_status
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def _reset_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+@pytest.mark.asyncio
+async def test_authenticated_read_uses_one_session_and_skips_commit(
+    client: AsyncClient, user_auth_header
+):
+    response = await client.get("/api/panel-models/", headers=user_auth_header)
+    assert_response_status(response, status.HTTP_200_OK)
+
+    # Auth and the panel repository shared one session and one connection
+    assert metrics.get("db.connections_per_request.count") == 1
+    assert metrics.get("db.connections_per_request.max") == 1
+    assert metrics.get("db.commits_skipped") == 1
+    assert metrics.get("db.commits") == 0
+
+
+@pytest.mark.asyncio
+async def test_session_without_statements_checks_out_no_connection():
+    async with unit_of_work(TestingSessionLocal):
+        pass
+
+    assert metrics.get("db.connections_per_request.max") == 0
+    assert metrics.get("db.commits_skipped") == 1
+
+
+@pytest.mark.asyncio
+async def test_pending_writes_are_committed_on_exit():
+    async with unit_of_work(TestingSessionLocal) as session:
+        session.add(TokenRevocation(user_id=4242, revoked_at=_now()))
+
+    assert metrics.get("db.commits") == 1
+    async with TestingSessionLocal() as session:
+        row = await session.scalar(
+            select(TokenRevocation).where(TokenRevocation.user_id == 4242)
+        )
+        assert row is not None
+        await session.delete(row)
+        await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_errors_roll_back():
+    with pytest.raises(RuntimeError):
+        async with unit_of_work(TestingSessionLocal) as session:
+            session.add(TokenRevocation(user_id=4343, revoked_at=_now()))
+            await session.flush()
+            raise RuntimeError("boom")
+
+    async with TestingSessionLocal() as session:
+        assert (
+            await session.scalar(
+                select(TokenRevocation).where(TokenRevocation.user_id == 4343)
+            )
+            is None
+        )
+
+
+SAMPLE_PANEL = {
+    "name": "Round Trip Panel",
+    "capacity": 0.4,
+    "efficiency": 20.5,
+    "manufacturer": "SolarTech",
+    "type": "Monocristalino",
+}
+
+
+@pytest.mark.asyncio
+async def test_panel_writes_take_one_statement_each(
+    client: AsyncClient, user_auth_header
+):
+    # Every request also runs one SELECT to authenticate the API key
+    response = await client.post(
+        "/api/panel-models/", json=SAMPLE_PANEL, headers=user_auth_header
+    )
+    assert_response_status(response, status.HTTP_201_CREATED)
+    assert response.json()["created_at"] is not None
+    url = f"/api/panel-models/{response.json()['id']}"
+    assert metrics.get("db.queries_per_request.max") == 2
+
+    metrics.reset()
+    response = await client.put(url, json={"capacity": 0.5}, headers=user_auth_header)
+    assert_response_status(response, status.HTTP_200_OK)
+    assert response.json()["capacity"] == 0.5
+    assert metrics.get("db.queries_per_request.max") == 2
+    assert metrics.get("db.commits_skipped") == 1
+
+    metrics.reset()
+    response = await client.delete(url, headers=user_auth_header)
+    assert_response_status(response, status.HTTP_204_NO_CONTENT)
+    assert metrics.get("db.queries_per_request.max") == 2
+
+    # A missing (or foreign) panel is detected from the empty RETURNING
+    metrics.reset()
+    response = await client.put(url, json={"capacity": 0.6}, headers=user_auth_header)
+    assert_response_status(response, status.HTTP_404_NOT_FOUND)
+    assert metrics.get("db.queries_per_request.max") == 2
+
+
+@pytest.mark.asyncio
+async def test_user_update_returns_row_without_refresh(
+    client: AsyncClient, regular_user, user_auth_header
+):
+    response = await client.put(
+        f"/users/{regular_user.id}",
+        json={"email": "renamed@example.com"},
+        headers=user_auth_header,
+    )
+    assert_response_status(response, status.HTTP_200_OK)
+    assert response.json()["email"] == "renamed@example.com"
+    # Auth, UPDATE ... RETURNING and, off PostgreSQL, the revocation upsert
+    assert metrics.get("db.queries_per_request.max") == 3
@@ -0,0 +1,101 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from src.solar_api.adapters.pvgis.pvgis_adapter import format_pvcalc_response
+from src.solar_api.adapters.pvgis.yield_grid import YieldGrid, YieldGridPVGISService
+from src.solar_api.domain.models import PVGISRequest
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "pvgis" / "synthetic"
+
+
+def _fixture(name: str) -> dict:
+    return format_pvcalc_response(json.loads((FIXTURES_DIR / name).read_text()))
+
+
+@pytest.fixture
+def grid(tmp_path) -> YieldGrid:
+    sao_paulo = _fixture("sao_paulo_1kwp_0loss.json")
+    fortaleza = _fixture("fortaleza_1kwp_0loss.json")
+
+    grid = YieldGrid.create(tmp_path / "grid", lat=[-24, -23], lon=[-47, -46, -45])
+    for j in range(2):
+        grid.set_node(0, j, sao_paulo)
+        grid.set_node(1, j, fortaleza)
+    grid.flush()
+    return YieldGrid(tmp_path / "grid")
+
+
+def _e_y(pv_data: dict) -> float:
+    return pv_data["outputs"]["totals"]["fixed"]["E_y"]
+
+
+def test_grid_is_memory_mapped_and_reproduces_nodes(grid):
+    """Reopened arrays are memory-mapped and a node lookup returns its values."""
+    assert isinstance(grid.arrays["e_m"], np.memmap)
+
+    result = grid.interpolate(-24, -47)
+    expected = _fixture("sao_paulo_1kwp_0loss.json")
+    assert _e_y(result) == pytest.approx(_e_y(expected), abs=0.1)
+    assert result["mounting_system"] == expected["mounting_system"]
+    assert result["accuracy"]["distance_km"] == 0
+    assert result["source"] == "grid"
+
+
+def test_bilinear_interpolation_blends_neighbouring_nodes(grid):
+    """A point between rows gets the weighted mean of the surrounding nodes."""
+    sao_paulo = _e_y(_fixture("sao_paulo_1kwp_0loss.json"))
+    fortaleza = _e_y(_fixture("fortaleza_1kwp_0loss.json"))
+
+    result = grid.interpolate(-23.75, -46.5)
+    assert _e_y(result) == pytest.approx(0.75 * sao_paulo + 0.25 * fortaleza, abs=0.1)
+    assert result["accuracy"]["method"] == "bilinear"
+    assert result["accuracy"]["distance_km"] > 0
+
+
+def test_points_without_four_valid_nodes_are_not_interpolated(grid):
+    """Off-grid points and cells touching an unfilled node fall through."""
+    assert grid.interpolate(-10, -46.5) is None
+    assert grid.interpolate(-23.5, -45.5) is None
+
+
+def test_malformed_pvgis_result_leaves_the_node_unfilled(tmp_path):
+    """A non-numeric value raises before anything is written to the node."""
+    grid = YieldGrid.create(tmp_path / "grid", lat=[-24, -23], lon=[-47, -46])
+    pv_data = _fixture("sao_paulo_1kwp_0loss.json")
+    pv_data["outputs"]["totals"]["fixed"]["l_spec"] = "N/A"
+
+    with pytest.raises(ValueError):
+        grid.set_node(0, 0, pv_data)
+
+    assert not grid.valid[0, 0]
+    assert not grid.arrays["e_m"][0, 0].any()
+
+    del pv_data["outputs"]["monthly"]["fixed"][0]
+    pv_data["outputs"]["totals"]["fixed"]["l_spec"] = "1.2"
+    with pytest.raises(ValueError):
+        grid.set_node(0, 0, pv_data)
+    assert not grid.valid[0, 0]
+
+
+@pytest.mark.asyncio
+async def test_grid_service_answers_inside_and_delegates_outside(grid):
+    """Grid hits never reach PVGIS and are rescaled to the requested system."""
+    inner = AsyncMock()
+    inner.get_pv_data = AsyncMock(return_value={"source": "pvgis"})
+    inner.get_cached_pv_data = Mock(return_value=None)
+    service = YieldGridPVGISService(inner, grid)
+
+    inside = PVGISRequest(lat=-23.5, lon=-46.5, peakpower=5, loss=14)
+    result = await service.get_pv_data(inside)
+    base = grid.interpolate(-23.5, -46.5)
+    assert _e_y(result) == pytest.approx(_e_y(base) * 5 * 0.86, rel=1e-3)
+    assert service.get_cached_pv_data(inside) is not None
+    inner.get_pv_data.assert_not_called()
+
+    outside = PVGISRequest(lat=-3.73, lon=-38.53, peakpower=1, loss=0)
+    assert await service.get_pv_data(outside) == {"source": "pvgis"}
+    assert service.get_cached_pv_data(outside) is None